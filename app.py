@@ -1,21 +1,92 @@
 # /ooc-simpleui/app.py
 import os
 import json
-import subprocess
 import sys
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-from urllib.parse import urlparse
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, make_response, session, Response, stream_with_context, send_file, g
+from flask.sessions import SecureCookieSessionInterface
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 import logging
-import shlex # For safe command string construction
-
-# +++ Add these imports +++
+import functools
+import sqlite3
+import tempfile
+import copy
+import threading
+from contextlib import contextmanager
+import click
+import time
+import uuid
+import csv
+import queue
+import re
+import shutil
+import subprocess
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import requests
-from bs4 import BeautifulSoup
-# +++++++++++++++++++++++++
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+import hashlib
+import io
+import heapq
+import math
+import cProfile
+import itertools
+import numpy as np
+from criteria import EVIDENCE_CRITERIA_KEYS, OOC_CRITERIA_KEYS # Annotation criteria, shared with benchmarks/datagen.py
+
+try:
+    import lxml # noqa: F401 -- optional, noticeably faster than html.parser
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+try:
+    import fcntl
+except ImportError: # Windows: writers are then only serialized within one process
+    fcntl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # Only needed for the Parquet dump of /api/stats
+    pa = pq = None
+
+try:
+    from yt_dlp import YoutubeDL
+    from yt_dlp import cookies as yt_dlp_cookies
+    from yt_dlp.utils import DownloadError as YtDlpDownloadError
+except ImportError: # Reported per request by the metadata/download helpers
+    YoutubeDL = None
+    yt_dlp_cookies = None
+    class YtDlpDownloadError(Exception): pass
 
 # --- Flask App Setup ---
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+SECRET_KEY_FILE = os.path.join(app.root_path, 'cache', 'secret_key')
+
+def load_secret_key():
+    """Session key shared by all worker processes: OOC_SECRET_KEY, else one generated once into SECRET_KEY_FILE.
+    (A per-process random key would make flash messages set by one worker unreadable by the others.)"""
+    if os.environ.get('OOC_SECRET_KEY'): return os.environ['OOC_SECRET_KEY']
+    os.makedirs(os.path.dirname(SECRET_KEY_FILE), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.secret-', dir=os.path.dirname(SECRET_KEY_FILE))
+    with os.fdopen(fd, 'w') as f: f.write(os.urandom(32).hex())
+    try: os.link(tmp_path, SECRET_KEY_FILE) # Atomic create-if-absent: the first worker to start wins
+    except FileExistsError: pass
+    finally: os.remove(tmp_path)
+    with open(SECRET_KEY_FILE, 'r') as f: return f.read().strip()
+
+class SharedKeySessionInterface(SecureCookieSessionInterface):
+    """Loads the session key when a session is first opened instead of on import, so importing the app
+    (CLI commands, benchmarks, tests) creates no files."""
+
+    def get_signing_serializer(self, app):
+        if not app.secret_key: app.secret_key = load_secret_key()
+        return super().get_signing_serializer(app)
+
+app.session_interface = SharedKeySessionInterface()
+# Behind nginx/Apache, let the front server stream media files itself (X-Sendfile) instead of Python
+app.config['USE_X_SENDFILE'] = os.environ.get('OOC_USE_X_SENDFILE', '') == '1'
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,107 +94,978 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # --- Constants ---
 DATA_FILE = 'data.json'
 DOWNLOAD_DIR = 'downloads'
+MEDIA_DIR = os.path.join(DOWNLOAD_DIR, 'media') # Content-addressed video store shared by all items and splits
+MEDIA_MANIFEST_FILE = os.path.join(MEDIA_DIR, 'manifest.json')
+MEDIA_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600 # Stored media never changes under its key, so browsers may cache it
+MEDIA_DERIVE_WORKERS = 2 # Concurrent ffmpeg processes for posters/previews
+MEDIA_DERIVE_TIMEOUT_SECONDS = 600
 MAX_VIDEO_DURATION_SECONDS = 600
+MAX_VIDEO_FILESIZE_BYTES = 500 * 1024 * 1024 # Formats known to be larger are not selected; downloads announcing more are aborted
+MAX_VIDEO_HEIGHT = 1080 # Higher resolutions are never selected (annotation does not need them)
+ALLOWED_VIDEO_PLATFORMS = None # Set of parse_social_platform() names to admit, e.g. {'youtube', 'x'}; None admits all
+CLIP_LONG_VIDEOS = False # Download only the first MAX_VIDEO_DURATION_SECONDS of longer videos (needs ffmpeg) instead of rejecting them
 BROWSER_FOR_COOKIES = 'chrome' # Specify the browser to use for cookies
-
-# +++ Evidence Checklist Criteria Keys (for default setting) +++
-EVIDENCE_CRITERIA_KEYS = [
-    'author_expertise', 'source_reputation', 'neutrality_fairness',
-    'fact_vs_opinion', 'purpose', 'definitive_proof', 'direct_connection',
-    'source_transparency', 'evidence_integrity', 'fact_verifiability',
-    'clarity_relevance'
+STORAGE_BACKEND = os.environ.get('OOC_STORAGE_BACKEND', 'json') # 'json' (DATA_FILE) or 'sqlite' (SQLITE_FILE)
+SQLITE_FILE = os.environ.get('OOC_SQLITE_FILE', 'data.sqlite3')
+DOWNLOAD_WORKERS = 4 # Max concurrent background download jobs
+PLATFORM_CONCURRENCY = {'youtube': 2, 'x': 2, 'facebook': 1, 'instagram': 1, 'tiktok': 1} # Per-platform job limits
+DEFAULT_PLATFORM_CONCURRENCY = 1 # Limit for platforms not listed above
+JOB_RETENTION_SECONDS = 3600 # Finished jobs are kept this long for status polling
+JOBS_DIR = os.path.join('cache', 'jobs') # Job snapshots, so any worker process can answer status requests
+JOB_PERSIST_INTERVAL_SECONDS = 1.0 # Progress-only updates are written to JOBS_DIR at most this often
+JOB_POLL_INTERVAL_SECONDS = 1.0 # Event streams for jobs of other workers re-read the snapshot this often
+METRICS_DIR = os.path.join('cache', 'metrics') # Per-process metric snapshots, summed by /metrics across workers
+METRICS_FLUSH_INTERVAL_SECONDS = 5.0
+PROFILE_REQUESTS = os.environ.get('OOC_PROFILE_REQUESTS', '') == '1' # Opt-in: ?_profile=1 / X-Profile: 1 runs cProfile
+PROFILE_DIR = os.path.join('cache', 'profiles')
+COOKIE_JAR_TTL_SECONDS = 600 # Browser cookies are re-read (and decrypted) at most this often
+INFO_CACHE_TTL_SECONDS = 900 # Extracted video info is reused for a download within this window
+INFO_CACHE_MAX_ENTRIES = 256
+HTTP_CACHE_DIR = os.path.join('cache', 'http') # On-disk cache of fetched page metadata
+POLITIFACT_CACHE_TTL_SECONDS = 7 * 24 * 3600 # Fact-check pages rarely change; revalidated after this
+HTTP_POOL_CONNECTIONS = 16 # Hosts kept in the keep-alive pool
+HTTP_POOL_MAXSIZE = 32 # Connections per host
+BACKFILL_WORKERS = 8 # Concurrent page fetches during a Politifact backfill
+POLITIFACT_RATE_LIMIT_PER_SECOND = 4.0 # Max requests per second to one host during bulk fetches
+LINK_CHECK_WORKERS = 16 # Concurrent evidence link fetches
+LINK_CHECK_RATE_LIMIT_PER_SECOND = 2.0 # Max link checks per second to one host (news sites throttle crawlers)
+LINK_CHECK_CACHE_TTL_SECONDS = 7 * 24 * 3600 # Checked links are reused this long...
+LINK_CHECK_RETRY_SECONDS = 3600 # ...broken or unreachable ones only this long
+LINK_CHECK_TIMEOUT_SECONDS = 15
+LINK_CHECK_MAX_BYTES = 512 * 1024 # HTML read per link for title/og metadata (smaller pages keep their connection pooled)
+LINK_CHECK_POOL_HOSTS = 64 # Evidence links span many hosts, so their session keeps more host pools
+LINK_CHECK_MAX_REPORTED = 500 # Broken links listed in a bulk check result (the rest are only counted)
+TASK_JOB_WORKERS = 2 # Concurrent bulk jobs (backfills, imports, ...)
+INGEST_BATCH_SIZE = 50 # Ingest rows turned into items per storage write
+INGEST_MAX_IN_FLIGHT = 200 # Items whose stages may be queued at once (bounds memory on large inputs)
+INGEST_COMMIT_BATCH = 50 # Finished stage results written back per storage write...
+INGEST_COMMIT_INTERVAL_SECONDS = 2.0 # ...or at least this often
+PAGE_SIZE = 25 # Entries rendered per window on the index page / default API page size
+MAX_PAGE_SIZE = 200 # Upper bound for the 'limit' query parameter of /api/items
+IMPORT_BATCH_SIZE = 500 # Imported records upserted per storage write
+IMPORT_READ_CHUNK_CHARS = 64 * 1024
+IMPORT_MAX_RECORD_CHARS = 16 * 1024 * 1024 # A single record larger than this is treated as malformed
+IMPORT_MAX_ERRORS = 20 # Rejected-record messages reported back (the rest are only counted)
+EXPORT_PAGE_SIZE = 1000 # Items fetched from storage (and written as one Parquet row group) per export step
+SEARCH_PAGE_SIZE = 20
+SEARCH_SNIPPET_CHARS = 160
+
+# +++ Editable Item Fields (validated by the item-level API) +++
+ITEM_STRING_FIELDS = [
+    'politifact_url', 'politifact_headline', 'politifact_subheadline', 'rating',
+    'social_link', 'social_platform', 'social_text', 'download_message', 'drive_path', 'media_key'
 ]
+OOC_FLAG_FIELDS = [f'ooc_{key}' for key in OOC_CRITERIA_KEYS]
+ITEM_BOOL_FIELDS = ['download_success'] + OOC_FLAG_FIELDS
+ITEM_NUMBER_FIELDS = ['social_duration']
+ITEM_LIST_FIELDS = ['external_links_info']
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
-# --- Helper Functions (load_data, save_data, parse_social_platform) ---
-def load_data():
-    """Loads data from the JSON file."""
-    if not os.path.exists(DATA_FILE):
-        logging.info(f"Data file '{DATA_FILE}' not found, returning empty list.")
-        return []
-    try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            content = f.read()
+# --- Helper Functions (Item normalization) ---
+def normalize_item(item):
+    """Ensures essential keys exist with default values (in place). Returns the item."""
+    item.setdefault('politifact_headline', '')
+    item.setdefault('politifact_subheadline', '')
+    item.setdefault('social_platform', '')
+    item.setdefault('social_duration', 0.0)
+    item.setdefault('social_text', '')
+    item.setdefault('download_success', False)
+    item.setdefault('download_message', '')
+    item.setdefault('drive_path', '')
+    item.setdefault('media_key', '')
+    item.setdefault('external_links_info', [])
+    item.setdefault('version', 1) # Increased by every write; clients send it back to detect lost updates
+    for key in OOC_CRITERIA_KEYS:
+        item.setdefault(f'ooc_{key}', False)
+
+    # +++ Ensure checklist structure within each link +++
+    if isinstance(item.get('external_links_info'), list):
+        for link_info in item['external_links_info']:
+            if isinstance(link_info, dict):
+                link_info.setdefault('url', '')
+                link_info.setdefault('description', '')
+                link_info.setdefault('checklist', {}) # Ensure checklist dict exists
+                if isinstance(link_info['checklist'], dict):
+                    for key in EVIDENCE_CRITERIA_KEYS:
+                        link_info['checklist'].setdefault(key, False)
+    # ++++++++++++++++++++++++++++++++++++++++++++++++++
+    return item
+
+
+def clean_item_links(item):
+    """Cleans the link checklist structure of one item in place before saving."""
+    if isinstance(item.get('external_links_info'), list):
+        for link_info in item['external_links_info']:
+            if isinstance(link_info, dict) and isinstance(link_info.get('checklist'), dict):
+                # Ensure only valid keys are saved (prevents injection)
+                valid_checklist = {key: link_info['checklist'].get(key, False) for key in EVIDENCE_CRITERIA_KEYS if key in link_info['checklist']}
+                link_info['checklist'] = valid_checklist
+            else:
+                # Handle malformed link data if necessary
+                pass
+
+
+# +++ Compact flag encoding: bit i of a mask is key i of OOC_CRITERIA_KEYS / EVIDENCE_CRITERIA_KEYS +++
+# Bit positions are part of the storage and wire formats: only ever append keys to those lists.
+def flags_to_mask(flags, keys):
+    """Packs the truthy flags[key] values into an integer bitmask."""
+    return sum(1 << bit for bit, key in enumerate(keys) if flags.get(key))
+
+
+def mask_to_flags(mask, keys):
+    return {key: bool(mask >> bit & 1) for bit, key in enumerate(keys)}
+
+
+def item_ooc_mask(item):
+    return sum(1 << bit for bit, field in enumerate(OOC_FLAG_FIELDS) if item.get(field))
+
+
+def compact_item(item):
+    """Verbose item -> compact wire form: ooc_* flags become 'ooc_mask', each link's checklist 'checklist_mask'."""
+    compact = {key: value for key, value in item.items() if key not in OOC_FLAG_FIELDS and key != 'external_links_info'}
+    compact['ooc_mask'] = item_ooc_mask(item)
+    compact['external_links_info'] = [
+        {**{key: value for key, value in link.items() if key != 'checklist'},
+         'checklist_mask': flags_to_mask(link.get('checklist') or {}, EVIDENCE_CRITERIA_KEYS)}
+        if isinstance(link, dict) else link
+        for link in item.get('external_links_info') or []
+    ]
+    return compact
+
+
+def expand_item(fields):
+    """Inverse of compact_item(); also accepts partial diffs and verbose input (returned unchanged).
+    Raises ValueError for a mask that is not a non-negative integer."""
+    if 'ooc_mask' not in fields and not any(isinstance(link, dict) and 'checklist_mask' in link
+                                            for link in fields.get('external_links_info') or [] if isinstance(fields.get('external_links_info'), list)):
+        return fields
+    expanded = dict(fields)
+    if 'ooc_mask' in expanded:
+        mask = expanded.pop('ooc_mask')
+        if isinstance(mask, bool) or not isinstance(mask, int) or mask < 0: raise ValueError("'ooc_mask' must be a non-negative integer.")
+        expanded.update({f'ooc_{key}': value for key, value in mask_to_flags(mask, OOC_CRITERIA_KEYS).items()})
+    if isinstance(expanded.get('external_links_info'), list):
+        links = []
+        for link in expanded['external_links_info']:
+            if isinstance(link, dict) and 'checklist_mask' in link:
+                link = dict(link)
+                mask = link.pop('checklist_mask')
+                if isinstance(mask, bool) or not isinstance(mask, int) or mask < 0: raise ValueError("'checklist_mask' must be a non-negative integer.")
+                link['checklist'] = mask_to_flags(mask, EVIDENCE_CRITERIA_KEYS)
+            links.append(link)
+        expanded['external_links_info'] = links
+    return expanded
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def check_item_version(item, expected_version):
+    """Raises VersionConflict unless expected_version is None or the stored item's version."""
+    if expected_version is not None and item.get('version', 1) != expected_version: raise VersionConflict(item)
+
+
+def renumber_items(data):
+    """Assigns sequential IDs by list position. Returns the positions whose ID changed."""
+    changed = set()
+    for i, item in enumerate(data):
+        if isinstance(item, dict) and item.get('id') != i:
+            item['id'] = i
+            changed.add(i)
+    return changed
+
+
+def apply_replacement_versions(data, stored_items, renumber_ids=False):
+    """Version check for a whole-dataset save: every item that carries a version must still be at the stored
+    one (else VersionConflict); items whose content changed get the next version. Items are matched by the
+    IDs the client sent, so renumber_ids (sequential IDs, like save_data()) is only applied after the check;
+    an item that gets a new ID counts as changed. Modifies data in place."""
+    stored_by_id = {item['id']: item for item in stored_items if isinstance(item, dict)}
+    matched = []
+    for item in data:
+        stored = stored_by_id.get(item.get('id')) if isinstance(item, dict) else None
+        if stored is None: continue
+        check_item_version(stored, item.get('version', stored['version']))
+        matched.append((item, stored))
+    if renumber_ids: renumber_items(data)
+    for item, stored in matched:
+        content = {key: value for key, value in normalize_item(copy.deepcopy(item)).items() if key != 'version'}
+        stored_content = {key: value for key, value in stored.items() if key != 'version'}
+        item['version'] = stored['version'] + (content != stored_content)
+
+
+def find_item_index(data, item_id):
+    """Returns the list index of the item with the given id, or None."""
+    for index, item in enumerate(data):
+        if isinstance(item, dict) and item.get('id') == item_id:
+            return index
+    return None
+
+
+def next_item_id(data):
+    """Returns the next free item id (max id + 1)."""
+    return max((item['id'] for item in data if isinstance(item.get('id'), int)), default=-1) + 1
+
+
+# --- Cross-process Locking ---
+class FileLock:
+    """Reentrant lock held by one thread of one process at a time: a thread lock plus flock() on a lock file.
+    The file is opened per acquisition, so processes forked from one parent never share the lock's file description."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try: fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException: os.close(fd); raise
+            except BaseException:
+                self._lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._lock.release()
+
+
+class VersionConflict(Exception):
+    """Raised by storage writers when the client's base version of an item is no longer the stored one."""
+
+    def __init__(self, item):
+        super().__init__(f"Item {item['id']} was changed by someone else (now at version {item['version']}).")
+        self.item = item
+
+
+class StorageError(Exception):
+    """The stored dataset could not be read (e.g. a truncated data file or a broken database).
+    Raised instead of answering with an empty dataset, which the page would show and a later save persist."""
+
+
+# --- Metrics (counters and histograms, exposed in Prometheus text format at /metrics) ---
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(11)) # 1 KiB .. 1 GiB
+COUNT_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+class Metric:
+    """A counter (buckets=None) or histogram with a fixed set of label names.
+    Values are kept per label-value tuple; a histogram value is [count per bucket..., +Inf count, sum]."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=None):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self._values = {}
+        self._lock = threading.Lock()
+        metrics_registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0.0) + amount
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            values = self._values.get(key)
+            if values is None: values = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            values[index] += 1
+            values[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the duration of the with-block; labels['outcome'] is set to 'error' if it raises."""
+        started = time.perf_counter()
+        try:
+            yield labels
+        except BaseException:
+            if 'outcome' in self.label_names: labels['outcome'] = 'error'
+            raise
+        finally:
+            if 'outcome' in self.label_names: labels.setdefault('outcome', 'ok')
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock: return [[list(key), copy.copy(value)] for key, value in self._values.items()]
+
+
+metrics_registry = []
+
+def merge_metric_snapshots(snapshots):
+    """Sums {metric name: [[label values, value], ...]} snapshots (from several processes) into one."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, samples in snapshot.items():
+            target = merged.setdefault(name, {})
+            for labels, value in samples:
+                key = tuple(labels)
+                if key not in target: target[key] = copy.copy(value)
+                elif isinstance(value, list): target[key] = [a + b for a, b in zip(target[key], value)]
+                else: target[key] += value
+    return merged
+
+
+def render_metrics(merged):
+    def label_text(names, values, extra=()):
+        pairs = list(zip(names, values)) + list(extra)
+        if not pairs: return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+    lines = []
+    for metric in metrics_registry:
+        samples = merged.get(metric.name, {})
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {'histogram' if metric.buckets else 'counter'}")
+        for key in sorted(samples):
+            value = samples[key]
+            if metric.buckets is None:
+                lines.append(f"{metric.name}{label_text(metric.label_names, key)} {value:g}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(metric.buckets) + ['+Inf'], value[:-1]):
+                cumulative += count
+                lines.append(f"{metric.name}_bucket{label_text(metric.label_names, key, [('le', bound if bound == '+Inf' else f'{bound:g}')])} {cumulative}")
+            lines.append(f"{metric.name}_sum{label_text(metric.label_names, key)} {value[-1]:.6f}")
+            lines.append(f"{metric.name}_count{label_text(metric.label_names, key)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsPublisher:
+    """Writes this process's metric snapshot to METRICS_DIR/<pid>.json every METRICS_FLUSH_INTERVAL_SECONDS,
+    so the worker that answers /metrics can add up all live workers (started on the first request,
+    so CLI commands never publish). Snapshots of exited processes are removed when read."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._started = False
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        return {metric.name: metric.snapshot() for metric in metrics_registry}
+
+    def start(self):
+        with self._lock:
+            if self._started: return
+            self._started = True
+        threading.Thread(target=self._run, name='metrics-publisher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL_SECONDS)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix='.metrics-', dir=self.directory)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f: json.dump(self.snapshot(), f)
+                os.replace(tmp_path, os.path.join(self.directory, f"{os.getpid()}.json"))
+            except OSError as e:
+                logging.warning(f"Could not publish metrics: {e}")
+
+    def collect(self):
+        """Live metrics of this process plus the latest snapshots of the other worker processes."""
+        snapshots = [self.snapshot()]
+        try: filenames = os.listdir(self.directory)
+        except FileNotFoundError: filenames = []
+        for filename in filenames:
+            pid = int(filename[:-5]) if filename.endswith('.json') and filename[:-5].isdigit() else None
+            if pid is None or pid == os.getpid(): continue
+            path = os.path.join(self.directory, filename)
+            if not process_alive(pid):
+                try: os.remove(path)
+                except OSError: pass
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f: snapshots.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not read metrics snapshot '{path}': {e}")
+        return merge_metric_snapshots(snapshots)
+
+metrics_publisher = MetricsPublisher(METRICS_DIR)
+
+def metrics_platform(url):
+    """Platform label for a social link: known platforms by name, anything else as 'other' (bounded label set)."""
+    platform = parse_social_platform(url)
+    return platform if platform in PLATFORM_CONCURRENCY else 'other'
+
+
+HTTP_REQUEST_SECONDS = Metric('ooc_http_request_duration_seconds', 'Time spent in route handlers (streamed bodies excluded).',
+                              ('endpoint', 'method', 'status'), LATENCY_BUCKETS)
+STORAGE_SECONDS = Metric('ooc_storage_duration_seconds', 'Whole-dataset load (parse) and save (serialize + write) time.',
+                         ('backend', 'operation'), LATENCY_BUCKETS)
+STORAGE_PAYLOAD_BYTES = Metric('ooc_storage_payload_bytes', 'Size of the data file read or written by the JSON backend.',
+                               ('operation',), SIZE_BUCKETS)
+STORAGE_PAYLOAD_ITEMS = Metric('ooc_storage_payload_items', 'Items in each whole-dataset load or save.',
+                               ('backend', 'operation'), COUNT_BUCKETS)
+YTDLP_SECONDS = Metric('ooc_ytdlp_duration_seconds', 'yt-dlp extraction and download time (cached extractions excluded).',
+                       ('operation', 'platform', 'outcome'), LATENCY_BUCKETS)
+YTDLP_DOWNLOADED_BYTES = Metric('ooc_ytdlp_downloaded_bytes_total', 'Bytes of video files downloaded by yt-dlp.', ('platform',))
+FFMPEG_SECONDS = Metric('ooc_ffmpeg_duration_seconds', 'ffmpeg run time per derivative.', ('kind', 'outcome'), LATENCY_BUCKETS)
+HTTP_FETCH_SECONDS = Metric('ooc_http_fetch_duration_seconds', 'Outbound page fetch latency (e.g. Politifact).',
+                            ('cache', 'outcome'), LATENCY_BUCKETS)
+HTTP_CACHE_LOOKUPS = Metric('ooc_http_cache_lookups_total', "Page cache lookups by result: 'hit' (fresh), "
+                            "'revalidated' (304), 'miss' (fetched and parsed).", ('cache', 'result'))
+
+
+# --- Dataset Cache ---
+PROCESS_TOKEN = os.urandom(4).hex() # Distinguishes this process's cache versions in ETags
+
+class DatasetCache:
+    """Process-level cache of the normalized dataset, keyed by the backing files' mtime/size/inode.
+    The version counter increases whenever the cached data is replaced or invalidated, and is
+    exposed as an ETag so unchanged pages and API reads can be answered without loading anything."""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.version = 0
+        self._signature = None
+        self._data = None
+        self._lock = threading.Lock()
+        self._written = threading.local() # Per thread: the version right after its last write
+
+    def _file_signature(self):
+        signature = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def check(self):
+        """Returns the current version, dropping the cached data if the files changed on disk."""
+        signature = self._file_signature()
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self._data = None
+                self.version += 1
+            return self.version
+
+    def get(self, loader):
+        """Returns the cached dataset, calling loader() only if the files changed since the last load."""
+        version = self.check()
+        with self._lock:
+            if self._data is not None: return self._data
+        data = loader()
+        with self._lock:
+            if self.version == version: self._data = data # Skip if a write happened while loading
+        return data
+
+    def store(self, data):
+        """Replaces the cached dataset after one of our own writes (no re-read needed)."""
+        signature = self._file_signature()
+        with self._lock:
+            self._signature = signature
+            self._data = data
+            self.version += 1
+            self._written.version = self.version
+
+    def written(self):
+        """Records one of our own writes whose result is not cached (the next get() reloads)."""
+        signature = self._file_signature()
+        with self._lock:
+            self._signature = signature
+            self._data = None
+            self.version += 1
+            self._written.version = self.version
+
+    def invalidate(self):
+        with self._lock:
+            self._signature = None
+            self._data = None
+            self.version += 1
+            self._written.version = None
+
+    def last_write_version(self):
+        """The version right after this thread's last write: one more than the version that held everything
+        before it. None if that version may include other writes as well."""
+        return getattr(self._written, 'version', None)
+
+
+# --- Storage Backends ---
+# Both backends expose the same methods; load_data()/save_data() and the item helpers below
+# go through get_storage(), which picks one based on STORAGE_BACKEND. Methods raise on failure.
+# load_all() returns the cached list shared by all callers: treat it as read-only and copy before modifying.
+class JsonStorage:
+    """Stores the whole dataset as one JSON list in a single file (the original DATA_FILE format).
+    Every read-modify-write holds an exclusive lock on '<path>.lock', so writers in different worker
+    processes take turns, and each one starts from the file as the previous writer left it."""
+
+    def __init__(self, path):
+        self.path = path
+        self.cache = DatasetCache([path])
+        self.lock = FileLock(path + '.lock')
+
+    def data_version(self):
+        return self.cache.check()
+
+    def load_all(self):
+        return self.cache.get(self._read_file)
+
+    def _read_file(self):
+        if not os.path.exists(self.path):
+            logging.info(f"Data file '{self.path}' not found, returning empty list.")
+            return []
+        with STORAGE_SECONDS.time(backend='json', operation='load'):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                STORAGE_PAYLOAD_BYTES.observe(os.fstat(f.fileno()).st_size, operation='load')
+                content = f.read()
             if not content.strip():
-                logging.info(f"Data file '{DATA_FILE}' is empty, returning empty list.")
+                logging.info(f"Data file '{self.path}' is empty, returning empty list.")
                 return []
             data = json.loads(content)
-            # Ensure essential keys exist with default values
+            if not isinstance(data, list):
+                raise ValueError(f"Data file '{self.path}' does not contain a JSON list.")
             for item in data:
-                item.setdefault('politifact_headline', '')
-                item.setdefault('politifact_subheadline', '')
-                item.setdefault('social_platform', '')
-                item.setdefault('social_duration', 0.0)
-                item.setdefault('social_text', '')
-                item.setdefault('download_success', False)
-                item.setdefault('download_message', '')
-                item.setdefault('drive_path', '')
-                item.setdefault('external_links_info', [])
-                item.setdefault('ooc_temporal_misattribution', False)
-                item.setdefault('ooc_geographical_misattribution', False)
-                item.setdefault('ooc_person_misidentification', False)
-                item.setdefault('ooc_contextual_misrepresentation', False)
-                item.setdefault('ooc_exaggeration_scale', False)
-                item.setdefault('ooc_exaggeration_urgency', False)
-                item.setdefault('ooc_fabricated_consequences', False)
-                item.setdefault('ooc_misleading_intent', False)
-                item.setdefault('ooc_misleading_emotional_framing', False)
-                item.setdefault('ooc_causal_misattribution', False)
-
-                # +++ Ensure checklist structure within each link +++
-                if isinstance(item.get('external_links_info'), list):
-                    for link_info in item['external_links_info']:
-                        if isinstance(link_info, dict):
-                            link_info.setdefault('url', '')
-                            link_info.setdefault('description', '')
-                            link_info.setdefault('checklist', {}) # Ensure checklist dict exists
-                            if isinstance(link_info['checklist'], dict):
-                                for key in EVIDENCE_CRITERIA_KEYS:
-                                    link_info['checklist'].setdefault(key, False)
-                # ++++++++++++++++++++++++++++++++++++++++++++++++++
-
-            logging.info(f"Successfully loaded {len(data)} items from '{DATA_FILE}'.")
-            return data
+                if isinstance(item, dict): normalize_item(item)
+        STORAGE_PAYLOAD_ITEMS.observe(len(data), backend='json', operation='load')
+        logging.info(f"Successfully loaded {len(data)} items from '{self.path}'.")
+        return data
+
+    def save_all(self, data, check_versions=False, renumber_ids=False):
+        with self.lock:
+            if check_versions: apply_replacement_versions(data, self.load_all(), renumber_ids)
+            elif renumber_ids: renumber_items(data)
+            self._write_file(data)
+
+    def _write_file(self, data):
+        self.cache.check() # Counts writes of other processes first, so our write's version bump covers only it
+        # Write to a temp file in the same directory, then atomically rename it over the data file,
+        # so a crash mid-dump leaves the previous version intact instead of a truncated file.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.data-', suffix='.json.tmp', dir=directory)
+        try:
+            with STORAGE_SECONDS.time(backend='json', operation='save'), os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+                STORAGE_PAYLOAD_BYTES.observe(os.fstat(f.fileno()).st_size, operation='save')
+            os.replace(tmp_path, self.path)
+            STORAGE_PAYLOAD_ITEMS.observe(len(data), backend='json', operation='save')
+        except BaseException:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
+        # What we just wrote becomes the cached dataset (save_data() strips default checklist keys, so re-add them)
+        for item in data:
+            if isinstance(item, dict): normalize_item(item)
+        self.cache.store(data)
+
+    def get_item(self, item_id):
+        data = self.load_all()
+        index = find_item_index(data, item_id)
+        return data[index] if index is not None else None
+
+    def query_items(self, filters, cursor=None, limit=PAGE_SIZE):
+        items = filter_items(self.load_all(), **filters)
+        window, next_cursor = paginate_items(items, cursor, limit)
+        return window, next_cursor, len(items)
+
+    # Writers copy the cached list (and the edited item) so a failed save leaves the cache untouched.
+    # load_all() inside the lock re-reads the file if another process wrote it since our last read.
+    def create_item(self, fields):
+        with self.lock:
+            data = list(self.load_all())
+            item = normalize_item({'id': next_item_id(data), **copy.deepcopy(fields), 'version': 1})
+            clean_item_links(item)
+            data.append(item)
+            self._write_file(data)
+        return item
+
+    def create_items(self, fields_list):
+        with self.lock:
+            data = list(self.load_all())
+            first_id = next_item_id(data)
+            items = [normalize_item({'id': first_id + offset, **copy.deepcopy(fields), 'version': 1}) for offset, fields in enumerate(fields_list)]
+            for item in items: clean_item_links(item)
+            data.extend(items)
+            self._write_file(data)
+        return items
+
+    def update_item(self, item_id, fields, expected_version=None):
+        with self.lock:
+            data = list(self.load_all())
+            index = find_item_index(data, item_id)
+            if index is None: return None
+            check_item_version(data[index], expected_version)
+            item = {**data[index], **copy.deepcopy(fields), 'version': data[index].get('version', 1) + 1}
+            clean_item_links(item)
+            data[index] = normalize_item(item)
+            self._write_file(data)
+        return item
+
+    def update_items(self, updates, return_items=False):
+        """Applies {item_id: fields} diffs to many items with a single write. Returns the number updated,
+        or with return_items the updated items."""
+        with self.lock:
+            data = list(self.load_all())
+            updated = []
+            for index, item in enumerate(data):
+                fields = updates.get(item.get('id')) if isinstance(item, dict) else None
+                if fields is None: continue
+                new_item = {**item, **copy.deepcopy(fields), 'version': item.get('version', 1) + 1}
+                clean_item_links(new_item)
+                data[index] = normalize_item(new_item)
+                updated.append(data[index])
+            if updated: self._write_file(data)
+        return updated if return_items else len(updated)
+
+    def delete_item(self, item_id, expected_version=None):
+        with self.lock:
+            data = list(self.load_all())
+            index = find_item_index(data, item_id)
+            if index is None: return False
+            check_item_version(data[index], expected_version)
+            del data[index]
+            self._write_file(data)
+        return True
+
+    def delete_items(self, item_ids):
+        item_ids = set(item_ids)
+        with self.lock:
+            data = list(self.load_all())
+            kept = [item for item in data if not (isinstance(item, dict) and item.get('id') in item_ids)]
+            if len(kept) != len(data): self._write_file(kept)
+        return len(data) - len(kept)
+
+
+class SqliteStorage:
+    """Stores items and their external links as normalized SQLite tables (WAL mode).
+    The ooc_* flags are one ooc_mask column and each evidence checklist one checklist_mask column
+    (see flags_to_mask()); items are converted to and from the verbose dict format at the edges.
+    Reads and single-item writes touch only the affected rows; every write runs in one transaction."""
+
+    SCHEMA_VERSION = 1 # PRAGMA user_version of the tables created by _create_schema()
+    SCALAR_COLUMNS = ITEM_STRING_FIELDS + ITEM_NUMBER_FIELDS + ['download_success']
+    FILTER_COLUMNS = {'rating': 'rating', 'platform': 'social_platform', 'download_success': 'download_success'}
+    ID_BATCH_SIZE = 500 # IDs per 'IN (...)' query (older SQLite builds allow only 999 parameters)
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local() # One connection per thread
+        self._create_schema()
+        # Committed writes land in the -wal file first, so both files make up the signature
+        self.cache = DatasetCache([path, path + '-wal'])
+
+    def data_version(self):
+        return self.cache.check()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: autocommit, transactions are opened explicitly in _transaction()
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        cache = getattr(self, 'cache', None) # Not yet set while the schema is created
+        if cache: cache.check() # Counts earlier commits first, so this write's version bump covers only it
+        other_commits = conn.execute('PRAGMA data_version').fetchone()[0] # Changes only when other connections commit
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        if cache is None: return
+        cache.written()
+        # Another connection committing before written() read the file signature would be counted as part of our write
+        if conn.execute('PRAGMA data_version').fetchone()[0] != other_commits: cache.invalidate()
+
+    def _create_schema(self):
+        string_cols = ',\n'.join(f"    {col} TEXT NOT NULL DEFAULT ''" for col in ITEM_STRING_FIELDS)
+        number_cols = ',\n'.join(f"    {col} REAL NOT NULL DEFAULT 0" for col in ITEM_NUMBER_FIELDS)
+        indexed_cols = ['rating', 'social_platform', 'download_success', 'media_key', 'ooc_mask']
+        with self._transaction() as conn:
+            conn.execute(f"""CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+{string_cols},
+{number_cols},
+    download_success INTEGER NOT NULL DEFAULT 0,
+    ooc_mask INTEGER NOT NULL DEFAULT 0, -- bit i = OOC_CRITERIA_KEYS[i]
+    version INTEGER NOT NULL DEFAULT 1, -- increased by every write, for optimistic concurrency control
+    extra TEXT NOT NULL DEFAULT '{{}}' -- JSON object with any non-standard keys, kept for lossless round trips
+)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS external_links (
+    id INTEGER PRIMARY KEY,
+    item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    checklist_mask INTEGER NOT NULL DEFAULT 0 -- bit i = EVIDENCE_CRITERIA_KEYS[i]
+)""")
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_external_links_item ON external_links(item_id, position)')
+            for col in indexed_cols:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS idx_items_{col} ON items({col})')
+
+    # --- Row <-> item conversion ---
+    def _item_values(self, item):
+        values = []
+        for col in ITEM_STRING_FIELDS:
+            value = item.get(col, '')
+            values.append(value if isinstance(value, str) else ('' if value is None else str(value)))
+        for col in ITEM_NUMBER_FIELDS:
+            try: values.append(float(item.get(col) or 0.0))
+            except (TypeError, ValueError): values.append(0.0)
+        values.append(1 if item.get('download_success') else 0)
+        return values
+
+    def _insert_items(self, conn, items):
+        known = set(self.SCALAR_COLUMNS) | set(OOC_FLAG_FIELDS) | {'id', 'version', 'external_links_info'}
+        columns = ['id'] + self.SCALAR_COLUMNS + ['ooc_mask', 'version', 'extra']
+        sql = f"INSERT INTO items ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        for item in items:
+            extra = {key: value for key, value in item.items() if key not in known}
+            version = item.get('version')
+            conn.execute(sql, [item['id']] + self._item_values(item) + [
+                item_ooc_mask(item), version if isinstance(version, int) and not isinstance(version, bool) else 1,
+                json.dumps(extra, ensure_ascii=False)])
+            self._insert_links(conn, item['id'], item.get('external_links_info'))
+
+    def _insert_links(self, conn, item_id, links):
+        if not isinstance(links, list): return
+        conn.executemany('INSERT INTO external_links (item_id, position, url, description, checklist_mask) VALUES (?, ?, ?, ?, ?)', [
+            (item_id, position, str(link.get('url') or ''), str(link.get('description') or ''),
+             flags_to_mask(link.get('checklist') if isinstance(link.get('checklist'), dict) else {}, EVIDENCE_CRITERIA_KEYS))
+            for position, link in enumerate(links) if isinstance(link, dict)
+        ])
+
+    def _load_links(self, conn, item_ids=None):
+        sql = "SELECT l.item_id, l.url, l.description, l.checklist_mask FROM external_links l"
+        params = []
+        if item_ids is not None:
+            if not item_ids: return {}
+            sql += f" WHERE l.item_id IN ({', '.join('?' * len(item_ids))})"
+            params = list(item_ids)
+        links_by_item = {}
+        for row in conn.execute(sql + ' ORDER BY l.item_id, l.position', params):
+            links_by_item.setdefault(row['item_id'], []).append({
+                'url': row['url'], 'description': row['description'],
+                'checklist': mask_to_flags(row['checklist_mask'], EVIDENCE_CRITERIA_KEYS),
+            })
+        return links_by_item
+
+    def _rows_to_items(self, conn, rows, all_links=False):
+        links_by_item = self._load_links(conn, None if all_links else [row['id'] for row in rows])
+        items = []
+        for row in rows:
+            item = {'id': row['id']}
+            for col in ITEM_STRING_FIELDS: item[col] = row[col]
+            for col in ITEM_NUMBER_FIELDS: item[col] = row[col]
+            item['download_success'] = bool(row['download_success'])
+            item['version'] = row['version']
+            item.update(zip(OOC_FLAG_FIELDS, mask_to_flags(row['ooc_mask'], OOC_CRITERIA_KEYS).values()))
+            item['external_links_info'] = links_by_item.get(row['id'], [])
+            extra = json.loads(row['extra']) if row['extra'] else {}
+            items.append({**extra, **item})
+        return items
+
+    def _where_clause(self, filters):
+        clauses, params = [], []
+        for name, value in filters.items():
+            if value is None: continue
+            column = self.FILTER_COLUMNS[name]
+            clauses.append(f'{column} = ?')
+            params.append(int(value) if isinstance(value, bool) else value)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    # --- Storage interface ---
+    def load_all(self):
+        return self.cache.get(self._read_tables)
+
+    def _read_tables(self):
+        conn = self._connect()
+        with STORAGE_SECONDS.time(backend='sqlite', operation='load'):
+            rows = conn.execute('SELECT * FROM items ORDER BY id').fetchall()
+            data = self._rows_to_items(conn, rows, all_links=True)
+        STORAGE_PAYLOAD_ITEMS.observe(len(data), backend='sqlite', operation='load')
+        logging.info(f"Successfully loaded {len(data)} items from '{self.path}'.")
+        return data
+
+    def save_all(self, data, check_versions=False, renumber_ids=False):
+        items = [item for item in data if isinstance(item, dict)]
+        STORAGE_PAYLOAD_ITEMS.observe(len(items), backend='sqlite', operation='save')
+        with STORAGE_SECONDS.time(backend='sqlite', operation='save'), self._transaction() as conn:
+            if check_versions:
+                stored_items = self._rows_to_items(conn, conn.execute('SELECT * FROM items').fetchall(), all_links=True)
+                apply_replacement_versions(data, stored_items, renumber_ids)
+            elif renumber_ids: renumber_items(data)
+            conn.execute('DELETE FROM external_links')
+            conn.execute('DELETE FROM items')
+            self._insert_items(conn, items)
+
+    def get_item(self, item_id):
+        conn = self._connect()
+        rows = conn.execute('SELECT * FROM items WHERE id = ?', (item_id,)).fetchall()
+        return self._rows_to_items(conn, rows)[0] if rows else None
+
+    def query_items(self, filters, cursor=None, limit=PAGE_SIZE):
+        where, params = self._where_clause(filters)
+        conn = self._connect()
+        total = conn.execute(f'SELECT COUNT(*) FROM items{where}', params).fetchone()[0]
+        if cursor is not None:
+            where += (' AND' if where else ' WHERE') + ' id > ?'
+            params = params + [cursor]
+        rows = conn.execute(f'SELECT * FROM items{where} ORDER BY id LIMIT ?', params + [limit + 1]).fetchall()
+        window_rows = rows[:limit]
+        next_cursor = window_rows[-1]['id'] if len(rows) > limit else None
+        return self._rows_to_items(conn, window_rows), next_cursor, total
+
+    def create_item(self, fields):
+        with self._transaction() as conn:
+            new_id = conn.execute('SELECT COALESCE(MAX(id), -1) + 1 FROM items').fetchone()[0]
+            item = normalize_item({'id': new_id, **fields, 'version': 1})
+            self._insert_items(conn, [item])
+        return self.get_item(new_id)
+
+    def create_items(self, fields_list):
+        with self._transaction() as conn:
+            first_id = conn.execute('SELECT COALESCE(MAX(id), -1) + 1 FROM items').fetchone()[0]
+            items = [normalize_item({'id': first_id + offset, **fields, 'version': 1}) for offset, fields in enumerate(fields_list)]
+            self._insert_items(conn, items)
+        return items
+
+    def _check_version(self, conn, item_id, expected_version):
+        """Returns False if the item does not exist; raises VersionConflict if it is not at expected_version."""
+        row = conn.execute('SELECT version FROM items WHERE id = ?', (item_id,)).fetchone()
+        if row is None: return False
+        if expected_version is not None and row['version'] != expected_version:
+            raise VersionConflict(self._rows_to_items(conn, conn.execute('SELECT * FROM items WHERE id = ?', (item_id,)).fetchall())[0])
+        return True
+
+    def _update_row(self, conn, item_id, fields, expected_version=None):
+        if not self._check_version(conn, item_id, expected_version): return False
+        conn.execute('UPDATE items SET version = version + 1 WHERE id = ?', (item_id,))
+        scalar_fields = [col for col in self.SCALAR_COLUMNS if col in fields]
+        if scalar_fields:
+            values = self._item_values(fields)
+            by_column = dict(zip(self.SCALAR_COLUMNS, values))
+            conn.execute(f"UPDATE items SET {', '.join(f'{col} = ?' for col in scalar_fields)} WHERE id = ?",
+                         [by_column[col] for col in scalar_fields] + [item_id])
+        flag_fields = [field for field in OOC_FLAG_FIELDS if field in fields]
+        if flag_fields:
+            # Only the changed bits: clear them all, then set the ones that are now true
+            changed = sum(1 << OOC_FLAG_FIELDS.index(field) for field in flag_fields)
+            conn.execute('UPDATE items SET ooc_mask = (ooc_mask & ~?) | ? WHERE id = ?',
+                         (changed, item_ooc_mask({field: fields[field] for field in flag_fields}), item_id))
+        if 'external_links_info' in fields:
+            conn.execute('DELETE FROM external_links WHERE item_id = ?', (item_id,))
+            self._insert_links(conn, item_id, fields['external_links_info'])
+        return True
+
+    def update_item(self, item_id, fields, expected_version=None):
+        with self._transaction() as conn:
+            if not self._update_row(conn, item_id, fields, expected_version): return None
+            return self._rows_to_items(conn, conn.execute('SELECT * FROM items WHERE id = ?', (item_id,)).fetchall())[0]
+
+    def update_items(self, updates, return_items=False):
+        with self._transaction() as conn:
+            updated_ids = [item_id for item_id, fields in updates.items() if self._update_row(conn, item_id, fields)]
+            if not return_items: return len(updated_ids)
+            items = []
+            for start in range(0, len(updated_ids), self.ID_BATCH_SIZE):
+                batch = updated_ids[start:start + self.ID_BATCH_SIZE]
+                rows = conn.execute(f"SELECT * FROM items WHERE id IN ({', '.join('?' * len(batch))}) ORDER BY id", batch).fetchall()
+                items += self._rows_to_items(conn, rows)
+            return items
+
+    def delete_item(self, item_id, expected_version=None):
+        with self._transaction() as conn:
+            if not self._check_version(conn, item_id, expected_version): return False
+            return conn.execute('DELETE FROM items WHERE id = ?', (item_id,)).rowcount > 0
+
+    def delete_items(self, item_ids):
+        with self._transaction() as conn:
+            return sum(conn.execute('DELETE FROM items WHERE id = ?', (item_id,)).rowcount for item_id in item_ids)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage():
+    """Returns the process-wide storage backend selected by STORAGE_BACKEND."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_BACKEND == 'sqlite':
+                _storage = SqliteStorage(SQLITE_FILE)
+            elif STORAGE_BACKEND == 'json':
+                _storage = JsonStorage(DATA_FILE)
+            else:
+                raise ValueError(f"Unknown storage backend '{STORAGE_BACKEND}' (expected 'json' or 'sqlite').")
+            logging.info(f"Using '{STORAGE_BACKEND}' storage backend.")
+        return _storage
+
+
+# --- Helper Functions (load_data, save_data, parse_social_platform) ---
+def load_data():
+    """Loads all items from the configured storage backend. Raises StorageError if they cannot be read.
+    Served from the dataset cache while the data files are unchanged; the list is shared, do not modify it."""
+    try:
+        return get_storage().load_all()
     except json.JSONDecodeError as e:
         logging.error(f"Error decoding JSON from data file '{DATA_FILE}': {e}")
-        return []
+        raise StorageError(f"The data file '{DATA_FILE}' is not valid JSON: {e}") from e
     except Exception as e:
-        logging.error(f"An unexpected error occurred loading data from '{DATA_FILE}': {e}")
-        return []
+        logging.error(f"An unexpected error occurred loading data ({STORAGE_BACKEND} backend): {e}")
+        raise StorageError(f"Could not load the dataset ({STORAGE_BACKEND} backend): {e}") from e
 
 
-def save_data(data):
-    """Saves data to the JSON file, ensuring sequential IDs."""
+def save_data(data, renumber_ids=True, check_versions=False):
+    """Replaces the stored dataset, ensuring sequential IDs.
+    With check_versions, raises VersionConflict if an item's 'version' is no longer the stored one. Versions
+    are checked against the IDs as sent; the storage renumbers only after the check passed.
+    Item-level API writes go through create_item()/update_item()/delete_item() instead."""
     try:
         for i, item in enumerate(data):
             if isinstance(item, dict):
-                 item['id'] = i
-                 # Optional: Clean/validate link checklist structure before saving
-                 if isinstance(item.get('external_links_info'), list):
-                     for link_info in item['external_links_info']:
-                         if isinstance(link_info, dict) and isinstance(link_info.get('checklist'), dict):
-                             # Ensure only valid keys are saved (prevents injection)
-                             valid_checklist = {key: link_info['checklist'].get(key, False) for key in EVIDENCE_CRITERIA_KEYS if key in link_info['checklist']}
-                             link_info['checklist'] = valid_checklist
-                         else:
-                              # Handle malformed link data if necessary
-                              pass
+                 clean_item_links(item)
             else:
-                logging.warning(f"Item at index {i} is not a dictionary ({type(item)}), skipping ID assignment.")
+                logging.warning(f"Item at index {i} is not a dictionary ({type(item)}), skipping link cleanup.")
 
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        logging.info(f"Successfully saved {len(data)} items to '{DATA_FILE}'.")
+        get_storage().save_all(data, check_versions=check_versions, renumber_ids=renumber_ids)
+        logging.info(f"Successfully saved {len(data)} items ({STORAGE_BACKEND} backend).")
+        notify_dataset_change('replaced')
         return True
+    except VersionConflict:
+        raise
     except IOError as e:
-        logging.error(f"IOError saving data file '{DATA_FILE}': {e}")
+        logging.error(f"IOError saving data ({STORAGE_BACKEND} backend): {e}")
         return False
     except TypeError as e:
         logging.error(f"TypeError serializing data to JSON (check data types): {e}")
         return False
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error saving data to '{SQLITE_FILE}': {e}")
+        return False
     except Exception as e:
-        logging.error(f"An unexpected error occurred during save to '{DATA_FILE}': {e}")
+        logging.error(f"An unexpected error occurred during save ({STORAGE_BACKEND} backend): {e}")
         return False
 
 
@@ -149,250 +1091,2201 @@ def parse_social_platform(url_string):
     except ValueError: return ""
     except Exception as e: logging.error(f"Error parsing URL {url_string} for platform: {e}"); return ""
 
-# +++ START: Politifact Headline/Subheadline Fetching Helpers +++
-def get_headline(url):
-    """Fetches the headline (og:title or h1) from a Politifact URL."""
-    if not url or not url.startswith(('http://', 'https://')):
-        logging.warning(f"Invalid or missing URL for headline fetch: {url}")
-        return None
+# --- Dataset Change Listeners ---
+# Called after every successful write made through this module: listener(event, payload, version) with
+# ('items', [stored items]) for creates/updates, ('deleted', [ids]) and ('replaced', None) for whole-dataset saves.
+# An incremental listener at data_version() v may apply the payload only if version == v + 1: anything else
+# means another write (of this or another process) landed in between, and it has to rebuild.
+dataset_listeners = []
+dataset_listener_checks = [] # Callables telling whether a listener currently uses item payloads
+
+def on_dataset_change(listener, needs_items=None):
+    """Registers listener. needs_items(), if given, returns False while the listener would ignore item
+    payloads anyway (e.g. not built yet), so batch writers can skip collecting the updated items."""
+    dataset_listeners.append(listener)
+    dataset_listener_checks.append(needs_items or (lambda: True))
+    return listener
+
+
+def dataset_listeners_need_items():
+    return any(check() for check in dataset_listener_checks)
+
+
+def notify_dataset_change(event, payload=None):
+    """Called by the writing thread right after a write: listeners also get the storage's data_version()
+    right after it, or None if that version may include other writes too (see DatasetCache.last_write_version())."""
+    version = get_storage().cache.last_write_version()
+    for listener in dataset_listeners:
+        try: listener(event, payload, version)
+        except Exception as e: logging.exception(f"Dataset listener {listener.__name__} failed on '{event}': {e}")
+
+
+# --- Helper Functions (Item-level create/update/delete) ---
+def validate_item_fields(fields):
+    """Validates a field-level diff for one item. Returns an error message, or None if valid."""
+    if not isinstance(fields, dict): return "Expected a JSON object of fields."
+    for key, value in fields.items():
+        if key in ITEM_STRING_FIELDS:
+            if not isinstance(value, str): return f"Field '{key}' must be a string."
+        elif key in ITEM_BOOL_FIELDS:
+            if not isinstance(value, bool): return f"Field '{key}' must be a boolean."
+        elif key in ITEM_NUMBER_FIELDS:
+            if isinstance(value, bool) or not isinstance(value, (int, float)): return f"Field '{key}' must be a number."
+        elif key in ITEM_LIST_FIELDS:
+            if not isinstance(value, list) or not all(isinstance(link, dict) for link in value):
+                return f"Field '{key}' must be a list of objects."
+        else:
+            return f"Unknown or read-only field '{key}'."
+    return None
+
+
+def dataset_etag():
+    """Returns an ETag for the current dataset version (unique per process, so restarts never reuse one)."""
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, timeout=15, headers=headers, allow_redirects=True)
-        response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Prioritize og:title
-        meta_tag = soup.find('meta', property='og:title')
-        if meta_tag and meta_tag.get('content'):
-            logging.info(f"Found og:title: '{meta_tag['content'][:50]}...' for {url}")
-            return meta_tag['content'].strip()
-
-        # Fallback to the main h1 tag
-        h1_tag = soup.find('h1')
-        if h1_tag:
-            # Sometimes h1 contains nested elements, get_text handles this
-            headline_text = h1_tag.get_text(strip=True)
-            logging.info(f"Found h1: '{headline_text[:50]}...' for {url}")
-            return headline_text
-
-        logging.warning(f"Could not find og:title or h1 tag for URL: {url}")
+        return f"{PROCESS_TOKEN}-{get_storage().data_version()}"
+    except Exception as e:
+        logging.error(f"Error checking dataset version: {e}")
         return None
 
-    except requests.exceptions.Timeout:
-        logging.error(f"Timeout error fetching headline for URL: {url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Requests error fetching headline for URL {url}: {e}")
-        return None
+
+def get_item(item_id):
+    """Returns one item by id, or None if it does not exist. Raises StorageError if storage fails."""
+    try:
+        return get_storage().get_item(item_id)
     except Exception as e:
-        logging.error(f"Unexpected error getting headline for URL {url}: {e}", exc_info=True)
-        return None
+        logging.error(f"Error loading item {item_id}: {e}")
+        raise StorageError(f"Could not load item {item_id}: {e}") from e
 
-def get_subheadline(url):
-    """Fetches the subheadline (og:description) from a Politifact URL."""
+
+def query_items(filters, cursor=None, limit=PAGE_SIZE):
+    """Returns (window, next_cursor, total) for the filtered items. Raises StorageError if storage fails."""
+    try:
+        return get_storage().query_items(filters, cursor, limit)
+    except Exception as e:
+        logging.error(f"Error querying items: {e}")
+        raise StorageError(f"Could not query items: {e}") from e
+
+
+def create_item(fields):
+    """Appends a new item with the next free id. Returns a result dict like the yt-dlp helpers."""
+    try:
+        item = get_storage().create_item(fields)
+    except Exception as e:
+        logging.exception(f"Error creating item: {e}")
+        return {"success": False, "message": f"Failed to create item: {e}"}
+    logging.info(f"Created item {item['id']}.")
+    notify_dataset_change('items', [item])
+    return {"success": True, "item": item}
+
+
+def create_items(fields_list):
+    """Appends many new items with consecutive ids in one write. Returns a result dict with 'items'."""
+    try:
+        items = get_storage().create_items(fields_list)
+    except Exception as e:
+        logging.exception(f"Error creating {len(fields_list)} items: {e}")
+        return {"success": False, "message": f"Failed to create items: {e}"}
+    logging.info(f"Created {len(items)} items in one batch.")
+    notify_dataset_change('items', items)
+    return {"success": True, "items": items}
+
+
+def update_item(item_id, fields, expected_version=None):
+    """Applies a field-level diff to one item. Returns a result dict ('not_found' set if the id is unknown,
+    'conflict' plus the stored 'item' if expected_version is given and no longer current)."""
+    try:
+        item = get_storage().update_item(item_id, fields, expected_version)
+    except VersionConflict as e:
+        logging.info(f"Rejected stale update of item {item_id}: {e}")
+        return {"success": False, "conflict": True, "item": e.item, "message": str(e)}
+    except Exception as e:
+        logging.exception(f"Error updating item {item_id}: {e}")
+        return {"success": False, "message": f"Failed to update item: {e}"}
+    if item is None:
+        return {"success": False, "not_found": True, "message": f"Item {item_id} not found."}
+    logging.info(f"Updated item {item_id} ({', '.join(sorted(fields)) or 'no fields'}).")
+    notify_dataset_change('items', [item])
+    return {"success": True, "item": item}
+
+
+def update_items(updates):
+    """Applies {item_id: fields} diffs to many items in one batched write. Returns a result dict."""
+    if not updates: return {"success": True, "updated": 0}
+    return_items = dataset_listeners_need_items()
+    try:
+        result = get_storage().update_items(updates, return_items=return_items)
+    except Exception as e:
+        logging.exception(f"Error updating {len(updates)} items: {e}")
+        return {"success": False, "message": f"Failed to update items: {e}"}
+    updated = len(result) if return_items else result
+    logging.info(f"Updated {updated} items in one batch.")
+    if return_items: notify_dataset_change('items', result)
+    return {"success": True, "updated": updated}
+
+
+def delete_item(item_id, expected_version=None):
+    """Removes one item without renumbering the others. Returns a result dict (see update_item())."""
+    try:
+        found = get_storage().delete_item(item_id, expected_version)
+    except VersionConflict as e:
+        logging.info(f"Rejected stale delete of item {item_id}: {e}")
+        return {"success": False, "conflict": True, "item": e.item, "message": str(e)}
+    except Exception as e:
+        logging.exception(f"Error deleting item {item_id}: {e}")
+        return {"success": False, "message": f"Failed to delete item: {e}"}
+    if not found:
+        return {"success": False, "not_found": True, "message": f"Item {item_id} not found."}
+    logging.info(f"Deleted item {item_id}.")
+    notify_dataset_change('deleted', [item_id])
+    return {"success": True}
+
+
+def delete_items(item_ids):
+    """Removes many items in one write, without renumbering. Returns a result dict."""
+    if not item_ids: return {"success": True, "deleted": 0}
+    try:
+        deleted = get_storage().delete_items(item_ids)
+    except Exception as e:
+        logging.exception(f"Error deleting {len(item_ids)} items: {e}")
+        return {"success": False, "message": f"Failed to delete items: {e}"}
+    logging.info(f"Deleted {deleted} items in one batch.")
+    notify_dataset_change('deleted', list(item_ids))
+    return {"success": True, "deleted": deleted}
+
+
+# --- Helper Functions (Item filtering & pagination) ---
+def parse_bool_param(value):
+    """Parses a query-string boolean ('true'/'false'/'1'/'0'). Returns None if absent, raises ValueError if invalid."""
+    if value is None or value == '': return None
+    lowered = value.strip().lower()
+    if lowered in ('true', '1', 'yes'): return True
+    if lowered in ('false', '0', 'no'): return False
+    raise ValueError(f"Invalid boolean value: '{value}'")
+
+
+def parse_item_filters(args):
+    """Extracts item filters (rating, platform, download_success) from request args.
+    Returns (filters, error_message)."""
+    filters = {
+        'rating': args.get('rating') or None,
+        'platform': args.get('platform') or None,
+    }
+    try:
+        filters['download_success'] = parse_bool_param(args.get('download_success'))
+    except ValueError as e:
+        return None, str(e)
+    return filters, None
+
+
+def filter_items(data, rating=None, platform=None, download_success=None):
+    """Returns the items matching all given filters (None means 'any')."""
+    if rating is None and platform is None and download_success is None:
+        return data
+    return [
+        item for item in data
+        if (rating is None or item.get('rating') == rating)
+        and (platform is None or item.get('social_platform') == platform)
+        and (download_success is None or bool(item.get('download_success')) == download_success)
+    ]
+
+
+def paginate_items(items, cursor=None, limit=PAGE_SIZE):
+    """Returns (window, next_cursor) for a keyset page of items.
+    The cursor is the id of the last item of the previous window; items are kept in id order
+    (save_data() renumbers sequentially, create_item() appends with the next free id).
+    SqliteStorage runs the same keyset query in SQL."""
+    if cursor is not None:
+        items = [item for item in items if isinstance(item.get('id'), int) and item['id'] > cursor]
+    window = items[:limit]
+    next_cursor = window[-1].get('id') if len(items) > limit and window else None
+    return window, next_cursor
+
+# --- Streaming Import (JSON array or JSONL, upserted by politifact_url + social_link) ---
+def import_key(item):
+    """The stable identity of an item across files and renumbering."""
+    return (item.get('politifact_url') or '', item.get('social_link') or '')
+
+
+def iter_json_records(stream, chunk_size=IMPORT_READ_CHUNK_CHARS):
+    """Yields (position, record, error) for each record of a JSON array or JSONL text stream, holding one
+    chunk plus the record being decoded in memory. A bad JSONL line yields an error and parsing goes on;
+    a malformed JSON array raises ValueError, since nothing after the error can be trusted."""
+    buffer = ''
+    while not buffer.strip():
+        chunk = stream.read(chunk_size)
+        if not chunk: return
+        buffer += chunk
+    buffer = buffer.lstrip()
+
+    if not buffer.startswith('['): # JSONL: one object per line
+        line_number = 0
+        for line in itertools.chain(io.StringIO(buffer + stream.readline()), iter(stream.readline, '')):
+            line_number += 1
+            if not line.strip(): continue
+            try: yield line_number, json.loads(line), None
+            except ValueError as e: yield line_number, None, f"Line {line_number}: invalid JSON ({e})."
+        return
+
+    decoder = json.JSONDecoder()
+    position, index, eof, expect_value = 1, 0, False, True
+    # Doubled while one record stays incomplete: every retry decodes the record from its start again,
+    # so a record spanning n chunks is decoded O(log n) times instead of n times
+    read_size = chunk_size
+    while True:
+        # Skip separators; fetch more text when the buffer runs dry
+        while position < len(buffer) and (buffer[position].isspace() or (buffer[position] == ',' and not expect_value)):
+            if buffer[position] == ',': expect_value = True
+            position += 1
+        if position >= len(buffer):
+            if eof: raise ValueError("Unexpected end of file: the JSON array is not closed.")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if buffer[position] == ']':
+            if expect_value and index: raise ValueError(f"Trailing comma after record {index - 1}.")
+            return
+        if not expect_value: raise ValueError(f"Expected ',' or ']' after record {index - 1}.")
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if eof: raise ValueError(f"Invalid JSON in record {index}: {e}")
+            if len(buffer) - position > IMPORT_MAX_RECORD_CHARS:
+                raise ValueError(f"Record {index} is malformed or larger than {IMPORT_MAX_RECORD_CHARS} characters.")
+            chunk = stream.read(read_size) # Most likely the record continues in the next chunk
+            read_size *= 2
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield index, record, None
+        index += 1
+        read_size = chunk_size
+        position, expect_value = end, False
+
+
+def import_records(records, mode='merge', progress_callback=None):
+    """Upserts records from iter_json_records() by (politifact_url, social_link), writing every
+    IMPORT_BATCH_SIZE records. Existing items keep their id and only the fields present in the record change.
+    mode='replace' also removes the items not present in the import (only if the whole import succeeded).
+    Several stored items with the same key are all updated in merge mode; replace keeps the first of them
+    and removes the others, so afterwards the dataset holds exactly one item per imported key.
+    progress_callback(counts) is called after each batch. Returns a result dict."""
+    ids_by_key = {} # key -> stored item ids, in dataset order
+    for item in load_data():
+        if isinstance(item.get('id'), int): ids_by_key.setdefault(import_key(item), []).append(item['id'])
+    seen_keys = set()
+    counts = {"records": 0, "created": 0, "updated": 0, "skipped": 0, "removed": 0}
+    errors = []
+    creates, updates = {}, {} # key -> fields, item id -> fields
+
+    def skip(message):
+        counts["skipped"] += 1
+        if len(errors) < IMPORT_MAX_ERRORS: errors.append(message)
+
+    def flush():
+        if creates:
+            result = create_items(list(creates.values()))
+            if not result["success"]: raise RuntimeError(result["message"])
+            for key, item in zip(creates, result["items"]): ids_by_key[key] = [item['id']]
+            counts["created"] += len(creates)
+        if updates:
+            result = update_items(updates)
+            if not result["success"]: raise RuntimeError(result["message"])
+            counts["updated"] += result["updated"]
+        creates.clear(); updates.clear()
+        if progress_callback: progress_callback(dict(counts))
+
+    try:
+        for position, record, error in records:
+            counts["records"] += 1
+            if error: skip(error); continue
+            if not isinstance(record, dict): skip(f"Record {position}: not a JSON object."); continue
+            try: fields = expand_item({key: value for key, value in record.items() if key not in ('id', 'version')})
+            except ValueError as e: skip(f"Record {position}: {e}"); continue
+            error = validate_item_fields(fields)
+            if error: skip(f"Record {position}: {error}"); continue
+            key = import_key(fields)
+            if key == ('', ''): skip(f"Record {position}: needs a politifact_url or social_link."); continue
+            seen_keys.add(key)
+            if key in ids_by_key:
+                for item_id in (ids_by_key[key] if mode == 'merge' else ids_by_key[key][:1]):
+                    updates.setdefault(item_id, {}).update(fields)
+            elif key in creates: creates[key].update(fields) # Repeated within this batch
+            else: creates[key] = fields
+            if len(creates) + len(updates) >= IMPORT_BATCH_SIZE: flush()
+        flush()
+    except Exception as e:
+        logging.exception(f"Import aborted: {e}")
+        return {"success": False, "message": f"Import aborted after {counts['records']} records (earlier batches were saved): {e}",
+                "errors": errors, **counts}
+
+    if mode == 'replace':
+        stale_ids = [item_id for key, item_ids in ids_by_key.items()
+                     for item_id in (item_ids if key not in seen_keys else item_ids[1:])]
+        result = delete_items(stale_ids)
+        if not result["success"]: return {"success": False, "message": result["message"], "errors": errors, **counts}
+        counts["removed"] = result["deleted"]
+    message = (f"Imported {counts['records']} records: {counts['created']} created, {counts['updated']} updated, "
+               f"{counts['skipped']} skipped" + (f", {counts['removed']} removed." if mode == 'replace' else "."))
+    logging.info(message)
+    return {"success": True, "message": message, "errors": errors, **counts}
+
+
+# --- Export (streamed JSONL, flattened CSV, Parquet) ---
+EXPORT_CSV_COLUMNS = (['id'] + ITEM_STRING_FIELDS + ITEM_NUMBER_FIELDS + ITEM_BOOL_FIELDS +
+                      ['evidence_links', 'evidence_link_urls'] + [f'evidence_{key}' for key in EVIDENCE_CRITERIA_KEYS])
+
+def iter_export_items(filters):
+    """Yields pages of filtered items in id order, EXPORT_PAGE_SIZE at a time, so an export never holds
+    more than one page of its own. Storage errors propagate (a silently truncated export would look complete)."""
+    cursor = None
+    while True:
+        window, cursor, _ = get_storage().query_items(filters, cursor, EXPORT_PAGE_SIZE)
+        if window: yield window
+        if cursor is None: return
+
+
+def flatten_item(item):
+    """One flat row per item: scalar fields, one column per ooc_* flag, and per evidence criterion the
+    number of the item's links that meet it."""
+    links = [link for link in item.get('external_links_info') or [] if isinstance(link, dict)]
+    row = {column: item.get(column) for column in ['id'] + ITEM_STRING_FIELDS + ITEM_NUMBER_FIELDS}
+    row.update({column: bool(item.get(column)) for column in ITEM_BOOL_FIELDS})
+    row['evidence_links'] = len(links)
+    row['evidence_link_urls'] = ' '.join(link.get('url') or '' for link in links)
+    for key in EVIDENCE_CRITERIA_KEYS:
+        row[f'evidence_{key}'] = sum(1 for link in links if isinstance(link.get('checklist'), dict) and link['checklist'].get(key))
+    return row
+
+
+def export_jsonl(filters, compact=False):
+    for page in iter_export_items(filters):
+        if compact: page = map(compact_item, page)
+        yield ''.join(json.dumps(item, ensure_ascii=False, separators=(',', ':')) + '\n' for item in page)
+
+
+def export_csv(filters):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for page in iter_export_items(filters):
+        writer.writerows(map(flatten_item, page))
+        yield buffer.getvalue()
+        buffer.seek(0); buffer.truncate()
+    if buffer.tell(): yield buffer.getvalue() # Header only (no matching items)
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object that collects bytes until take() hands them to a streaming response."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks, self._position = [], 0
+
+    def writable(self): return True
+    def tell(self): return self._position
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def take(self):
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+def export_parquet_schema():
+    checklist_type = pa.struct([(key, pa.bool_()) for key in EVIDENCE_CRITERIA_KEYS])
+    link_type = pa.struct([('url', pa.string()), ('description', pa.string()), ('checklist', checklist_type)])
+    return pa.schema(
+        [('id', pa.int64())] + [(col, pa.string()) for col in ITEM_STRING_FIELDS] +
+        [(col, pa.float64()) for col in ITEM_NUMBER_FIELDS] + [(col, pa.bool_()) for col in ITEM_BOOL_FIELDS] +
+        [('evidence_links', pa.int32())] + [(f'evidence_{key}', pa.int32()) for key in EVIDENCE_CRITERIA_KEYS] +
+        [('external_links_info', pa.list_(link_type))] # Links kept nested as well, for consumers that want them
+    )
+
+
+def export_parquet(filters):
+    """Writes one row group per page and streams the bytes as they are produced; the footer comes last."""
+    schema = export_parquet_schema()
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for page in iter_export_items(filters):
+            rows = []
+            for item in page:
+                row = flatten_item(item)
+                row['external_links_info'] = [{
+                    'url': link.get('url') or '', 'description': link.get('description') or '',
+                    'checklist': {key: bool((link.get('checklist') or {}).get(key)) for key in EVIDENCE_CRITERIA_KEYS},
+                } for link in item.get('external_links_info') or [] if isinstance(link, dict)]
+                rows.append(row)
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+EXPORT_FORMATS = { # format -> (generator, mimetype)
+    'jsonl': (export_jsonl, 'application/x-ndjson'),
+    'csv': (export_csv, 'text/csv'),
+    'parquet': (export_parquet, 'application/vnd.apache.parquet'),
+}
+
+
+# --- Analytics Snapshot (columnar NumPy copy of the annotation features, for /api/stats) ---
+class AnalyticsSnapshot:
+    """Columnar copy of the features the analysis notebook aggregates: one row per item (ooc_* flags, rating,
+    platform, duration, download_success) and one row per evidence link (checklist flags -> item row).
+
+    Kept current incrementally through the dataset change listeners: a changed item overwrites its row in
+    place and re-appends its links, deleted rows are masked out, and rows are only rebuilt from storage when
+    the dataset changed behind our back (another process, whole-file save) or too many rows are dead.
+    Aggregations are then a few vectorized NumPy operations instead of a pass over the nested JSON."""
+
+    COMPACT_RATIO = 0.5 # Rebuild when more than this fraction of link rows is dead
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None # Storage data_version() this snapshot reflects; None forces a rebuild
+        self._reset()
+
+    def _reset(self):
+        self.items = {
+            'id': np.zeros(0, np.int64), 'live': np.zeros(0, bool), 'rating': np.zeros(0, np.int32),
+            'platform': np.zeros(0, np.int32), 'duration': np.zeros(0, np.float64),
+            'downloaded': np.zeros(0, bool), 'ooc': np.zeros((0, len(OOC_CRITERIA_KEYS)), bool),
+        }
+        self.links = {'item_row': np.zeros(0, np.int64), 'live': np.zeros(0, bool),
+                      'checklist': np.zeros((0, len(EVIDENCE_CRITERIA_KEYS)), bool)}
+        self.item_count = self.link_count = 0 # Rows in use (live or dead)
+        self.row_of = {} # item id -> item row
+        self.link_rows_of = {} # item row -> [link rows]
+        self.categories = {'rating': [], 'platform': []}
+        self._codes = {'rating': {}, 'platform': {}}
+
+    @staticmethod
+    def _grow(table, needed):
+        capacity = len(table['live'])
+        if needed <= capacity: return
+        new_capacity = max(needed, capacity * 2, 64)
+        for name, column in table.items():
+            grown = np.zeros((new_capacity,) + column.shape[1:], column.dtype)
+            grown[:capacity] = column
+            table[name] = grown
+
+    def _code(self, kind, value):
+        value = value if isinstance(value, str) else ''
+        codes = self._codes[kind]
+        if value not in codes:
+            codes[value] = len(self.categories[kind])
+            self.categories[kind].append(value)
+        return codes[value]
+
+    def _apply_items(self, items):
+        self._grow(self.items, self.item_count + len(items))
+        self._grow(self.links, self.link_count + sum(len(item.get('external_links_info') or []) for item in items))
+        columns, links = self.items, self.links
+        for item in items:
+            row = self.row_of.get(item.get('id'))
+            if row is None:
+                row = self.row_of[item['id']] = self.item_count
+                self.item_count += 1
+            for link_row in self.link_rows_of.pop(row, ()): links['live'][link_row] = False
+            columns['id'][row] = item['id']
+            columns['live'][row] = True
+            columns['rating'][row] = self._code('rating', item.get('rating'))
+            columns['platform'][row] = self._code('platform', item.get('social_platform'))
+            try: columns['duration'][row] = float(item.get('social_duration') or 0.0)
+            except (TypeError, ValueError): columns['duration'][row] = 0.0
+            columns['downloaded'][row] = bool(item.get('download_success'))
+            columns['ooc'][row] = [bool(item.get(f'ooc_{key}')) for key in OOC_CRITERIA_KEYS]
+            link_rows = []
+            for link in item.get('external_links_info') or []:
+                if not isinstance(link, dict): continue
+                checklist = link.get('checklist') if isinstance(link.get('checklist'), dict) else {}
+                links['item_row'][self.link_count] = row
+                links['live'][self.link_count] = True
+                links['checklist'][self.link_count] = [bool(checklist.get(key)) for key in EVIDENCE_CRITERIA_KEYS]
+                link_rows.append(self.link_count)
+                self.link_count += 1
+            self.link_rows_of[row] = link_rows
+
+    def _delete_ids(self, item_ids):
+        for item_id in item_ids:
+            row = self.row_of.pop(item_id, None)
+            if row is None: continue
+            self.items['live'][row] = False
+            for link_row in self.link_rows_of.pop(row, ()): self.links['live'][link_row] = False
+
+    def _rebuild(self):
+        self._reset()
+        version = get_storage().data_version() # Taken first: a write during the load then makes the next read rebuild again
+        self._apply_items([item for item in load_data() if isinstance(item, dict) and isinstance(item.get('id'), int)])
+        self.version = version
+        logging.info(f"Analytics snapshot rebuilt ({self.item_count} items, {self.link_count} links).")
+
+    def on_change(self, event, payload, version):
+        with self._lock:
+            if self.version is None: return # Not built yet; the first read builds it
+            if event not in ('items', 'deleted') or version is None or version != self.version + 1:
+                self.version = None; return # Whole-dataset save, or missed writes in between
+            if event == 'items': self._apply_items(payload)
+            else: self._delete_ids(payload)
+            dead_links = self.link_count - int(self.links['live'][:self.link_count].sum())
+            if self.link_count and dead_links > self.COMPACT_RATIO * self.link_count:
+                self.version = None; return
+            self.version = version
+
+    def _current(self):
+        """Rebuilds if the dataset changed without passing through our listeners. Caller holds the lock."""
+        if self.version is None or self.version != get_storage().data_version(): self._rebuild()
+
+    def _item_mask(self, rating=None, platform=None, download_success=None):
+        count = self.item_count
+        mask = self.items['live'][:count].copy()
+        for kind, value in (('rating', rating), ('platform', platform)):
+            if value is None: continue
+            code = self._codes[kind].get(value)
+            if code is None: return np.zeros(count, bool)
+            mask &= self.items[kind][:count] == code
+        if download_success is not None: mask &= self.items['downloaded'][:count] == download_success
+        return mask
+
+    @staticmethod
+    def _breakdown(codes, categories, mask, ooc, duration):
+        """Per-category counts, ooc flag sums and mean duration."""
+        selected = codes[mask]
+        counts = np.bincount(selected, minlength=len(categories))
+        ooc_sums = np.stack([np.bincount(selected, weights=ooc[:, i], minlength=len(categories))
+                             for i in range(ooc.shape[1])], axis=1).astype(np.int64)
+        duration_sums = np.bincount(selected, weights=duration, minlength=len(categories))
+        return {
+            (categories[code] or '(none)'): {
+                "count": int(counts[code]),
+                "ooc": dict(zip(OOC_CRITERIA_KEYS, ooc_sums[code].tolist())),
+                "mean_duration": round(float(duration_sums[code] / counts[code]), 2),
+            } for code in np.flatnonzero(counts)
+        }
+
+    def stats(self, filters):
+        """Aggregations over the (filtered) live items, as a JSON-ready dict."""
+        with self._lock:
+            self._current()
+            mask = self._item_mask(**filters)
+            count = self.item_count
+            # float64 so the co-occurrence products go through BLAS; counts stay exact far beyond any dataset size
+            ooc = self.items['ooc'][:count][mask].astype(np.float64)
+            duration = self.items['duration'][:count][mask]
+            link_mask = self.links['live'][:self.link_count] & mask[self.links['item_row'][:self.link_count]]
+            checklist = self.links['checklist'][:self.link_count][link_mask].astype(np.float64)
+            links_per_item = np.bincount(self.links['item_row'][:self.link_count][link_mask], minlength=count)[mask]
+            total = int(mask.sum())
+            return {
+                "total": total,
+                "downloaded": int(self.items['downloaded'][:count][mask].sum()),
+                "duration": {
+                    "sum": round(float(duration.sum()), 2),
+                    "mean": round(float(duration.mean()), 2) if total else 0.0,
+                    "median": round(float(np.median(duration)), 2) if total else 0.0,
+                },
+                "ooc_counts": dict(zip(OOC_CRITERIA_KEYS, ooc.sum(axis=0).astype(np.int64).tolist())),
+                "ooc_flags_per_item": np.bincount(ooc.sum(axis=1).astype(np.int64), minlength=len(OOC_CRITERIA_KEYS) + 1).tolist(),
+                "ooc_cooccurrence": {"keys": OOC_CRITERIA_KEYS, "matrix": (ooc.T @ ooc).astype(np.int64).tolist()},
+                "by_rating": self._breakdown(self.items['rating'][:count], self.categories['rating'], mask, ooc, duration),
+                "by_platform": self._breakdown(self.items['platform'][:count], self.categories['platform'], mask, ooc, duration),
+                "evidence": {
+                    "links": int(link_mask.sum()),
+                    "links_per_item_mean": round(float(links_per_item.mean()), 2) if total else 0.0,
+                    "criteria_counts": dict(zip(EVIDENCE_CRITERIA_KEYS, checklist.sum(axis=0).astype(np.int64).tolist())),
+                    "cooccurrence": {"keys": EVIDENCE_CRITERIA_KEYS, "matrix": (checklist.T @ checklist).astype(np.int64).tolist()},
+                },
+            }
+
+    def arrow_tables(self, filters):
+        """(items, links) as pyarrow Tables of the (filtered) live rows, for the Parquet dump."""
+        with self._lock:
+            self._current()
+            mask = self._item_mask(**filters)
+            count, columns = self.item_count, self.items
+            rating = pa.DictionaryArray.from_arrays(columns['rating'][:count][mask], self.categories['rating'] or [''])
+            platform = pa.DictionaryArray.from_arrays(columns['platform'][:count][mask], self.categories['platform'] or [''])
+            items = pa.table({
+                'id': columns['id'][:count][mask], 'rating': rating, 'social_platform': platform,
+                'social_duration': columns['duration'][:count][mask], 'download_success': columns['downloaded'][:count][mask],
+                **{f'ooc_{key}': columns['ooc'][:count][mask][:, i] for i, key in enumerate(OOC_CRITERIA_KEYS)},
+            })
+            link_mask = self.links['live'][:self.link_count] & mask[self.links['item_row'][:self.link_count]]
+            checklist = self.links['checklist'][:self.link_count][link_mask]
+            links = pa.table({
+                'item_id': columns['id'][self.links['item_row'][:self.link_count][link_mask]],
+                **{key: checklist[:, i] for i, key in enumerate(EVIDENCE_CRITERIA_KEYS)},
+            })
+            return items, links
+
+analytics_snapshot = AnalyticsSnapshot()
+on_dataset_change(analytics_snapshot.on_change, needs_items=lambda: analytics_snapshot.version is not None)
+
+
+# --- Search Index (in-process inverted index, BM25 ranking, facet filters) ---
+SEARCH_FIELD_WEIGHTS = { # Term frequencies are weighted by where the term occurs
+    'politifact_headline': 3.0, 'politifact_subheadline': 2.0, 'social_text': 1.0,
+    'link_description': 1.0, 'link_url': 0.5,
+}
+SEARCH_STOPWORDS = frozenset('a an and are as at be by for from has in is it its of on or that the this to was were will with'.split())
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+def search_tokens(text):
+    return [token for token in SEARCH_TOKEN_PATTERN.findall((text or '').lower()) if token not in SEARCH_STOPWORDS]
+
+
+def search_fields(item):
+    """(field, text) pairs of an item that go into the index."""
+    fields = [(field, item.get(field) or '') for field in ('politifact_headline', 'politifact_subheadline', 'social_text')]
+    for link in item.get('external_links_info') or []:
+        if isinstance(link, dict):
+            fields.append(('link_description', link.get('description') or ''))
+            fields.append(('link_url', link.get('url') or ''))
+    return fields
+
+
+class SearchIndex:
+    """Inverted index over headline, subheadline, social text and evidence links, ranked with BM25.
+
+    Maintained like AnalyticsSnapshot: the dataset change listener re-indexes only the written items,
+    and a full rebuild happens only when the dataset changed outside this module. Each item's facet
+    values (rating, platform, download_success, ooc_mask) are kept alongside for filtering and counts."""
+
+    K1, B = 1.2, 0.75 # BM25 parameters
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self._reset()
+
+    def _reset(self):
+        self.postings = {} # term -> {item id: weighted term frequency}
+        self.doc_terms = {} # item id -> terms (to unindex an item)
+        self.doc_length = {} # item id -> weighted token count
+        self.total_length = 0.0
+        self.facets = {} # item id -> (rating, platform, download_success, ooc_mask)
+
+    def _remove(self, item_id):
+        for term in self.doc_terms.pop(item_id, ()):
+            posting = self.postings.get(term)
+            if posting is None: continue
+            posting.pop(item_id, None)
+            if not posting: del self.postings[term]
+        self.total_length -= self.doc_length.pop(item_id, 0.0)
+        self.facets.pop(item_id, None)
+
+    def _add(self, item):
+        item_id = item['id']
+        self._remove(item_id)
+        frequencies, length = {}, 0.0
+        for field, text in search_fields(item):
+            weight = SEARCH_FIELD_WEIGHTS[field]
+            for token in search_tokens(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                length += weight
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[item_id] = frequency
+        self.doc_terms[item_id] = tuple(frequencies)
+        self.doc_length[item_id] = length
+        self.total_length += length
+        self.facets[item_id] = (item.get('rating') or '', item.get('social_platform') or '',
+                                bool(item.get('download_success')), item_ooc_mask(item))
+
+    def _rebuild(self):
+        self._reset()
+        version = get_storage().data_version() # Taken first: a write during the load then makes the next search rebuild again
+        for item in load_data():
+            if isinstance(item, dict) and isinstance(item.get('id'), int): self._add(item)
+        self.version = version
+        logging.info(f"Search index rebuilt ({len(self.doc_length)} items, {len(self.postings)} terms).")
+
+    def on_change(self, event, payload, version):
+        with self._lock:
+            if self.version is None: return # Not built yet; the first search builds it
+            if event not in ('items', 'deleted') or version is None or version != self.version + 1:
+                self.version = None; return # Whole-dataset save, or missed writes in between
+            if event == 'items':
+                for item in payload: self._add(item)
+            else:
+                for item_id in payload: self._remove(item_id)
+            self.version = version
+
+    def _matches_facets(self, item_id, rating, platform, download_success, ooc_bits):
+        item_rating, item_platform, item_downloaded, item_mask = self.facets[item_id]
+        return ((rating is None or item_rating == rating) and (platform is None or item_platform == platform)
+                and (download_success is None or item_downloaded == download_success)
+                and item_mask & ooc_bits == ooc_bits)
+
+    def search(self, query, filters, ooc_keys=(), offset=0, limit=SEARCH_PAGE_SIZE):
+        """Returns (ranked [(item id, score)] page, total matches, facet counts over all matches).
+        Every query term must match (AND); an empty query lists the facet-filtered items in id order."""
+        terms = list(dict.fromkeys(search_tokens(query)))
+        ooc_bits = flags_to_mask(dict.fromkeys(ooc_keys, True), OOC_CRITERIA_KEYS)
+        with self._lock:
+            if self.version is None or self.version != get_storage().data_version(): self._rebuild()
+            if terms:
+                postings = [self.postings.get(term, {}) for term in terms]
+                smallest = min(postings, key=len)
+                candidates = [item_id for item_id in smallest if all(item_id in posting for posting in postings)]
+            else:
+                candidates = sorted(self.doc_length)
+            matches = [item_id for item_id in candidates if self._matches_facets(item_id, ooc_bits=ooc_bits, **filters)]
+
+            if terms:
+                doc_count = len(self.doc_length)
+                average_length = self.total_length / doc_count if doc_count else 1.0
+                idf = [math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5)) for posting in postings]
+                def score(item_id):
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_length[item_id] / (average_length or 1.0))
+                    return sum(weight * posting[item_id] * (self.K1 + 1) / (posting[item_id] + norm)
+                               for weight, posting in zip(idf, postings))
+                ranked = heapq.nlargest(offset + limit, ((score(item_id), item_id) for item_id in matches))[offset:]
+                page = [(item_id, round(item_score, 4)) for item_score, item_id in ranked]
+            else:
+                page = [(item_id, 0.0) for item_id in matches[offset:offset + limit]]
+
+            facet_counts = {"rating": {}, "platform": {}, "download_success": {"true": 0, "false": 0},
+                            "ooc": dict.fromkeys(OOC_CRITERIA_KEYS, 0)}
+            for item_id in matches:
+                rating, platform, downloaded, mask = self.facets[item_id]
+                facet_counts["rating"][rating] = facet_counts["rating"].get(rating, 0) + 1
+                facet_counts["platform"][platform] = facet_counts["platform"].get(platform, 0) + 1
+                facet_counts["download_success"]["true" if downloaded else "false"] += 1
+                while mask:
+                    bit = mask.bit_length() - 1
+                    if bit < len(OOC_CRITERIA_KEYS): facet_counts["ooc"][OOC_CRITERIA_KEYS[bit]] += 1
+                    mask &= ~(1 << bit)
+            return page, len(matches), facet_counts
+
+search_index = SearchIndex()
+on_dataset_change(search_index.on_change, needs_items=lambda: search_index.version is not None)
+
+
+def search_snippet(item, query):
+    """A short excerpt of the first indexed field that contains a query term, or the headline."""
+    terms = set(search_tokens(query))
+    for _, text in search_fields(item):
+        for match in SEARCH_TOKEN_PATTERN.finditer(text):
+            if match.group().lower() in terms:
+                start = max(0, match.start() - SEARCH_SNIPPET_CHARS // 3)
+                excerpt = text[start:start + SEARCH_SNIPPET_CHARS].replace('\n', ' ').strip()
+                return ('...' if start else '') + excerpt + ('...' if start + SEARCH_SNIPPET_CHARS < len(text) else '')
+    return (item.get('politifact_headline') or '')[:SEARCH_SNIPPET_CHARS]
+
+
+# +++ START: Politifact Headline/Subheadline Fetching Helpers +++
+class DiskCache:
+    """Persistent key -> JSON-object cache: one small file per key, sharded by hash prefix."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get('key') == key else None # Guard against (unlikely) hash collisions
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        except OSError as e:
+            logging.warning(f"Could not read cache entry for {key}: {e}")
+            return None
+
+    def put(self, key, entry):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.cache-', dir=os.path.dirname(path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({**entry, 'key': key}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write cache entry for {key}: {e}")
+
+
+# One pooled keep-alive session for all outbound page fetches
+http_session = requests.Session()
+http_session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'})
+http_session.mount('http://', HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE))
+http_session.mount('https://', HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE))
+
+politifact_cache = DiskCache(os.path.join(HTTP_CACHE_DIR, 'politifact'))
+
+
+class HostRateLimiter:
+    """Spaces out requests so each host gets at most `rate` requests per second, across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {} # host -> monotonic time of its next free slot
+
+    def wait(self, url):
+        if not self.interval: return
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now: time.sleep(slot - now)
+
+
+def fetch_with_cache(url, parse, cache, ttl, rate_limiter=None):
+    """GETs url through http_session and returns parse(response), caching the parsed value on disk.
+    Within ttl the cached value is returned without any request; after that the page is revalidated
+    with If-None-Match/If-Modified-Since, and a 304 reuses the cached value. Failures raise.
+    rate_limiter (HostRateLimiter), if given, is only consulted when a request is actually made."""
+    cache_name = os.path.basename(cache.directory)
+    entry = cache.get(url)
+    now = time.time()
+    if entry and now - entry.get('fetched_at', 0) < ttl:
+        HTTP_CACHE_LOOKUPS.inc(cache=cache_name, result='hit')
+        return entry['value']
+
+    headers = {}
+    if entry and entry.get('etag'): headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'): headers['If-Modified-Since'] = entry['last_modified']
+    if rate_limiter: rate_limiter.wait(url)
+    with HTTP_FETCH_SECONDS.time(cache=cache_name) as labels:
+        response = http_session.get(url, timeout=15, headers=headers, allow_redirects=True)
+        labels['outcome'] = str(response.status_code)
+    if response.status_code == 304 and entry:
+        HTTP_CACHE_LOOKUPS.inc(cache=cache_name, result='revalidated')
+        cache.put(url, {**entry, 'fetched_at': now})
+        return entry['value']
+    response.raise_for_status() # Raises HTTPError for bad responses (4xx or 5xx)
+
+    HTTP_CACHE_LOOKUPS.inc(cache=cache_name, result='miss')
+    value = parse(response)
+    cache.put(url, {
+        'value': value, 'fetched_at': now,
+        'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'),
+    })
+    return value
+
+
+def parse_politifact_page(response):
+    """Extracts the headline (og:title, else first h1) and subheadline (og:description) from a page.
+    Only the <head> is parsed; the body is only parsed for h1 when there is no og:title."""
+    content = response.content
+    head_end = content.lower().find(b'</head>')
+    head = content[:head_end + len(b'</head>')] if head_end != -1 else content
+    soup = BeautifulSoup(head, HTML_PARSER, parse_only=SoupStrainer('meta'))
+
+    headline = None
+    # Prioritize og:title
+    meta_tag = soup.find('meta', property='og:title')
+    if meta_tag and meta_tag.get('content'):
+        headline = meta_tag['content'].strip()
+    else:
+        # Fallback to the main h1 tag (sometimes h1 contains nested elements, get_text handles this)
+        h1_tag = BeautifulSoup(content, HTML_PARSER, parse_only=SoupStrainer('h1')).find('h1')
+        if h1_tag: headline = h1_tag.get_text(strip=True)
+
+    # Look specifically for og:description
+    subheadline = None
+    meta_tag = soup.find('meta', property='og:description')
+    if meta_tag and meta_tag.get('content'):
+        subheadline = meta_tag['content'].strip()
+
+    return {"headline": headline, "subheadline": subheadline}
+
+
+def get_politifact_details(url, rate_limiter=None):
+    """Fetches headline and subheadline of a Politifact URL with one (cached) request.
+    Returns {"headline": str|None, "subheadline": str|None}, or None if the page could not be fetched."""
     if not url or not url.startswith(('http://', 'https://')):
-        logging.warning(f"Invalid or missing URL for subheadline fetch: {url}")
+        logging.warning(f"Invalid or missing URL for Politifact fetch: {url}")
         return None
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, timeout=15, headers=headers, allow_redirects=True)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Look specifically for og:description
-        meta_tag = soup.find('meta', property='og:description')
-        if meta_tag and meta_tag.get('content'):
-            logging.info(f"Found og:description: '{meta_tag['content'][:50]}...' for {url}")
-            return meta_tag['content'].strip()
-
-        logging.warning(f"Could not find og:description meta tag for URL: {url}")
-        return None
-
+        details = fetch_with_cache(url, parse_politifact_page, politifact_cache, POLITIFACT_CACHE_TTL_SECONDS, rate_limiter)
     except requests.exceptions.Timeout:
-        logging.error(f"Timeout error fetching subheadline for URL: {url}")
+        logging.error(f"Timeout error fetching Politifact page: {url}")
         return None
     except requests.exceptions.RequestException as e:
-        logging.error(f"Requests error fetching subheadline for URL {url}: {e}")
+        logging.error(f"Requests error fetching Politifact page {url}: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error getting subheadline for URL {url}: {e}", exc_info=True)
+        logging.error(f"Unexpected error getting Politifact details for URL {url}: {e}", exc_info=True)
         return None
-# +++ END: Politifact Headline/Subheadline Fetching Helpers +++
 
-# --- Helper Function: Get Video Metadata (Using --cookies-from-browser) ---
-def get_video_metadata_yt_dlp(video_url):
-    """Fetches video metadata using yt-dlp, attempting to use cookies from browser."""
-    command = [
-        sys.executable, '-m', 'yt_dlp',
-        '-j',
-        '-v',
-        '--no-warnings',
-        '--ignore-config',
-        # Add cookies-from-browser argument
-        '--cookies-from-browser', BROWSER_FOR_COOKIES
-    ]
-    # Add profile if needed (e.g., '--profile', 'Profile 1') - Often not needed for default profile
-    # command.extend(['--profile', 'Default']) # Example: If default profile isn't being picked up
+    if not details.get('headline'): logging.warning(f"Could not find og:title or h1 tag for URL: {url}")
+    if not details.get('subheadline'): logging.warning(f"Could not find og:description meta tag for URL: {url}")
+    return details
+
+
+def backfill_politifact_details(workers=None, rate=None, limit=None, progress_callback=None):
+    """Fills empty politifact_headline/politifact_subheadline fields for every item that has a
+    Politifact URL. Pages are fetched concurrently (each URL once, rate-limited per host) and all
+    results are written back in one batched save. progress_callback(done, total) is called per URL.
+    Returns a result dict."""
+    workers = workers or BACKFILL_WORKERS
+    limiter = HostRateLimiter(POLITIFACT_RATE_LIMIT_PER_SECOND if rate is None else rate)
+
+    items_by_url = {}
+    for item in load_data():
+        url = item.get('politifact_url') or ''
+        if url.startswith(('http://', 'https://')) and (not item.get('politifact_headline') or not item.get('politifact_subheadline')):
+            items_by_url.setdefault(url, []).append(item)
+    urls = list(items_by_url)[:limit] if limit else list(items_by_url)
+    if not urls:
+        return {"success": True, "message": "No items with missing Politifact details.", "urls": 0, "updated": 0, "failed": 0}
+
+    logging.info(f"Backfilling Politifact details for {len(urls)} URLs with {workers} workers.")
+    updates, failed = {}, 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backfill') as pool:
+        futures = {pool.submit(get_politifact_details, url, limiter): url for url in urls}
+        for done, future in enumerate(as_completed(futures), start=1):
+            url = futures[future]
+            details = future.result() # get_politifact_details() never raises
+            if details is None:
+                failed += 1
+            else:
+                for item in items_by_url[url]:
+                    fields = {}
+                    # Only fill what is empty; never overwrite an annotator's text
+                    if not item.get('politifact_headline') and details.get('headline'): fields['politifact_headline'] = details['headline']
+                    if not item.get('politifact_subheadline') and details.get('subheadline'): fields['politifact_subheadline'] = details['subheadline']
+                    if fields: updates[item['id']] = fields
+            if progress_callback: progress_callback(done, len(urls))
+
+    result = update_items(updates)
+    if not result["success"]:
+        return {**result, "urls": len(urls), "updated": 0, "failed": failed}
+    message = f"Backfilled {result['updated']} items from {len(urls)} URLs ({failed} failed)."
+    logging.info(message)
+    return {"success": True, "message": message, "urls": len(urls), "updated": result["updated"], "failed": failed}
+
 
-    command.append(video_url) # Add URL last
+def get_headline(url):
+    """Fetches the headline (og:title or h1) from a Politifact URL."""
+    details = get_politifact_details(url)
+    return details["headline"] if details else None
 
-    logging.info(f"Fetching metadata command (using browser cookies): {' '.join(shlex.quote(c) for c in command)}")
+def get_subheadline(url):
+    """Fetches the subheadline (og:description) from a Politifact URL."""
+    details = get_politifact_details(url)
+    return details["subheadline"] if details else None
+# +++ END: Politifact Headline/Subheadline Fetching Helpers +++
 
+# --- Evidence Link Checker (concurrent, rate-limited per host, cached by normalized URL) ---
+link_session = requests.Session()
+link_session.headers.update(http_session.headers)
+link_session.mount('http://', HTTPAdapter(pool_connections=LINK_CHECK_POOL_HOSTS, pool_maxsize=LINK_CHECK_WORKERS))
+link_session.mount('https://', HTTPAdapter(pool_connections=LINK_CHECK_POOL_HOSTS, pool_maxsize=LINK_CHECK_WORKERS))
+
+link_cache = DiskCache(os.path.join(HTTP_CACHE_DIR, 'links'))
+link_rate_limiter = HostRateLimiter(LINK_CHECK_RATE_LIMIT_PER_SECOND) # Shared, so per-item checks and bulk runs add up
+
+
+def link_domain(url):
+    host = (urlparse(url or '').hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def parse_link_metadata(content):
+    """Extracts <title> and og:title/og:description/og:site_name from the <head> of an HTML page."""
+    head_end = content.lower().find(b'</head>')
+    head = content[:head_end + len(b'</head>')] if head_end != -1 else content
+    soup = BeautifulSoup(head, HTML_PARSER, parse_only=SoupStrainer(['title', 'meta']))
+    def og(name):
+        tag = soup.find('meta', property=f'og:{name}')
+        return tag['content'].strip() if tag and tag.get('content') else None
+    title = soup.find('title')
+    return {"title": title.get_text(strip=True) if title else None,
+            "og_title": og('title'), "og_description": og('description'), "site_name": og('site_name')}
+
+
+def fetch_link_metadata(url):
+    """GETs url (following redirects) and returns its link record. Only HTML bodies are read, and at
+    most LINK_CHECK_MAX_BYTES of them. Request failures raise."""
+    started = time.monotonic()
+    with HTTP_FETCH_SECONDS.time(cache='links') as labels:
+        with link_session.get(url, timeout=LINK_CHECK_TIMEOUT_SECONDS, allow_redirects=True, stream=True) as response:
+            labels['outcome'] = str(response.status_code)
+            content_type = response.headers.get('Content-Type', '')
+            chunks, size = [], 0
+            if 'html' in content_type.lower():
+                for chunk in response.iter_content(64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= LINK_CHECK_MAX_BYTES: break
+    metadata = parse_link_metadata(b''.join(chunks)) if chunks else {"title": None, "og_title": None, "og_description": None, "site_name": None}
+    return {
+        "url": url, "final_url": response.url, "status": response.status_code, "ok": response.status_code < 400,
+        "domain": link_domain(response.url), "content_type": content_type.split(';')[0].strip() or None,
+        "redirects": len(response.history), **metadata,
+        "elapsed_ms": round((time.monotonic() - started) * 1000), "checked_at": time.time(), "error": None,
+    }
+
+
+def check_evidence_link(url, rate_limiter=None, refresh=False):
+    """Returns the link record of an evidence URL, from link_cache if it is fresh (records of broken
+    links expire sooner), else fetched and cached. Never raises: unreachable links get status None and
+    an 'error'. The returned record has 'cached' set when no request was made."""
+    url = (url or '').strip()
+    if not url.startswith(('http://', 'https://')):
+        return {"url": url, "final_url": None, "status": None, "ok": False, "domain": link_domain(url),
+                "error": "Invalid URL (must start with http:// or https://).", "cached": False}
+    key = normalize_social_link(url)
+    entry = None if refresh else link_cache.get(key)
+    if entry:
+        ttl = LINK_CHECK_CACHE_TTL_SECONDS if entry['value']['ok'] else LINK_CHECK_RETRY_SECONDS
+        if time.time() - entry.get('fetched_at', 0) < ttl:
+            HTTP_CACHE_LOOKUPS.inc(cache='links', result='hit')
+            return {**entry['value'], "cached": True}
+
+    HTTP_CACHE_LOOKUPS.inc(cache='links', result='miss')
+    (rate_limiter or link_rate_limiter).wait(url)
     try:
-        process = subprocess.run(
-            command, capture_output=True, text=True, check=False, encoding='utf-8', errors='replace'
-        )
-
-        if process.returncode != 0:
-            error_suffix = ""
-            # Add specific suffix if authentication error occurs with browser attempt
-            if "authentication" in process.stderr.lower():
-                error_suffix = f" (Tried using cookies from {BROWSER_FOR_COOKIES}. Ensure you're logged in there and yt-dlp has access. Check yt-dlp docs for browser/OS specifics.)"
+        record = fetch_link_metadata(url)
+    except requests.exceptions.RequestException as e:
+        logging.info(f"Evidence link unreachable: {url} ({e.__class__.__name__})")
+        record = {"url": url, "final_url": None, "status": None, "ok": False, "domain": link_domain(url),
+                  "checked_at": time.time(), "error": f"{e.__class__.__name__}: {e}"}
+    except Exception as e:
+        logging.error(f"Unexpected error checking evidence link {url}: {e}", exc_info=True)
+        return {"url": url, "final_url": None, "status": None, "ok": False, "domain": link_domain(url),
+                "error": f"Unexpected error: {e}", "cached": False}
+    link_cache.put(key, {'value': record, 'fetched_at': record['checked_at']})
+    return {**record, "cached": False}
+
+
+def interleave_by_host(urls):
+    """Orders urls round-robin across hosts, so rate-limited hosts do not hold all workers at once."""
+    by_host = {}
+    for url in urls: by_host.setdefault(link_domain(url), []).append(url)
+    return [url for group in itertools.zip_longest(*by_host.values()) for url in group if url is not None]
+
+
+def check_item_links(item_id, refresh=False):
+    """Checks all evidence links of one item concurrently. Returns a result dict with the link
+    records in the order of external_links_info."""
+    item = get_item(item_id)
+    if item is None: return {"success": False, "message": f"Item {item_id} not found.", "not_found": True}
+    urls = [link.get('url') or '' for link in item.get('external_links_info', [])]
+    if not urls: return {"success": True, "id": item_id, "links": []}
+    with ThreadPoolExecutor(max_workers=min(len(urls), LINK_CHECK_WORKERS), thread_name_prefix='linkcheck') as pool:
+        links = list(pool.map(lambda url: check_evidence_link(url, refresh=refresh), urls))
+    return {"success": True, "id": item_id, "links": links}
+
+
+def check_evidence_links(workers=None, rate=None, limit=None, refresh=False, progress_callback=None):
+    """Checks every distinct evidence link in the dataset (each normalized URL once) with a pool of
+    workers, rate-limited per host. Records go to link_cache; the result counts working, broken (HTTP
+    error status) and unreachable links and lists the broken/unreachable ones with their item ids.
+    progress_callback(done, total) is called per URL. Returns a result dict."""
+    workers = workers or LINK_CHECK_WORKERS
+    limiter = link_rate_limiter if rate is None else HostRateLimiter(rate)
+
+    items_by_key, url_by_key = {}, {}
+    for item in load_data():
+        for link in item.get('external_links_info', []):
+            url = (link.get('url') or '').strip()
+            if not url: continue
+            key = normalize_social_link(url)
+            url_by_key.setdefault(key, url)
+            ids = items_by_key.setdefault(key, [])
+            if item['id'] not in ids: ids.append(item['id'])
+    keys = list(url_by_key)[:limit] if limit else list(url_by_key)
+    if not keys:
+        return {"success": True, "message": "No evidence links to check.", "urls": 0, "ok": 0, "broken": 0, "unreachable": 0, "cached": 0, "links": []}
+
+    logging.info(f"Checking {len(keys)} evidence links with {workers} workers.")
+    counts = {"ok": 0, "broken": 0, "unreachable": 0, "cached": 0}
+    failures = []
+    urls = interleave_by_host(url_by_key[key] for key in keys)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='linkcheck') as pool:
+        futures = {pool.submit(check_evidence_link, url, limiter, refresh): url for url in urls}
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = future.result() # check_evidence_link() never raises
+            if record["cached"]: counts["cached"] += 1
+            if record["ok"]: counts["ok"] += 1
+            else:
+                counts["broken" if record["status"] else "unreachable"] += 1
+                if len(failures) < LINK_CHECK_MAX_REPORTED:
+                    failures.append({"url": record["url"], "status": record["status"], "error": record.get("error"),
+                                     "final_url": record.get("final_url"), "items": items_by_key[normalize_social_link(record["url"])]})
+            if progress_callback: progress_callback(done, len(urls))
+
+    message = (f"Checked {len(urls)} evidence links: {counts['ok']} working, {counts['broken']} broken, "
+               f"{counts['unreachable']} unreachable ({counts['cached']} from cache).")
+    logging.info(message)
+    return {"success": True, "message": message, "urls": len(urls), **counts, "links": failures}
+
+
+# --- yt-dlp Engine (in-process, warm YoutubeDL instances, cached browser cookies) ---
+class YtDlpLogger:
+    """Routes yt-dlp's output into our log instead of stdout/stderr."""
+    def debug(self, msg):
+        if not msg.startswith('[debug] '): logging.debug(f"yt-dlp: {msg}")
+    def info(self, msg): logging.debug(f"yt-dlp: {msg}")
+    def warning(self, msg): logging.warning(f"yt-dlp: {msg}")
+    def error(self, msg): logging.error(f"yt-dlp: {msg}")
+
+
+class VideoRejected(Exception):
+    """A video failed the admission policy; nothing was downloaded."""
+
+
+class AdmissionPolicy:
+    """Server-side limits on what gets downloaded, all checked before any media bytes are fetched:
+    platform (from the URL, before extraction), duration and known filesize (from the info_dict), and
+    resolution/filesize caps built into the format selection. Over-long videos are either rejected or,
+    with clip_long_videos, downloaded only up to max_duration."""
+
+    def __init__(self, max_duration=None, max_filesize=None, max_height=None, allowed_platforms=None, clip_long_videos=False):
+        self.max_duration = max_duration
+        self.max_filesize = max_filesize
+        self.max_height = max_height
+        self.allowed_platforms = set(allowed_platforms) if allowed_platforms is not None else None
+        self.clip_long_videos = clip_long_videos
+
+    def check_url(self, url):
+        """Raises VideoRejected if the URL's platform is not allowed."""
+        if self.allowed_platforms is None: return
+        platform = parse_social_platform(url)
+        if platform not in self.allowed_platforms:
+            raise VideoRejected(f"Platform '{platform or 'unknown'}' is not allowed (allowed: {', '.join(sorted(self.allowed_platforms))}). Download aborted.")
+
+    def filesize_problem(self, info):
+        """Returns a rejection message if the (selected format's) known size exceeds max_filesize, else None."""
+        size = info.get('filesize') or info.get('filesize_approx')
+        if self.max_filesize and size and size > self.max_filesize and info.get('section_end') is None:
+            return f"Video size ({size / 1024 / 1024:.1f} MB) exceeds limit ({self.max_filesize / 1024 / 1024:.0f} MB). Download aborted."
+        return None
 
-            error_message = f"yt-dlp metadata fetch failed (Code: {process.returncode}). Error: {process.stderr or 'Unknown yt-dlp error'}{error_suffix}"
-            logging.error(error_message)
-            return {"success": False, "message": error_message}
+    def check_info(self, info):
+        """Checks an info_dict. Returns the number of seconds to download if the video is to be clipped,
+        else None. Raises VideoRejected."""
+        duration = info.get('duration')
+        if self.max_duration and duration and duration > self.max_duration:
+            if self.clip_long_videos and FFMPEG_BINARY: return self.max_duration
+            raise VideoRejected(f"Video duration ({duration:.1f}s) exceeds limit ({self.max_duration}s). Download aborted.")
+        problem = self.filesize_problem(info)
+        if problem: raise VideoRejected(problem)
+        return None
 
-        # Process JSON output (same as before)
+    def format_selector(self, selector):
+        """Adds the height and filesize caps to every part of a yt-dlp format selector
+        ('bestvideo+bestaudio/best' -> 'bestvideo[height<=?1080][filesize<?...]+bestaudio[filesize<?...]/...').
+        '<?' lets formats with unknown height/size through; those are caught by check_info() and the
+        max_filesize download option."""
+        size_cap = f"[filesize<?{self.max_filesize}]" if self.max_filesize else ''
+        height_cap = f"[height<=?{self.max_height}]" if self.max_height else ''
+        def cap(part):
+            is_audio = part.startswith(('bestaudio', 'worstaudio', 'ba', 'wa'))
+            return part + ('' if is_audio else height_cap) + size_cap
+        return '/'.join('+'.join(cap(part) for part in alternative.split('+')) for alternative in selector.split('/'))
+
+    def describe_caps(self):
+        caps = [f"<= {self.max_height}p" if self.max_height else None,
+                f"<= {self.max_filesize / 1024 / 1024:.0f} MB" if self.max_filesize else None]
+        return ', '.join(cap for cap in caps if cap) or 'no caps'
+
+
+class PolicyLogger(YtDlpLogger):
+    """YtDlpLogger that records yt-dlp's max_filesize abort, which is only reported as a message,
+    as a rejection in the engine's per-thread state (see YtDlpEngine._process())."""
+
+    def __init__(self, local, policy):
+        self.local = local
+        self.policy = policy
+
+    def debug(self, msg):
+        if 'larger than max-filesize' in msg:
+            self.local.rejection = f"Video size exceeds limit ({self.policy.max_filesize / 1024 / 1024:.0f} MB). Download aborted."
+        super().debug(msg)
+
+
+if YoutubeDL is not None:
+    class SharedCookiesYoutubeDL(YoutubeDL):
+        """YoutubeDL that uses a cookie jar shared by all instances instead of loading its own."""
+
+        def __init__(self, params, cookie_jar):
+            self._shared_cookie_jar = cookie_jar
+            super().__init__(params)
+
+        # YoutubeDL reads cookies lazily through this property; hand it the shared jar
+        @functools.cached_property
+        def cookiejar(self):
+            return self._shared_cookie_jar
+
+
+def format_unavailable(error):
+    return 'requested format is not available' in str(error).lower()
+
+
+class YtDlpEngine:
+    """Runs yt-dlp in-process instead of spawning 'python -m yt_dlp' per call.
+
+    - Each thread keeps a warm YoutubeDL instance (YoutubeDL is not thread-safe, but is reusable).
+    - Browser cookies are decrypted once and shared by all instances until COOKIE_JAR_TTL_SECONDS pass.
+    - extract_info() results are cached per URL for INFO_CACHE_TTL_SECONDS, so the client's
+      metadata -> download sequence costs a single extraction: download() reuses the cached info_dict.
+    - The AdmissionPolicy is enforced here, so no caller can download a video it does not admit:
+      extract_info() rejects disallowed platforms before extracting, download() rejects (or clips)
+      over-long and oversized videos before fetching any media, and format selection is capped.
+    """
+
+    def __init__(self, base_options, policy=None):
+        self.base_options = base_options
+        self.policy = policy or AdmissionPolicy()
+        self._local = threading.local()
+        self._cookie_lock = threading.Lock()
+        self._cookie_jar = None
+        self._cookie_jar_loaded_at = 0.0
+        self._cookie_generation = 0
+        self._info_lock = threading.Lock()
+        self._info_cache = OrderedDict() # url -> (fetched_at, info_dict), oldest first
+
+    DEFAULT_OUTTMPL = '%(id)s.%(ext)s' # Between downloads; each download() sets its own output template
+
+    def _cookies(self):
+        """Returns (generation, cookie jar), re-reading the browser's cookie database once the TTL expires."""
+        with self._cookie_lock:
+            if self._cookie_jar is None or time.time() - self._cookie_jar_loaded_at > COOKIE_JAR_TTL_SECONDS:
+                try:
+                    self._cookie_jar = yt_dlp_cookies.extract_cookies_from_browser(BROWSER_FOR_COOKIES, logger=YtDlpLogger())
+                    logging.info(f"Loaded {len(self._cookie_jar)} cookies from {BROWSER_FOR_COOKIES}.")
+                except Exception as e:
+                    # Public videos still work without cookies; keep going with an empty jar
+                    logging.warning(f"Could not load cookies from {BROWSER_FOR_COOKIES}: {e}. Continuing without browser cookies.")
+                    self._cookie_jar = yt_dlp_cookies.YoutubeDLCookieJar()
+                self._cookie_jar_loaded_at = time.time()
+                self._cookie_generation += 1
+            return self._cookie_generation, self._cookie_jar
+
+    def _ydl(self):
+        """Returns this thread's YoutubeDL, rebuilding it when the shared cookie jar was refreshed."""
+        generation, jar = self._cookies()
+        if getattr(self._local, 'generation', None) != generation:
+            ydl = SharedCookiesYoutubeDL({
+                **self.base_options, 'outtmpl': {'default': self.DEFAULT_OUTTMPL}, 'logger': PolicyLogger(self._local, self.policy),
+                'format': self.policy.format_selector(self.base_options.get('format', 'bestvideo+bestaudio/best')),
+                'max_filesize': self.policy.max_filesize, # Backstop for sizes only announced by the server
+                'match_filter': self._match_filter,
+            }, jar)
+            ydl.add_progress_hook(self._on_progress)
+            self._local.ydl = ydl
+            self._local.generation = generation
+        return self._local.ydl
+
+    def _on_progress(self, status):
+        callback = getattr(self._local, 'progress_callback', None)
+        if callback is None or status.get('status') != 'downloading': return
+        downloaded = status.get('downloaded_bytes')
+        total = status.get('total_bytes') or status.get('total_bytes_estimate')
+        percent = round(100.0 * downloaded / total, 1) if downloaded is not None and total else None
+        try: callback({"downloaded_bytes": downloaded, "total_bytes": total, "percent": percent, "eta": status.get('eta')})
+        except Exception as e: logging.warning(f"Progress callback failed: {e}")
+
+    def _match_filter(self, info, incomplete=False):
+        """yt-dlp match_filter: called with the selected format's fields right before a download starts."""
+        if incomplete: return None
+        problem = self.policy.filesize_problem(info)
+        if problem: self._local.rejection = problem # Skipped by yt-dlp; download() turns it into VideoRejected
+        return problem
+
+    def _process(self, ydl, call):
+        """Runs a YoutubeDL call, turning policy skips and 'no format within the caps' into VideoRejected."""
+        self._local.rejection = None
         try:
-            first_line = process.stdout.strip().splitlines()[0]
-            metadata = json.loads(first_line)
-        except (json.JSONDecodeError, IndexError) as e:
-            error_message = f"Failed to parse yt-dlp JSON output: {e}. Output: {process.stdout[:500]}"
-            logging.error(error_message)
-            return {"success": False, "message": error_message}
-
-        # Extract data (same as before)
-        duration = metadata.get('duration')
-        title = metadata.get('title')
-        description = metadata.get('description')
-        social_text_parts = []
-        if title: social_text_parts.append(f"Title: {title}")
-        if description:
-            desc_limit = 1000
-            truncated_desc = description[:desc_limit] + ("..." if len(description) > desc_limit else "")
-            social_text_parts.append(f"Description: {truncated_desc}")
-        social_text = "\n\n".join(social_text_parts) if social_text_parts else "No title or description found."
-        if duration is None: duration = 0.0
-
-        return {
-            "success": True, "duration": float(duration), "social_text": social_text.strip(),
-            "message": "Metadata fetched successfully."
-        }
+            result = call()
+        except Exception as e: # A DownloadError from extract_info(), a bare ExtractorError from process_ie_result()
+            if format_unavailable(e): raise VideoRejected(f"No format within the limits ({self.policy.describe_caps()}). Download aborted.") from e
+            raise
+        if self._local.rejection: raise VideoRejected(self._local.rejection)
+        return result
+
+    def extract_info(self, url):
+        """Returns the info_dict for url, from the per-URL cache if it is fresh enough.
+        Raises VideoRejected for platforms the policy does not allow."""
+        self.policy.check_url(url)
+        now = time.time()
+        with self._info_lock:
+            cached = self._info_cache.get(url)
+            if cached and now - cached[0] <= INFO_CACHE_TTL_SECONDS:
+                self._info_cache.move_to_end(url)
+                return cached[1]
+        ydl = self._ydl()
+        with YTDLP_SECONDS.time(operation='extract', platform=metrics_platform(url)):
+            info = ydl.sanitize_info(self._process(ydl, lambda: ydl.extract_info(url, download=False)), remove_private_keys=True)
+        with self._info_lock:
+            self._info_cache[url] = (now, info)
+            self._info_cache.move_to_end(url)
+            while len(self._info_cache) > INFO_CACHE_MAX_ENTRIES: self._info_cache.popitem(last=False)
+        return info
+
+    def download(self, url, output_template, progress_callback=None):
+        """Downloads url to output_template (a yt-dlp template), reusing a cached extraction if present.
+        Returns the final file path. Raises VideoRejected if the policy does not admit the video
+        (before anything is fetched), yt_dlp DownloadError on other failures."""
+        info = copy.deepcopy(self.extract_info(url))
+        clip_seconds = self.policy.check_info(info)
+        ydl = self._ydl()
+        # Per-call settings on the warm instance; the finally below resets them so no later call inherits them
+        ydl.params['outtmpl']['default'] = output_template
+        if clip_seconds: ydl.params['download_ranges'] = lambda info_dict, ydl: [{'start_time': 0, 'end_time': clip_seconds}]
+        self._local.progress_callback = progress_callback
+        platform = metrics_platform(url)
+        try:
+            with YTDLP_SECONDS.time(operation='download', platform=platform):
+                result = self._process(ydl, lambda: ydl.process_ie_result(info, download=True))
+        finally:
+            self._local.progress_callback = None
+            ydl.params['outtmpl']['default'] = self.DEFAULT_OUTTMPL
+            ydl.params.pop('download_ranges', None)
+        with self._info_lock:
+            self._info_cache.pop(url, None) # Format URLs are single-use in practice; re-extract next time
+        downloads = result.get('requested_downloads') or []
+        filepath = downloads[0].get('filepath') if downloads else None
+        if filepath and os.path.isfile(filepath): YTDLP_DOWNLOADED_BYTES.inc(os.path.getsize(filepath), platform=platform)
+        return filepath
+
+
+YT_DLP_OPTIONS = {
+    'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/bestvideo+bestaudio/best',
+    'merge_output_format': 'mp4',
+    'force_keyframes_at_cuts': True,
+    'quiet': True,
+    'no_warnings': True,
+    'noprogress': True,
+    'logger': YtDlpLogger(),
+}
+admission_policy = AdmissionPolicy(MAX_VIDEO_DURATION_SECONDS, MAX_VIDEO_FILESIZE_BYTES, MAX_VIDEO_HEIGHT,
+                                   ALLOWED_VIDEO_PLATFORMS, CLIP_LONG_VIDEOS)
+yt_dlp_engine = YtDlpEngine(YT_DLP_OPTIONS, admission_policy) if YoutubeDL is not None else None
+
+
+def yt_dlp_error_message(prefix, error):
+    """Formats a yt-dlp failure, adding the cookie hint for authentication errors."""
+    error_suffix = ""
+    if "authentication" in str(error).lower() or "login" in str(error).lower():
+        error_suffix = f" (Tried using cookies from {BROWSER_FOR_COOKIES}. Ensure you're logged in there and yt-dlp has access. Check yt-dlp docs for browser/OS specifics.)"
+    return f"{prefix}. Error: {error or 'Unknown yt-dlp error'}{error_suffix}"
+
+
+# --- Media Store (content-addressed, deduplicated video files) ---
+TRACKING_QUERY_PARAMS = {'si', 'feature', 'fbclid', 'gclid', 'igshid', 'igsh', 'ref', 'ref_src', 'ref_url'}
+
+def normalize_social_link(url):
+    """Canonical form of a social link for dedup: lowercase host without 'www.', no fragment, no tracking
+    parameters, remaining query parameters sorted, no trailing slash."""
+    try: parsed = urlparse((url or '').strip())
+    except ValueError: return (url or '').strip()
+    host = (parsed.hostname or '').lower()
+    if host.startswith('www.'): host = host[4:]
+    if parsed.port: host = f"{host}:{parsed.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                   if key.lower() not in TRACKING_QUERY_PARAMS and not key.lower().startswith('utm_'))
+    return urlunparse(((parsed.scheme or 'https').lower(), host, parsed.path.rstrip('/'), '', urlencode(query), ''))
+
+
+def media_key_for(info=None, url=None):
+    """Stable media key: '<extractor>-<video id>' from a yt-dlp info_dict, else a hash of the normalized URL.
+    The generic extractor's IDs are just file names (every site's 'video.mp4'), so those use the URL hash too."""
+    if info and info.get('id') and info.get('extractor_key') not in (None, 'Generic'):
+        key = f"{info['extractor_key'].lower()}-{info['id']}" # Video IDs are case-sensitive (YouTube), so keep their case
+        return re.sub(r'[^A-Za-z0-9_-]', '_', key)[:120]
+    return 'url-' + hashlib.sha256(normalize_social_link(url).encode('utf-8')).hexdigest()[:32]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''): digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaStore:
+    """Video files stored once per media key under sharded directories (MEDIA_DIR/ab/<key>.<ext>).
+
+    manifest.json maps keys to {path, size, sha256, source_url} and normalized social links to keys,
+    so "do we already have this video?" is a dict lookup plus one stat(), not a directory scan.
+    Paths in the manifest are relative to the store root, so the store can be moved or shared."""
+
+    def __init__(self, root, manifest_path):
+        self.root = root
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(manifest_path + '.lock') # Serializes manifest writes across worker processes
+        self._key_locks = {} # key -> FileLock
+        self._manifest = None # {"media": {key: entry}, "urls": {normalized url: key}}
+        self._signature = None
+
+    def _manifest_signature(self):
+        try:
+            st = os.stat(self.manifest_path)
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        # Re-read when another process has replaced the manifest since we last read or wrote it
+        signature = self._manifest_signature()
+        if self._manifest is None or signature != self._signature:
+            self._signature = signature
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f: self._manifest = json.load(f)
+            except FileNotFoundError:
+                self._manifest = {}
+            except (OSError, ValueError) as e:
+                logging.error(f"Could not read media manifest '{self.manifest_path}': {e}. Starting with an empty index.")
+                self._manifest = {}
+            self._manifest.setdefault('media', {})
+            self._manifest.setdefault('urls', {})
+        return self._manifest
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', suffix='.json.tmp', dir=self.root)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
+        self._signature = self._manifest_signature()
+
+    def key_lock(self, key):
+        """Lock held while a key is being downloaded, so concurrent requests for one video download it once,
+        also when they reach different worker processes (a FileLock on <root>/.locks/<key>.lock)."""
+        with self._lock:
+            if key not in self._key_locks: self._key_locks[key] = FileLock(os.path.join(self.root, '.locks', f'{key}.lock'))
+            return self._key_locks[key]
+
+    def shard_dir(self, key):
+        return os.path.join(self.root, hashlib.sha256(key.encode('utf-8')).hexdigest()[:2])
+
+    def output_template(self, key):
+        return os.path.join(self.shard_dir(key), f"{key}.%(ext)s")
+
+    def derived_path(self, key, kind):
+        """Path of a derivative ('poster' or 'preview') next to the original; it exists once generated."""
+        return os.path.join(self.shard_dir(key), f"{key}{MEDIA_DERIVATIVES[kind][0]}")
+
+    def keys(self):
+        with self._lock: return list(self._load()['media'])
+
+    def absolute_path(self, entry):
+        return os.path.abspath(os.path.join(self.root, entry['path']))
+
+    def lookup(self, key):
+        """Returns the manifest entry for key if its file is still present and complete, else None."""
+        with self._lock:
+            entry = self._load()['media'].get(key)
+        if entry is None: return None
+        try:
+            if os.path.getsize(self.absolute_path(entry)) == entry['size']: return entry
+        except OSError:
+            pass
+        logging.warning(f"Media '{key}' is missing or changed on disk; dropping it from the index.")
+        with self._file_lock, self._lock:
+            self._load()['media'].pop(key, None)
+            self._save()
+        return None
 
-    except FileNotFoundError:
-        msg = f"Error: '{sys.executable} -m yt_dlp' command failed. Is yt-dlp installed?"
+    def key_for_url(self, url):
+        with self._lock: return self._load()['urls'].get(normalize_social_link(url))
+
+    def add(self, key, path, source_url=None):
+        """Records a file that already sits in the store (or is moved/linked into it). Returns the entry."""
+        ext = os.path.splitext(path)[1]
+        target = os.path.join(self.shard_dir(key), f"{key}{ext}")
+        if os.path.abspath(path) != os.path.abspath(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try: os.link(path, target) # Files imported from the split folders are hard-linked, not copied
+            except FileExistsError: pass
+            except OSError: shutil.copy2(path, target)
+        entry = {"path": os.path.relpath(target, self.root), "size": os.path.getsize(target),
+                 "sha256": file_sha256(target), "source_url": source_url or "", "added_at": time.time()}
+        with self._file_lock, self._lock:
+            manifest = self._load()
+            manifest['media'][key] = entry
+            if source_url: manifest['urls'][normalize_social_link(source_url)] = key
+            self._save()
+        return entry
+
+    def alias(self, url, key):
+        """Remembers that url resolves to key, so the next lookup skips the extractor entirely."""
+        normalized = normalize_social_link(url)
+        with self._file_lock, self._lock:
+            manifest = self._load()
+            if manifest['urls'].get(normalized) == key: return
+            manifest['urls'][normalized] = key
+            self._save()
+
+    def remove_partial(self, key):
+        """Removes leftovers (.part, per-format files) of a failed download; only the key's shard is scanned."""
+        try: filenames = os.listdir(self.shard_dir(key))
+        except FileNotFoundError: return
+        for filename in filenames:
+            if filename.startswith(f"{key}."):
+                file_to_remove = os.path.join(self.shard_dir(key), filename)
+                try:
+                    os.remove(file_to_remove)
+                    logging.info(f"Removed potentially incomplete/failed file: {file_to_remove}")
+                except OSError as e_rem:
+                    logging.warning(f"Could not remove generated file {file_to_remove}: {e_rem}")
+
+media_store = MediaStore(MEDIA_DIR, MEDIA_MANIFEST_FILE)
+MEDIA_KEY_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,120}')
+
+
+# --- Media Derivatives (poster frames and low-bitrate preview proxies, via a pool of ffmpeg processes) ---
+FFMPEG_BINARY = shutil.which('ffmpeg') # Optional; without it no posters/previews are made and the original is served
+MEDIA_DERIVATIVES = { # kind -> (file suffix, ffmpeg output arguments)
+    'poster': ('.poster.jpg', ['-vf', 'thumbnail,scale=480:-2', '-frames:v', '1', '-q:v', '4']),
+    'preview': ('.preview.mp4', ['-vf', 'scale=-2:360', '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '30',
+                                 '-maxrate', '600k', '-bufsize', '1200k', '-c:a', 'aac', '-b:a', '64k',
+                                 '-movflags', '+faststart']), # moov atom first, so the browser can seek right away
+}
+media_derive_pool = ThreadPoolExecutor(max_workers=MEDIA_DERIVE_WORKERS, thread_name_prefix='ffmpeg')
+media_derive_pending = set()
+media_derive_lock = threading.Lock()
+
+
+def generate_media_derivatives(key, force=False):
+    """Creates the missing poster/preview files for one stored video with ffmpeg. Returns a result dict."""
+    if FFMPEG_BINARY is None:
+        return {"success": False, "message": "ffmpeg is not installed; posters and previews are not generated."}
+    entry = media_store.lookup(key)
+    if entry is None: return {"success": False, "message": f"Media '{key}' not found."}
+
+    source = media_store.absolute_path(entry)
+    created = []
+    for kind, (_, output_args) in MEDIA_DERIVATIVES.items():
+        target = media_store.derived_path(key, kind)
+        if os.path.exists(target) and not force: continue
+        base, ext = os.path.splitext(target)
+        tmp_path = f"{base}.tmp{ext}" # ffmpeg picks the container from the extension
+        command = [FFMPEG_BINARY, '-nostdin', '-y', '-v', 'error', '-i', source, *output_args, tmp_path]
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=MEDIA_DERIVE_TIMEOUT_SECONDS)
+            error = completed.stderr.strip() if completed.returncode != 0 else None
+            outcome = f"exit_{completed.returncode}" if completed.returncode else 'ok'
+        except (OSError, subprocess.TimeoutExpired) as e:
+            error, outcome = str(e), 'timeout' if isinstance(e, subprocess.TimeoutExpired) else 'error'
+        FFMPEG_SECONDS.observe(time.perf_counter() - started, kind=kind, outcome=outcome)
+        if error is not None:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            logging.error(f"ffmpeg {kind} for '{key}' failed: {error}")
+            return {"success": False, "message": f"Could not create {kind}: {error}", "created": created}
+        os.replace(tmp_path, target)
+        created.append(kind)
+    if created: logging.info(f"Created {', '.join(created)} for '{key}'.")
+    return {"success": True, "message": f"Created: {', '.join(created) or 'nothing (up to date)'}.", "created": created}
+
+
+def schedule_media_derivatives(key):
+    """Queues poster/preview generation for key in the background (once, even if asked repeatedly)."""
+    if FFMPEG_BINARY is None: return None
+    with media_derive_lock:
+        if key in media_derive_pending: return None
+        media_derive_pending.add(key)
+
+    def run():
+        try: return generate_media_derivatives(key)
+        finally:
+            with media_derive_lock: media_derive_pending.discard(key)
+    return media_derive_pool.submit(run)
+
+
+# --- Helper Function: Get Video Metadata (Using browser cookies) ---
+def get_video_metadata_yt_dlp(video_url):
+    """Fetches video metadata using the in-process yt-dlp engine, with cookies from the browser.
+    Videos the admission policy would not download come back with success False and "rejected" True
+    (with duration and social_text when the metadata itself could be fetched)."""
+    if yt_dlp_engine is None:
+        msg = "Error: yt-dlp is not installed (pip install yt-dlp)."
         logging.critical(msg); return {"success": False, "message": msg}
+
+    logging.info(f"Fetching metadata for: {video_url}")
+    try:
+        metadata = yt_dlp_engine.extract_info(video_url)
+    except VideoRejected as e:
+        logging.info(f"Video rejected: {e} URL: {video_url}")
+        return {"success": False, "rejected": True, "message": str(e)}
+    except YtDlpDownloadError as e:
+        error_message = yt_dlp_error_message("yt-dlp metadata fetch failed", e)
+        logging.error(error_message)
+        return {"success": False, "message": error_message}
     except Exception as e:
         msg = f"An unexpected error occurred during metadata fetch: {e}"
         logging.exception(msg); return {"success": False, "message": msg}
 
+    # Extract data (same as before)
+    duration = metadata.get('duration')
+    title = metadata.get('title')
+    description = metadata.get('description')
+    social_text_parts = []
+    if title: social_text_parts.append(f"Title: {title}")
+    if description:
+        desc_limit = 1000
+        truncated_desc = description[:desc_limit] + ("..." if len(description) > desc_limit else "")
+        social_text_parts.append(f"Description: {truncated_desc}")
+    social_text = "\n\n".join(social_text_parts) if social_text_parts else "No title or description found."
+    if duration is None: duration = 0.0
+
+    result = {
+        "success": True, "duration": float(duration), "social_text": social_text.strip(),
+        "message": "Metadata fetched successfully."
+    }
+    try: clip_seconds = admission_policy.check_info(metadata)
+    except VideoRejected as e:
+        logging.info(f"Video rejected: {e} URL: {video_url}")
+        return {**result, "success": False, "rejected": True, "message": str(e)}
+    if clip_seconds:
+        result["clip_seconds"] = clip_seconds
+        result["message"] = f"Metadata fetched successfully. Only the first {clip_seconds}s will be downloaded."
+    return result
+
+
+# --- Helper Function: Download Video (Using browser cookies) ---
+def stored_media_result(key, entry, message):
+    return {"success": True, "message": message, "drive_path": media_store.absolute_path(entry), "media_key": key}
+
+
+def download_video_yt_dlp(video_url, item_id, progress_callback=None):
+    """Downloads video using the in-process yt-dlp engine, with cookies from the browser, into the media store.
+    Videos already in the store (same normalized link, or same extractor video ID) are not downloaded again.
+    Reuses the info_dict from a preceding get_video_metadata_yt_dlp() call for the same URL. Videos the
+    admission policy does not admit are not fetched (result has "rejected" True).
+    progress_callback, if given, receives dicts with downloaded_bytes/total_bytes/percent/eta."""
+    # Known link: no extraction, no download
+    key = media_store.key_for_url(video_url)
+    entry = media_store.lookup(key) if key else None
+    if entry:
+        logging.info(f"Video for ID {item_id} already stored as '{key}'.")
+        return stored_media_result(key, entry, f"Already downloaded ({os.path.basename(entry['path'])}).")
+
+    if yt_dlp_engine is None:
+        msg = "Error: yt-dlp is not installed (pip install yt-dlp)."
+        logging.critical(msg); return {"success": False, "message": msg, "drive_path": "", "media_key": ""}
 
-# --- Helper Function: Download Video (Using --cookies-from-browser) ---
-def download_video_yt_dlp(video_url, item_id):
-    """Downloads video using yt-dlp, attempting to use cookies from browser."""
-    if not os.path.exists(DOWNLOAD_DIR):
-        try: os.makedirs(DOWNLOAD_DIR); logging.info(f"Created download directory: {DOWNLOAD_DIR}")
-        except OSError as e: logging.error(f"Could not create '{DOWNLOAD_DIR}': {e}"); return {"success": False, "message": f"Error creating download directory: {e}", "drive_path": ""}
-
-    output_template = os.path.join(DOWNLOAD_DIR, f"video_{item_id}.%(ext)s")
-    # Allow for different extensions, but still aim for mp4
-    expected_final_path_base = os.path.join(DOWNLOAD_DIR, f"video_{item_id}")
-
-
-    command = [
-        sys.executable, '-m', 'yt_dlp',
-        '-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/bestvideo+bestaudio/best',
-        '--merge-output-format', 'mp4',
-        '--force-keyframes-at-cuts',
-        '-v',
-        '--ignore-config',
-        '--no-warnings',
-        # Add cookies-from-browser argument
-        '--cookies-from-browser', BROWSER_FOR_COOKIES
-    ]
-    # Add profile if needed
-    # command.extend(['--profile', 'Default'])
+    try:
+        info = yt_dlp_engine.extract_info(video_url) # Cached; free after a metadata fetch
+        clip_seconds = admission_policy.check_info(info) # Also enforced by the engine; checked here for the key
+    except VideoRejected as e:
+        logging.info(f"Download rejected (ID: {item_id}): {e}")
+        return {"success": False, "rejected": True, "message": str(e), "drive_path": "", "media_key": ""}
+    except YtDlpDownloadError as e:
+        logging.error(f"Download Failed (ID: {item_id}): {e}")
+        return {"success": False, "message": yt_dlp_error_message("Download failed", e), "drive_path": "", "media_key": ""}
+    except Exception as e:
+        msg = f"An unexpected error occurred during download process: {e}"
+        logging.exception(msg); return {"success": False, "message": msg, "drive_path": "", "media_key": ""}
+    # A clip is a different file than the full video, so it never takes the full video's key
+    key = media_key_for(info, video_url) + (f"-first{clip_seconds}s" if clip_seconds else '')
+
+    with media_store.key_lock(key):
+        # Same video under a different link (or downloaded meanwhile by another job)
+        entry = media_store.lookup(key)
+        if entry:
+            media_store.alias(video_url, key)
+            logging.info(f"Video for ID {item_id} already stored as '{key}'.")
+            return stored_media_result(key, entry, f"Already downloaded ({os.path.basename(entry['path'])}).")
+
+        try: os.makedirs(media_store.shard_dir(key), exist_ok=True)
+        except OSError as e: logging.error(f"Could not create '{media_store.shard_dir(key)}': {e}"); return {"success": False, "message": f"Error creating download directory: {e}", "drive_path": "", "media_key": ""}
+
+        logging.info(f"Downloading video for ID {item_id} as '{key}': {video_url}")
+        try:
+            final_path = yt_dlp_engine.download(video_url, media_store.output_template(key), progress_callback)
+        except VideoRejected as e:
+            logging.info(f"Download rejected (ID: {item_id}): {e}")
+            media_store.remove_partial(key)
+            return {"success": False, "rejected": True, "message": str(e), "drive_path": "", "media_key": ""}
+        except YtDlpDownloadError as e:
+            message = yt_dlp_error_message("Download failed", e)
+            logging.error(f"Download Failed (ID: {item_id}): {e}")
+            media_store.remove_partial(key)
+            return {"success": False, "message": message, "drive_path": "", "media_key": ""}
+        except Exception as e:
+            msg = f"An unexpected error occurred during download process: {e}"
+            logging.exception(msg)
+            media_store.remove_partial(key)
+            return {"success": False, "message": msg, "drive_path": "", "media_key": ""}
 
-    command.extend(['-o', output_template, video_url]) # Output and URL last
+        if final_path and os.path.isfile(final_path):
+            entry = media_store.add(key, final_path, video_url)
+            logging.info(f"Download Success (ID: {item_id}): {media_store.absolute_path(entry)}")
+            schedule_media_derivatives(key)
+            clip_note = f", first {clip_seconds}s only" if clip_seconds else ''
+            return stored_media_result(key, entry, f"Download successful ({os.path.basename(entry['path'])}{clip_note}).")
 
-    logging.info(f"Executing download command for ID {item_id} (using browser cookies): {' '.join(shlex.quote(c) for c in command)}")
+    message = f"Download process finished but no final output file found for ID {item_id}."
+    logging.warning(f"Download Issue (ID: {item_id}): {message}")
+    return {"success": False, "message": message, "drive_path": "", "media_key": ""}
 
-    try:
-        process = subprocess.run(
-            command, capture_output=True, text=True, check=False, encoding='utf-8', errors='replace'
-        )
 
-        actual_path = None
-        download_successful = False
-        message = ""
+# --- Background Jobs (bounded worker pool with per-platform limits) ---
+JOB_TERMINAL_STATES = ('succeeded', 'failed')
 
-        # Improved check for output file, allowing various extensions
-        if process.returncode == 0:
-            try:
-                for filename in os.listdir(DOWNLOAD_DIR):
-                    if filename.startswith(f"video_{item_id}.") and not filename.endswith((".part", ".ytdl")):
-                        potential_path = os.path.abspath(os.path.join(DOWNLOAD_DIR, filename))
-                        if os.path.isfile(potential_path):
-                            actual_path = potential_path
-                            download_successful = True
-                            message = f"Download successful ({filename})."
-                            logging.info(f"Download Success (ID: {item_id}): {actual_path}")
-                            break # Found the file
-            except FileNotFoundError:
-                 logging.warning(f"Download directory '{DOWNLOAD_DIR}' not found after download attempt for ID {item_id}.")
-                 message = f"Download process finished (Code: 0) but download directory disappeared."
-            except Exception as e:
-                 logging.error(f"Error checking for downloaded file for ID {item_id}: {e}")
-                 message = f"Download process finished (Code: 0) but error occurred checking output: {e}"
+def process_alive(pid):
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except PermissionError: return True
+    return True
 
-            if not download_successful:
-                message = f"Download process finished (Code: 0) but no final output file found for ID {item_id}."
-                logging.warning(f"Download Issue (ID: {item_id}): {message}. Stdout: {process.stdout[:200]}. Stderr: {process.stderr[:200]}")
 
-        # Handle failures, adding context about browser cookie attempt
-        else:
-            error_suffix = ""
-            if "authentication" in process.stderr.lower():
-                 error_suffix = f" (Tried using cookies from {BROWSER_FOR_COOKIES}. Ensure you're logged in there and yt-dlp has access.)"
+class JobStore:
+    """Job snapshots as one JSON file per job, written by the process that runs the job.
+    With several worker processes, a status request may reach a worker that does not run the job;
+    it answers from here. A job left unfinished by a worker that has exited is reported as failed."""
 
-            message = f"Download failed (Code: {process.returncode}). Error: {process.stderr or 'Unknown yt-dlp error'}{error_suffix}"
-            logging.error(f"Download Failed (ID: {item_id}). Code: {process.returncode}. Stderr: {process.stderr}")
-            # Try to remove any potentially incomplete file matching the pattern
-            try:
-                for filename in os.listdir(DOWNLOAD_DIR):
-                    if filename.startswith(f"video_{item_id}."):
-                        file_to_remove = os.path.join(DOWNLOAD_DIR, filename)
-                        try:
-                             if os.path.isfile(file_to_remove):
-                                 os.remove(file_to_remove)
-                                 logging.info(f"Removed potentially incomplete/failed file: {file_to_remove}")
-                        except OSError as e_rem:
-                             logging.warning(f"Could not remove generated file {file_to_remove}: {e_rem}")
-            except FileNotFoundError:
-                 pass # Ignore if dir doesn't exist
-            except Exception as e_clean:
-                 logging.warning(f"Error during cleanup of failed download for ID {item_id}: {e_clean}")
+    def __init__(self, directory):
+        self.directory = directory
 
+    def _path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
 
-        return {
-            "success": download_successful, "message": message.strip(),
-            "drive_path": actual_path if download_successful else ""
+    def put(self, job):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.job-', dir=self.directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f: json.dump(job, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(job["id"]))
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not persist job {job.get('id')}: {e}")
+
+    def get(self, job_id):
+        if not re.fullmatch(r'[0-9a-f]{32}', job_id): return None
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f: job = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        except OSError as e:
+            logging.warning(f"Could not read job {job_id}: {e}")
+            return None
+        if job["status"] not in JOB_TERMINAL_STATES and job.get("pid") != os.getpid() and not process_alive(job.get("pid", 0)):
+            job.update(status="failed", message="The worker process running this job exited before it finished.")
+        return job
+
+    def list(self, kind=None):
+        try: filenames = os.listdir(self.directory)
+        except FileNotFoundError: return []
+        jobs = (self.get(filename[:-5]) for filename in filenames if filename.endswith('.json'))
+        return [job for job in jobs if job is not None and (kind is None or job["kind"] == kind)]
+
+    def prune(self, now):
+        for job in self.list():
+            if job["status"] in JOB_TERMINAL_STATES and now - job["updated_at"] > JOB_RETENTION_SECONDS:
+                try: os.remove(self._path(job["id"]))
+                except OSError: pass
+
+job_store = JobStore(JOBS_DIR)
+
+
+class JobManager:
+    """Runs long tasks (e.g. downloads) on a bounded thread pool and tracks their status in memory,
+    mirrored to a JobStore for the other worker processes (progress-only updates are throttled).
+    Jobs share a 'group' (the social platform for downloads); at most group_limits[group] of a group
+    run at once (per process). Jobs waiting for their group stay queued here instead of occupying a worker thread."""
+
+    def __init__(self, max_workers, group_limits=None, default_group_limit=None, store=None):
+        self.store = store
+        self.max_workers = max_workers
+        self.group_limits = group_limits or {}
+        self.default_group_limit = default_group_limit or max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._cond = threading.Condition()
+        self._jobs = {} # job_id -> job dict (only modified under self._cond)
+        self._pending = deque() # (job_id, func, args) waiting for a free slot
+        self._running_per_group = {}
+        self._running = 0
+        self._persisted_at = {} # job_id -> updated_at of the last snapshot written to the store
+
+    def submit(self, kind, func, *args, group=None, params=None):
+        """Queues func(job_id, *args). Its return value becomes the job's 'result'. Returns the job snapshot."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        job = {
+            "id": job_id, "kind": kind, "group": group, "params": params or {},
+            "status": "queued", "progress": None, "message": "Queued.", "result": None,
+            "created_at": now, "updated_at": now, "revision": 0, "pid": os.getpid(),
         }
-
-    except FileNotFoundError:
-        msg = f"Error: '{sys.executable} -m yt_dlp' command failed. Is yt-dlp installed?"
-        logging.critical(msg); return {"success": False, "message": msg, "drive_path": ""}
-    except Exception as e:
-        msg = f"An unexpected error occurred during download process: {e}"
-        logging.exception(msg); return {"success": False, "message": msg, "drive_path": ""}
+        if self.store: self.store.prune(now)
+        with self._cond:
+            self._prune_finished(now)
+            self._jobs[job_id] = job
+            self._persist(job)
+            self._pending.append((job_id, func, args))
+            self._dispatch()
+            return dict(job)
+
+    def update(self, job_id, **changes):
+        """Updates a job's fields (progress, message, ...) and wakes up anyone waiting for it."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None: return
+            status_changed = changes.get("status", job["status"]) != job["status"]
+            job.update(changes)
+            job["updated_at"] = time.time()
+            job["revision"] += 1
+            if status_changed or job["updated_at"] - self._persisted_at.get(job_id, 0) >= JOB_PERSIST_INTERVAL_SECONDS:
+                self._persist(job)
+            self._cond.notify_all()
+
+    def _persist(self, job):
+        # Called with self._cond held, so snapshots reach the store in revision order
+        if self.store is None: return
+        self._persisted_at[job["id"]] = job["updated_at"]
+        self.store.put(job)
+
+    def get(self, job_id):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self, kind=None):
+        with self._cond:
+            return [dict(job) for job in self._jobs.values() if kind is None or job["kind"] == kind]
+
+    def wait_for_change(self, job_id, revision, timeout):
+        """Blocks until the job's revision differs from 'revision' (or timeout). Returns the job snapshot."""
+        with self._cond:
+            self._cond.wait_for(lambda: job_id not in self._jobs or self._jobs[job_id]["revision"] != revision, timeout)
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _group_limit(self, group):
+        if group is None: return self.max_workers
+        return self.group_limits.get(group, self.default_group_limit)
+
+    def _dispatch(self):
+        # Called with self._cond held: start every pending job whose group has a free slot
+        for entry in list(self._pending):
+            if self._running >= self.max_workers: break
+            job_id, func, args = entry
+            group = self._jobs[job_id]["group"]
+            if self._running_per_group.get(group, 0) >= self._group_limit(group): continue
+            self._pending.remove(entry)
+            self._running += 1
+            self._running_per_group[group] = self._running_per_group.get(group, 0) + 1
+            self._executor.submit(self._run, job_id, func, args)
+
+    def _run(self, job_id, func, args):
+        self.update(job_id, status="running", message="Running...")
+        try:
+            result = func(job_id, *args)
+            success = not (isinstance(result, dict) and result.get("success") is False)
+            message = result.get("message", "") if isinstance(result, dict) else ""
+            self.update(job_id, status="succeeded" if success else "failed", result=result,
+                        message=message or ("Done." if success else "Failed."))
+        except Exception as e:
+            logging.exception(f"Job {job_id} crashed: {e}")
+            self.update(job_id, status="failed", message=f"Unexpected error: {e}")
+        finally:
+            with self._cond:
+                group = self._jobs[job_id]["group"] if job_id in self._jobs else None
+                self._running -= 1
+                self._running_per_group[group] = self._running_per_group.get(group, 1) - 1
+                self._dispatch()
+
+    def _prune_finished(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["status"] in JOB_TERMINAL_STATES and now - job["updated_at"] > JOB_RETENTION_SECONDS]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._persisted_at.pop(job_id, None)
+
+
+download_jobs = JobManager(DOWNLOAD_WORKERS, PLATFORM_CONCURRENCY, DEFAULT_PLATFORM_CONCURRENCY, store=job_store)
+task_jobs = JobManager(TASK_JOB_WORKERS, store=job_store) # Bulk tasks, kept apart so they never take download slots
+JOB_MANAGERS = (download_jobs, task_jobs)
+
+def find_job(job_id):
+    """Returns (manager, job snapshot) for a job id from any manager of this process, or
+    (None, snapshot) for a job run by another worker process, or (None, None)."""
+    for manager in JOB_MANAGERS:
+        job = manager.get(job_id)
+        if job is not None: return manager, job
+    return None, job_store.get(job_id)
+
+
+def wait_for_job_change(manager, job_id, revision, timeout):
+    """manager.wait_for_change(), or for another worker's job, polling its stored snapshot until timeout."""
+    if manager is not None: return manager.wait_for_change(job_id, revision, timeout)
+    deadline = time.time() + timeout
+    while True:
+        job = job_store.get(job_id)
+        if job is None or job["revision"] != revision or job["status"] in JOB_TERMINAL_STATES or time.time() >= deadline: return job
+        time.sleep(JOB_POLL_INTERVAL_SECONDS)
+
+
+def list_all_jobs(kind=None):
+    """Jobs of this process (live) plus those of other worker processes (stored snapshots)."""
+    jobs = {job["id"]: job for job in job_store.list(kind)}
+    jobs.update((job["id"], job) for manager in JOB_MANAGERS for job in manager.list(kind=kind))
+    return sorted(jobs.values(), key=lambda job: job["created_at"])
+
+
+def run_download_job(job_id, url, item_id):
+    """Job body: downloads one video, streaming progress into the job, and stores the outcome on the item."""
+    def report(progress):
+        percent = progress.get("percent")
+        download_jobs.update(job_id, progress=percent,
+                             message=f"Downloading... {percent:.1f}%" if percent is not None else "Downloading...")
+
+    result = download_video_yt_dlp(url, item_id, progress_callback=report)
+    # Persist the outcome so it survives a page reload, even if nobody is watching the job
+    stored = update_item(item_id, {
+        "download_success": result["success"], "download_message": result["message"],
+        "drive_path": result.get("drive_path", ""), "media_key": result.get("media_key", ""),
+    })
+    if not stored["success"]:
+        logging.warning(f"Download job {job_id}: could not store result on item {item_id}: {stored['message']}")
+    else:
+        result["version"] = stored["item"]["version"] # Lets the page keep editing on top of this write
+    return result
+
+
+# --- Batch Ingest Pipeline (CSV/JSONL rows -> items with metadata, downloads, Politifact details) ---
+INGEST_FIELDS = ('politifact_url', 'social_link', 'rating')
+
+def ingest_format(filename):
+    """Returns 'csv' or 'jsonl' based on the file extension (anything that is not .csv is read as JSONL)."""
+    return 'csv' if (filename or '').lower().endswith('.csv') else 'jsonl'
+
+
+def read_ingest_rows(stream, fmt):
+    """Yields {politifact_url, social_link, rating} dicts from a CSV (with header row) or JSONL text stream.
+    Unparseable rows yield None so they are counted as skipped instead of aborting the batch."""
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            row = {(key or '').strip().lower(): value for key, value in row.items()}
+            yield {key: (row.get(key) or '').strip() for key in INGEST_FIELDS}
+        return
+    for line in stream:
+        if not line.strip(): continue
+        try: row = json.loads(line)
+        except ValueError: yield None; continue
+        yield {key: str(row.get(key) or '').strip() for key in INGEST_FIELDS} if isinstance(row, dict) else None
+
+
+class IngestPipeline:
+    """Turns ingest rows into fully populated items. Rows are read and created as items in batches; each item
+    then goes through two concurrent stages on separate pools -- the Politifact scrape and the video stage
+    (metadata -> admission policy check -> download, under per-platform limits) -- while a
+    committer thread writes finished results back in small batches, so progress survives an interruption."""
+
+    COUNTERS = ('rows', 'created', 'skipped', 'duplicates', 'politifact_failed', 'metadata_failed',
+                'rejected', 'downloaded', 'download_failed', 'commit_failed', 'stages_done')
+
+    def __init__(self, download=True, politifact_workers=None, video_workers=None, progress_callback=None):
+        self.download = download
+        self.progress_callback = progress_callback # Called with a counts snapshot after every finished stage
+        self.rate_limiter = HostRateLimiter(POLITIFACT_RATE_LIMIT_PER_SECOND)
+        self.politifact_pool = ThreadPoolExecutor(max_workers=politifact_workers or BACKFILL_WORKERS, thread_name_prefix='ingest-pf')
+        self.video_pool = ThreadPoolExecutor(max_workers=video_workers or DOWNLOAD_WORKERS, thread_name_prefix='ingest-video')
+        self.results = queue.Queue() # (item_id, fields) from the stages; None stops the committer
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self._platform_slots = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key, amount=1):
+        with self._lock: self.counts[key] += amount
+
+    def snapshot(self):
+        with self._lock: return dict(self.counts)
+
+    def _platform_slot(self, platform):
+        with self._lock:
+            if platform not in self._platform_slots:
+                limit = PLATFORM_CONCURRENCY.get(platform, DEFAULT_PLATFORM_CONCURRENCY)
+                self._platform_slots[platform] = threading.BoundedSemaphore(limit)
+            return self._platform_slots[platform]
+
+    def _politifact_stage(self, item):
+        details = get_politifact_details(item['politifact_url'], self.rate_limiter)
+        if details is None: self._count('politifact_failed'); return
+        self.results.put((item['id'], {"politifact_headline": details.get("headline") or "",
+                                       "politifact_subheadline": details.get("subheadline") or ""}))
+
+    def _video_stage(self, item):
+        url = item['social_link']
+        with self._platform_slot(item['social_platform']):
+            metadata = get_video_metadata_yt_dlp(url) # Cached, so the download below does not extract again
+            if not metadata["success"] and not metadata.get("rejected"):
+                self._count('metadata_failed')
+                self.results.put((item['id'], {"download_success": False, "download_message": metadata["message"]}))
+                return
+            fields = {"social_duration": metadata["duration"], "social_text": metadata["social_text"]} if "duration" in metadata else {}
+            if metadata.get("rejected"):
+                self._count('rejected')
+                fields.update(download_success=False, download_message=metadata["message"])
+            elif self.download:
+                result = download_video_yt_dlp(url, item['id'])
+                self._count('rejected' if result.get("rejected") else 'downloaded' if result["success"] else 'download_failed')
+                fields.update(download_success=result["success"], download_message=result["message"],
+                              drive_path=result.get("drive_path", ""), media_key=result.get("media_key", ""))
+        self.results.put((item['id'], fields))
+
+    def _stage_done(self, future):
+        if future.exception() is not None:
+            logging.error(f"Ingest stage failed: {future.exception()}")
+        self._count('stages_done')
+        if self.progress_callback: self.progress_callback(self.snapshot())
+
+    def _commit_loop(self):
+        pending, last_flush, stopping = {}, time.monotonic(), False
+        while not stopping:
+            try:
+                entry = self.results.get(timeout=INGEST_COMMIT_INTERVAL_SECONDS)
+                if entry is None: stopping = True
+                else: pending.setdefault(entry[0], {}).update(entry[1])
+            except queue.Empty:
+                pass
+            due = len(pending) >= INGEST_COMMIT_BATCH or time.monotonic() - last_flush >= INGEST_COMMIT_INTERVAL_SECONDS
+            if pending and (stopping or due):
+                if not update_items(pending)["success"]: self._count('commit_failed', len(pending))
+                pending, last_flush = {}, time.monotonic()
+
+    def _start_batch(self, rows, in_flight):
+        created = create_items([{
+            "politifact_url": row['politifact_url'], "social_link": row['social_link'], "rating": row['rating'].lower(),
+            "social_platform": parse_social_platform(row['social_link']),
+        } for row in rows])
+        if not created["success"]: raise RuntimeError(created["message"])
+        self._count('created', len(created["items"]))
+        for item in created["items"]:
+            futures = []
+            if item['politifact_url'].startswith(('http://', 'https://')):
+                futures.append(self.politifact_pool.submit(self._politifact_stage, item))
+            if item['social_link']:
+                futures.append(self.video_pool.submit(self._video_stage, item))
+            for future in futures: future.add_done_callback(self._stage_done)
+            in_flight.update(futures)
+        # Backpressure: don't read further ahead than the stages can keep up with
+        while len(in_flight) > INGEST_MAX_IN_FLIGHT:
+            _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        return in_flight
+
+    def run(self, rows):
+        """Processes all rows and blocks until every stage has finished and been committed. Returns a result dict."""
+        committer = threading.Thread(target=self._commit_loop, name='ingest-commit', daemon=True)
+        committer.start()
+        error = None
+        try:
+            # Skip rows already in the dataset, so re-running an interrupted ingest does not duplicate items
+            seen = {(item.get('politifact_url') or '', item.get('social_link') or '') for item in load_data()}
+            batch, in_flight = [], set()
+            for row in rows:
+                self._count('rows')
+                if row is None or not (row['politifact_url'] or row['social_link']):
+                    self._count('skipped'); continue
+                key = (row['politifact_url'], row['social_link'])
+                if key in seen: self._count('duplicates'); continue
+                seen.add(key)
+                batch.append(row)
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    in_flight = self._start_batch(batch, in_flight); batch = []
+            if batch: in_flight = self._start_batch(batch, in_flight)
+            wait(in_flight)
+        except Exception as e:
+            logging.exception(f"Ingest aborted: {e}")
+            error = str(e)
+        finally:
+            self.politifact_pool.shutdown(wait=True)
+            self.video_pool.shutdown(wait=True)
+            self.results.put(None)
+            committer.join()
+
+        counts = self.snapshot()
+        del counts['stages_done']
+        summary = (f"Ingested {counts['created']} of {counts['rows']} rows ({counts['duplicates']} duplicates, {counts['skipped']} skipped); "
+                   f"{counts['downloaded']} downloaded, {counts['rejected']} rejected, "
+                   f"{counts['metadata_failed'] + counts['download_failed']} video failures, {counts['politifact_failed']} Politifact failures.")
+        if error: return {"success": False, "message": f"Ingest aborted after partial progress: {error}. {summary}", **counts}
+        logging.info(summary)
+        return {"success": True, "message": summary, **counts}
+
+
+# --- Storage Errors ---
+@app.errorhandler(StorageError)
+def storage_error(e):
+    """A dataset that cannot be read is a server error, never an empty page (saving that page would persist it)."""
+    if request.accept_mimetypes.best == 'application/json' or request.path.startswith('/api/'):
+        return jsonify({"error": str(e)}), 500
+    return Response(f"Storage error: {e}\n", status=500, mimetype='text/plain')
+
+
+# --- Request Instrumentation (route latency histogram, opt-in cProfile per request) ---
+@app.before_request
+def start_request_timer():
+    metrics_publisher.start()
+    g.request_started = time.perf_counter()
+    if PROFILE_REQUESTS and (request.args.get('_profile') == '1' or request.headers.get('X-Profile') == '1'):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request_metrics(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unmatched'}-{uuid.uuid4().hex[:8]}.prof")
+            profiler.dump_stats(path) # Inspect with: python -m pstats <file> (or snakeviz)
+            response.headers['X-Profile-File'] = path
+        except OSError as e:
+            logging.warning(f"Could not write request profile: {e}")
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Endpoint names, not paths, keep the label set small (item ids, media keys, ... stay out of it)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=request.endpoint or 'unmatched',
+                                     method=request.method, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of all metrics, summed over the live worker processes."""
+    return Response(render_metrics(metrics_publisher.collect()), mimetype='text/plain; version=0.0.4')
 
 
 # --- Flask Routes (index, save, import) ---
+def dataset_not_modified(etag):
+    """Returns a 304 response if the client already has the page/API result for this dataset version."""
+    if etag is None or session.get('_flashes'): return None # Pending flash messages must be rendered
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def with_dataset_etag(response, etag):
+    if etag is not None and not session.get('_flashes'):
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache' # Always revalidate
+    return response
+
 @app.route('/')
 def index():
-    current_data = load_data()
-    return render_template('index.html', data=current_data)
+    etag = dataset_etag()
+    not_modified = dataset_not_modified(etag)
+    if not_modified: return not_modified
+    # Only the first window is rendered server-side; the rest is fetched on scroll via /api/items
+    window, next_cursor, total = query_items({}, limit=PAGE_SIZE)
+    response = make_response(render_template('index.html', data=window, start_index=0, next_cursor=next_cursor, total=total))
+    return with_dataset_etag(response, etag)
 
 @app.route('/save', methods=['POST'])
 def save():
@@ -405,32 +3298,120 @@ def save():
              if not isinstance(item, dict):
                  return jsonify({"error": "Invalid data format: List items must be objects."}), 400
              # Add more checks if needed, e.g., presence of 'id' although we rewrite it
-        if save_data(data_to_save): return jsonify({"message": "Data saved successfully."}), 200
+        try: data_to_save = [expand_item(item) for item in data_to_save] # Compact (mask) items are accepted too
+        except ValueError as e: return jsonify({"error": f"Invalid data format: {e}"}), 400
+        try: saved = save_data(data_to_save, check_versions=True)
+        except VersionConflict as e: return jsonify({"error": str(e), "item": e.item}), 409
+        if saved: return jsonify({"message": "Data saved successfully."}), 200
         else: return jsonify({"error": "Failed to write data to file."}), 500
     except Exception as e: logging.exception(f"Error processing /save: {e}"); return jsonify({"error": "Internal server error."}), 500
 
+# --- Route: Paginated Items API ---
+@app.route('/api/items', methods=['GET'])
+def list_items():
+    filters, error = parse_item_filters(request.args)
+    if error: return jsonify({"error": error}), 400
+    try:
+        cursor = int(request.args['cursor']) if request.args.get('cursor') else None
+        limit = int(request.args.get('limit', PAGE_SIZE))
+        start_index = int(request.args.get('start_index', 0))
+    except ValueError: return jsonify({"error": "Invalid 'cursor', 'limit' or 'start_index'."}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    etag = dataset_etag()
+    not_modified = dataset_not_modified(etag)
+    if not_modified: return not_modified
+    window, next_cursor, total = query_items(filters, cursor, limit)
+
+    payload = {"next_cursor": next_cursor, "total": total, "count": len(window)}
+    # format=html returns the rendered entry cards for the lazy-loading index page
+    if request.args.get('format') == 'html':
+        payload["html"] = render_template('_entries.html', data=window, start_index=start_index)
+    else:
+        payload["items"] = list(map(compact_item, window)) if wants_compact() else window
+    return with_dataset_etag(jsonify(payload), etag), 200
+
+# --- Routes: Item-level create/read/update/delete ---
+def wants_compact():
+    """Opt-in compact wire format (?compact=1): ooc_mask/checklist_mask integers instead of flag dicts."""
+    return request.args.get('compact', '').lower() in ('1', 'true', 'yes')
+
+def parse_item_payload():
+    """Returns (fields, error) for a POST/PATCH body. Compact (mask) input is accepted and expanded."""
+    fields = request.get_json()
+    if isinstance(fields, dict):
+        try: fields = expand_item({key: value for key, value in fields.items() if key != 'version'})
+        except ValueError as e: return None, str(e)
+    error = validate_item_fields(fields)
+    return (None, error) if error else (fields, None)
+
+def parse_expected_version():
+    """The item version the client's edit is based on: an If-Match: "<version>" header or a 'version' body field.
+    Returns (version or None, error). Without one, the write is applied unconditionally (last writer wins)."""
+    if request.headers.get('If-Match'):
+        tags = request.if_match.as_set()
+        if len(tags) != 1 or not next(iter(tags)).isdigit(): return None, 'If-Match must be one quoted item version, e.g. "3".'
+        return int(next(iter(tags))), None
+    body = request.get_json(silent=True)
+    version = body.get('version') if isinstance(body, dict) else None
+    if version is None: return None, None
+    if isinstance(version, bool) or not isinstance(version, int): return None, "Field 'version' must be an integer."
+    return version, None
+
+def item_result_response(result, success_status=200):
+    """Maps a create/update/delete result dict to a JSON response."""
+    if result["success"]:
+        if "item" in result: return jsonify(compact_item(result["item"]) if wants_compact() else result["item"]), success_status
+        return jsonify({"message": "Deleted."}), success_status
+    if result.get("not_found"): return jsonify({"error": result["message"]}), 404
+    if result.get("conflict"): # The client re-applies its edit on top of the current item, then retries
+        item = compact_item(result["item"]) if wants_compact() else result["item"]
+        return jsonify({"error": result["message"], "item": item}), 409
+    return jsonify({"error": result["message"]}), 500
+
+@app.route('/api/items', methods=['POST'])
+def create_item_route():
+    if not request.is_json: return jsonify({"error": "Request must be JSON."}), 415
+    fields, error = parse_item_payload()
+    if error: return jsonify({"error": error}), 400
+    return item_result_response(create_item(fields), success_status=201)
+
+@app.route('/api/items/<int:item_id>', methods=['GET'])
+def get_item_route(item_id):
+    etag = dataset_etag()
+    not_modified = dataset_not_modified(etag)
+    if not_modified: return not_modified
+    item = get_item(item_id)
+    if item is None: return jsonify({"error": f"Item {item_id} not found."}), 404
+    return with_dataset_etag(jsonify(compact_item(item) if wants_compact() else item), etag), 200
+
+@app.route('/api/items/<int:item_id>', methods=['PATCH'])
+def update_item_route(item_id):
+    if not request.is_json: return jsonify({"error": "Request must be JSON."}), 415
+    fields, error = parse_item_payload()
+    if error: return jsonify({"error": error}), 400
+    expected_version, error = parse_expected_version()
+    if error: return jsonify({"error": error}), 400
+    return item_result_response(update_item(item_id, fields, expected_version))
+
+@app.route('/api/items/<int:item_id>', methods=['DELETE'])
+def delete_item_route(item_id):
+    expected_version, error = parse_expected_version()
+    if error: return jsonify({"error": error}), 400
+    return item_result_response(delete_item(item_id, expected_version))
+
 @app.route('/import', methods=['POST'])
 def import_data():
+    """Form upload: starts the import as a task job (see /api/import) and returns to the index page at once."""
     if 'jsonfile' not in request.files: flash('No file part.', 'danger'); return redirect(url_for('index'))
     file = request.files['jsonfile']
     if file.filename == '': flash('No selected file.', 'warning'); return redirect(url_for('index'))
-    if file and file.filename.lower().endswith('.json'):
-        try:
-            content = file.read().decode('utf-8')
-            if not content.strip(): flash('Import failed: File is empty.', 'danger'); return redirect(url_for('index'))
-            new_data = json.loads(content)
-            if not isinstance(new_data, list): flash('Import failed: JSON not a list.', 'danger'); return redirect(url_for('index'))
-            # Data structure validation happens implicitly in load_data/save_data now
-            if save_data(new_data): flash(f'Data ({len(new_data)} items) imported!', 'success')
-            else: flash('Import failed: Could not save data.', 'danger')
-        except json.JSONDecodeError as e:
-            flash(f'Import error: Invalid JSON format - {e}', 'danger')
-            logging.error(f"Import JSON Decode Error: {e}")
-        except Exception as e:
-            flash(f'Import error: {e}', 'danger')
-            logging.exception(f"Import Error: {e}")
-        return redirect(url_for('index'))
-    else: flash('Invalid file type (must be .json).', 'warning'); return redirect(url_for('index'))
+    if not file.filename.lower().endswith(('.json', '.jsonl')): flash('Invalid file type (must be .json or .jsonl).', 'warning'); return redirect(url_for('index'))
+    mode = request.form.get('mode', 'merge')
+    if mode not in ('merge', 'replace'): flash(f"Invalid import mode '{mode}'.", 'warning'); return redirect(url_for('index'))
+    job = submit_import_job(file, mode)
+    flash(f"Import of '{file.filename}' started in the background (job {job['id']}). Reload the page once it has finished.", 'info')
+    return redirect(url_for('index'))
 
 
 # +++ START: New Route for Politifact Details +++
@@ -446,13 +3427,12 @@ def handle_politifact_details_request():
          return jsonify({"error": "Invalid URL format."}), 400
 
     logging.info(f"Fetching Politifact details for URL: {url}")
-    headline = get_headline(url)
-    subheadline = get_subheadline(url)
+    details = get_politifact_details(url) or {}
 
     # Return empty strings if None was returned by helpers
     return jsonify({
-        "headline": headline if headline is not None else "",
-        "subheadline": subheadline if subheadline is not None else ""
+        "headline": details.get("headline") or "",
+        "subheadline": details.get("subheadline") or ""
     }), 200
 # +++ END: New Route for Politifact Details +++
 
@@ -467,14 +3447,8 @@ def handle_metadata_request():
 
     result = get_video_metadata_yt_dlp(url) # Calls the updated helper
 
-    # Check duration limit if metadata fetch itself was successful
-    if result["success"] and result.get("duration") is not None:
-        duration = result["duration"]
-        if duration > MAX_VIDEO_DURATION_SECONDS:
-            result["success"] = False # Override success
-            result["message"] = f"Video duration ({duration:.1f}s) exceeds limit ({MAX_VIDEO_DURATION_SECONDS}s). Download aborted."
-            logging.info(f"Video rejected (duration): {duration}s > {MAX_VIDEO_DURATION_SECONDS}s for URL: {url}")
-            return jsonify(result), 200 # Return 200 OK, but success:false in body
+    # Rejected by the admission policy (duration, size, platform, format caps)
+    if result.get("rejected"): return jsonify(result), 200 # Return 200 OK, but success:false in body
 
     # Return metadata result (could be success or failure from yt-dlp)
     if result["success"]: return jsonify(result), 200
@@ -499,10 +3473,426 @@ def handle_download_request():
     if result["success"]: return jsonify(result), 200
     else:
         # Determine appropriate status code
-        status_code = 400 if "invalid url" in result.get("message", "").lower() else 500
+        status_code = 400 if result.get("rejected") or "invalid url" in result.get("message", "").lower() else 500
         return jsonify({"error": result.get("message", "Unknown download error")}), status_code
 
 
+# --- Route: Export ---
+@app.route('/api/export.<fmt>', methods=['GET'])
+def export_items(fmt):
+    """Streams the dataset as JSONL, flattened CSV or Parquet. Accepts the filters of /api/items."""
+    if fmt not in EXPORT_FORMATS: return jsonify({"error": f"Unknown export format '{fmt}' (jsonl, csv or parquet)."}), 404
+    if fmt == 'parquet' and pq is None: return jsonify({"error": "pyarrow is not installed (pip install pyarrow)."}), 501
+    filters, error = parse_item_filters(request.args)
+    if error: return jsonify({"error": error}), 400
+    generator, mimetype = EXPORT_FORMATS[fmt]
+    if fmt == 'jsonl' and wants_compact(): generator = functools.partial(export_jsonl, compact=True)
+    response = Response(stream_with_context(generator(filters)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="ooc_export.{fmt}"'
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+# --- Route: Search ---
+@app.route('/api/search', methods=['GET'])
+def search_items():
+    """Ranked full-text search: ?q=...&rating=&platform=&download_success=&ooc=<key> (repeatable)&offset=&limit=."""
+    filters, error = parse_item_filters(request.args)
+    if error: return jsonify({"error": error}), 400
+    ooc_keys = request.args.getlist('ooc')
+    unknown = [key for key in ooc_keys if key not in OOC_CRITERIA_KEYS]
+    if unknown: return jsonify({"error": f"Unknown 'ooc' key(s): {', '.join(unknown)}."}), 400
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = max(1, min(int(request.args.get('limit', SEARCH_PAGE_SIZE)), MAX_PAGE_SIZE))
+    except ValueError: return jsonify({"error": "Invalid 'offset' or 'limit'."}), 400
+
+    etag = dataset_etag()
+    not_modified = dataset_not_modified(etag)
+    if not_modified: return not_modified
+    query = request.args.get('q', '')
+    page, total, facets = search_index.search(query, filters, ooc_keys, offset, limit)
+    results = []
+    for item_id, score in page:
+        item = get_item(item_id)
+        if item is None: continue
+        results.append({
+            "id": item_id, "score": score, "politifact_headline": item.get('politifact_headline', ''),
+            "rating": item.get('rating', ''), "social_platform": item.get('social_platform', ''),
+            "snippet": search_snippet(item, query),
+        })
+    next_offset = offset + len(page) if offset + len(page) < total else None
+    payload = {"query": query, "total": total, "results": results, "facets": facets, "next_offset": next_offset}
+    return with_dataset_etag(jsonify(payload), etag), 200
+
+
+# --- Routes: Analytics ---
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Counts, per-rating/per-platform breakdowns and ooc/evidence co-occurrence matrices.
+    Accepts the same rating/platform/download_success filters as /api/items."""
+    filters, error = parse_item_filters(request.args)
+    if error: return jsonify({"error": error}), 400
+    etag = dataset_etag()
+    not_modified = dataset_not_modified(etag)
+    if not_modified: return not_modified
+    return with_dataset_etag(jsonify(analytics_snapshot.stats(filters)), etag)
+
+@app.route('/api/stats/parquet', methods=['GET'])
+def stats_parquet():
+    """Parquet dump of the snapshot columns: ?table=items (default) or ?table=links."""
+    if pq is None: return jsonify({"error": "pyarrow is not installed (pip install pyarrow)."}), 501
+    table_name = request.args.get('table', 'items')
+    if table_name not in ('items', 'links'): return jsonify({"error": "Invalid 'table' (items or links)."}), 400
+    filters, error = parse_item_filters(request.args)
+    if error: return jsonify({"error": error}), 400
+    items, links = analytics_snapshot.arrow_tables(filters)
+    buffer = io.BytesIO()
+    pq.write_table(items if table_name == 'items' else links, buffer, compression='zstd')
+    buffer.seek(0)
+    return send_file(buffer, mimetype='application/vnd.apache.parquet', as_attachment=True,
+                     download_name=f'ooc_{table_name}.parquet')
+
+
+# --- Routes: Media (stored videos, poster frames, previews) ---
+def send_media_file(path, max_age=MEDIA_CACHE_MAX_AGE_SECONDS):
+    # conditional=True: ETag/Last-Modified checks and Range requests (seeking); the file is handed to the
+    # server's file wrapper (sendfile() under gunicorn/uWSGI) or to the front server with USE_X_SENDFILE
+    return send_file(path, conditional=True, etag=True, max_age=max_age)
+
+def stored_media_entry(key):
+    return media_store.lookup(key) if MEDIA_KEY_PATTERN.fullmatch(key) else None
+
+@app.route('/media/<key>', methods=['GET'])
+def media_file(key):
+    entry = stored_media_entry(key)
+    if entry is None: return jsonify({"error": f"Media '{key}' not found."}), 404
+    return send_media_file(media_store.absolute_path(entry))
+
+@app.route('/media/<key>/poster', methods=['GET'])
+def media_poster(key):
+    if stored_media_entry(key) is None: return jsonify({"error": f"Media '{key}' not found."}), 404
+    path = media_store.derived_path(key, 'poster')
+    if os.path.isfile(path): return send_media_file(path)
+    schedule_media_derivatives(key)
+    return jsonify({"error": f"No poster for '{key}' yet."}), 404
+
+@app.route('/media/<key>/preview', methods=['GET'])
+def media_preview(key):
+    if stored_media_entry(key) is None: return jsonify({"error": f"Media '{key}' not found."}), 404
+    path = media_store.derived_path(key, 'preview')
+    if os.path.isfile(path): return send_media_file(path)
+    schedule_media_derivatives(key)
+    return redirect(url_for('media_file', key=key)) # Full-resolution original until the preview exists
+
+@app.route('/api/items/<int:item_id>/video', methods=['GET'])
+def item_video(item_id):
+    """The item's video: its media store entry, or else its drive_path if that lies inside DOWNLOAD_DIR."""
+    item = get_item(item_id)
+    if item is None: return jsonify({"error": f"Item {item_id} not found."}), 404
+    if item.get('media_key') and stored_media_entry(item['media_key']):
+        return redirect(url_for('media_file', key=item['media_key']))
+    path = os.path.realpath(item.get('drive_path') or '')
+    download_root = os.path.realpath(DOWNLOAD_DIR)
+    # realpath() resolves '..' and symlinks, so drive_path cannot point the route outside DOWNLOAD_DIR
+    if item.get('drive_path') and os.path.commonpath([path, download_root]) == download_root and os.path.isfile(path):
+        return send_media_file(path, max_age=0) # Named by item id, so it can change; revalidate every time
+    return jsonify({"error": f"No video stored for item {item_id}."}), 404
+
+
+# --- Routes: Background Download Jobs ---
+@app.route('/api/jobs/download', methods=['POST'])
+def enqueue_download_job():
+    if not request.is_json: return jsonify({"error": "Request must be JSON."}), 415
+    data = request.get_json()
+    url = data.get('url')
+    item_id_str = data.get('id')
+    if not url or item_id_str is None: return jsonify({"error": "Missing 'url' or 'id'."}), 400
+    try: item_id = int(item_id_str)
+    except (ValueError, TypeError): return jsonify({"error": f"Invalid 'id': '{item_id_str}'."}), 400
+
+    job = download_jobs.submit('download', run_download_job, url, item_id,
+                               group=parse_social_platform(url), params={"url": url, "id": item_id})
+    logging.info(f"Queued download job {job['id']} for item {item_id} ({job['group'] or 'unknown platform'}).")
+    return jsonify(job), 202
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    kind = request.args.get('kind')
+    return jsonify({"jobs": list_all_jobs(kind)}), 200
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    _, job = find_job(job_id)
+    if job is None: return jsonify({"error": f"Job {job_id} not found."}), 404
+    return jsonify(job), 200
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """Server-Sent Events: one 'data:' message per job update, until the job finishes."""
+    manager, job = find_job(job_id)
+    if job is None: return jsonify({"error": f"Job {job_id} not found."}), 404
+
+    def events():
+        revision = None
+        while True:
+            job = wait_for_job_change(manager, job_id, revision, timeout=15)
+            if job is None: break
+            if job["revision"] == revision:
+                yield ": keep-alive\n\n" # Comment line; keeps proxies from closing the idle stream
+                continue
+            revision = job["revision"]
+            yield f"data: {json.dumps(job)}\n\n"
+            if job["status"] in JOB_TERMINAL_STATES: break
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# --- Route: Politifact Backfill (background job) ---
+def run_backfill_job(job_id, workers, limit):
+    def report(done, total):
+        task_jobs.update(job_id, progress=round(100.0 * done / total, 1), message=f"Fetched {done}/{total} pages...")
+    return backfill_politifact_details(workers=workers, limit=limit, progress_callback=report)
+
+@app.route('/api/backfill/politifact', methods=['POST'])
+def start_politifact_backfill():
+    options = request.get_json(silent=True) or {}
+    try:
+        workers = int(options['workers']) if options.get('workers') else None
+        limit = int(options['limit']) if options.get('limit') else None
+    except (ValueError, TypeError): return jsonify({"error": "Invalid 'workers' or 'limit'."}), 400
+    job = task_jobs.submit('politifact_backfill', run_backfill_job, workers, limit,
+                           params={"workers": workers, "limit": limit})
+    return jsonify(job), 202
+
+
+# --- Routes: Evidence Link Checks ---
+@app.route('/api/items/<int:item_id>/links', methods=['GET'])
+def item_links(item_id):
+    try: refresh = parse_bool_param(request.args.get('refresh')) is True
+    except ValueError as e: return jsonify({"error": str(e)}), 400
+    result = check_item_links(item_id, refresh=refresh)
+    if not result["success"]: return jsonify({"error": result["message"]}), 404
+    return jsonify({"id": result["id"], "links": result["links"]}), 200
+
+def run_link_check_job(job_id, workers, limit, refresh):
+    def report(done, total):
+        task_jobs.update(job_id, progress=round(100.0 * done / total, 1), message=f"Checked {done}/{total} links...")
+    return check_evidence_links(workers=workers, limit=limit, refresh=refresh, progress_callback=report)
+
+@app.route('/api/links/check', methods=['POST'])
+def start_link_check():
+    options = request.get_json(silent=True) or {}
+    try:
+        workers = int(options['workers']) if options.get('workers') else None
+        limit = int(options['limit']) if options.get('limit') else None
+    except (ValueError, TypeError): return jsonify({"error": "Invalid 'workers' or 'limit'."}), 400
+    refresh = options.get('refresh') is True
+    job = task_jobs.submit('link_check', run_link_check_job, workers, limit, refresh,
+                           params={"workers": workers, "limit": limit, "refresh": refresh})
+    return jsonify(job), 202
+
+
+# --- Route: Streaming Import (background job) ---
+def run_import_job(job_id, path, mode):
+    def report(counts):
+        task_jobs.update(job_id, message=f"{counts['records']} records read, {counts['created']} created, {counts['updated']} updated...")
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return import_records(iter_json_records(f), mode=mode, progress_callback=report)
+    finally:
+        try: os.remove(path)
+        except OSError: pass
+
+
+def submit_import_job(file, mode):
+    # The upload is gone once the request ends, so the job reads a spooled copy (removed when the job finishes)
+    fd, path = tempfile.mkstemp(prefix='import-', suffix='.json')
+    with os.fdopen(fd, 'wb') as f: file.save(f)
+    return task_jobs.submit('import', run_import_job, path, mode, params={"filename": file.filename, "mode": mode})
+
+@app.route('/api/import', methods=['POST'])
+def start_import():
+    """Imports a JSON/JSONL upload ('jsonfile', 'mode') as a task job, so large files never tie up a request.
+    Follow it at /api/jobs/<id> or /api/jobs/<id>/events; the job's result is the import_records() result dict."""
+    file = request.files.get('jsonfile')
+    if file is None or file.filename == '': return jsonify({"error": "Missing 'jsonfile' upload."}), 400
+    if not file.filename.lower().endswith(('.json', '.jsonl')): return jsonify({"error": "Invalid file type (must be .json or .jsonl)."}), 400
+    mode = request.form.get('mode', 'merge')
+    if mode not in ('merge', 'replace'): return jsonify({"error": "Invalid 'mode' (merge or replace)."}), 400
+    return jsonify(submit_import_job(file, mode)), 202
+
+
+# --- Route: Batch Ingest (background job) ---
+def run_ingest_job(job_id, path, fmt, download):
+    def report(counts):
+        task_jobs.update(job_id, message=f"{counts['created']} items created, {counts['stages_done']} stages finished...")
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return IngestPipeline(download=download, progress_callback=report).run(read_ingest_rows(f, fmt))
+    finally:
+        try: os.remove(path)
+        except OSError: pass
+
+@app.route('/api/ingest', methods=['POST'])
+def start_ingest():
+    """Accepts a CSV/JSONL upload ('ingestfile') of politifact_url, social_link, rating rows and ingests it as a job."""
+    file = request.files.get('ingestfile')
+    if file is None or file.filename == '': return jsonify({"error": "Missing 'ingestfile' upload."}), 400
+    fmt = ingest_format(file.filename)
+    try: download = parse_bool_param(request.form.get('download')) is not False # Downloads unless download=false
+    except ValueError as e: return jsonify({"error": str(e)}), 400
+    # The upload is gone once this request ends, so the job reads a spooled copy (removed when the job finishes)
+    fd, path = tempfile.mkstemp(prefix='ingest-', suffix=f'.{fmt}')
+    with os.fdopen(fd, 'wb') as f: file.save(f)
+    job = task_jobs.submit('ingest', run_ingest_job, path, fmt, download,
+                           params={"filename": file.filename, "format": fmt, "download": download})
+    return jsonify(job), 202
+
+
+# --- CLI: Batch ingest ---
+@app.cli.command('ingest')
+@click.argument('rows_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None, help='Input format (default: from the file extension).')
+@click.option('--no-download', is_flag=True, help='Fetch metadata and check duration, but do not download videos.')
+def ingest_command(rows_file, fmt, no_download):
+    """Creates items from a CSV/JSONL file of politifact_url, social_link, rating rows, then fetches
+    metadata, downloads videos and scrapes Politifact details concurrently.
+
+    Example: flask --app app ingest new_split.csv
+    """
+    def report(counts):
+        if counts['stages_done'] % 25 == 0: click.echo(f"  {counts['created']} items created, {counts['stages_done']} stages finished")
+    with open(rows_file, 'r', encoding='utf-8', newline='') as f:
+        result = IngestPipeline(download=not no_download, progress_callback=report).run(read_ingest_rows(f, fmt or ingest_format(rows_file)))
+    if not result["success"]: raise click.ClickException(result["message"])
+    click.echo(result["message"])
+
+
+# --- CLI: Import existing split folders into the media store ---
+@app.cli.command('media-import')
+@click.argument('data_file', type=click.Path(exists=True, dir_okay=False))
+@click.argument('video_dir', type=click.Path(exists=True, file_okay=False))
+def media_import_command(data_file, video_dir):
+    """Adds the videos of an existing split to the media store and links matching items to them.
+
+    Files are keyed by normalized social link and hard-linked where possible; a video present in several
+    splits is stored once. Example: flask --app app media-import data_falselabel.json downloads/video_falselabel
+    """
+    with open(data_file, 'r', encoding='utf-8') as f:
+        split_items = json.load(f)
+    files_by_stem = {os.path.splitext(name)[0]: name for name in os.listdir(video_dir)}
+    added = shared = missing = 0
+    for item in split_items:
+        link = item.get('social_link') if isinstance(item, dict) else None
+        if not link: continue
+        name = os.path.basename(item.get('drive_path') or '')
+        if not os.path.isfile(os.path.join(video_dir, name)): name = files_by_stem.get(f"video_{item.get('id')}")
+        if not name: missing += 1; continue
+        key = media_store.key_for_url(link) or media_key_for(url=link)
+        if media_store.lookup(key):
+            media_store.alias(link, key); shared += 1
+        else:
+            media_store.add(key, os.path.join(video_dir, name), link); added += 1
+
+    # Point items of the configured storage at their stored media
+    updates = {}
+    for item in load_data():
+        key = media_store.key_for_url(item['social_link']) if item.get('social_link') else None
+        entry = media_store.lookup(key) if key else None
+        if entry is None or item.get('media_key') == key: continue
+        fields = {"media_key": key}
+        if not os.path.isfile(item.get('drive_path') or ''): fields["drive_path"] = media_store.absolute_path(entry)
+        updates[item['id']] = fields
+    result = update_items(updates)
+    if not result["success"]: raise click.ClickException(result["message"])
+    click.echo(f"Stored {added} new videos, {shared} already present, {missing} without a file; linked {result['updated']} items.")
+
+
+# --- CLI: Generate posters/previews for stored media ---
+@app.cli.command('media-derive')
+@click.option('--force', is_flag=True, help='Regenerate existing posters/previews.')
+def media_derive_command(force):
+    """Creates poster frames and low-bitrate previews for every stored video (needs ffmpeg)."""
+    if FFMPEG_BINARY is None: raise click.ClickException("ffmpeg not found on PATH.")
+    keys = media_store.keys()
+    futures = [media_derive_pool.submit(generate_media_derivatives, key, force) for key in keys]
+    failed = sum(1 for future in as_completed(futures) if not future.result()["success"])
+    click.echo(f"Processed {len(keys)} videos ({failed} failed).")
+
+
+# --- CLI: Backfill Politifact details ---
+@app.cli.command('backfill-politifact')
+@click.option('--workers', type=int, default=BACKFILL_WORKERS, show_default=True, help='Concurrent page fetches.')
+@click.option('--rate', type=float, default=POLITIFACT_RATE_LIMIT_PER_SECOND, show_default=True, help='Max requests per second per host.')
+@click.option('--limit', type=int, default=None, help='Only process this many URLs.')
+def backfill_politifact_command(workers, rate, limit):
+    """Fetches missing Politifact headlines/subheadlines for all items and saves them in one batch."""
+    def report(done, total):
+        if done == total or done % 50 == 0: click.echo(f"  {done}/{total} pages fetched")
+    result = backfill_politifact_details(workers=workers, rate=rate, limit=limit, progress_callback=report)
+    if not result["success"]: raise click.ClickException(result["message"])
+    click.echo(result["message"])
+
+
+# --- CLI: Check evidence links ---
+@app.cli.command('check-links')
+@click.option('--workers', type=int, default=LINK_CHECK_WORKERS, show_default=True, help='Concurrent link fetches.')
+@click.option('--rate', type=float, default=LINK_CHECK_RATE_LIMIT_PER_SECOND, show_default=True, help='Max requests per second per host.')
+@click.option('--limit', type=int, default=None, help='Only check this many URLs.')
+@click.option('--refresh', is_flag=True, help='Re-fetch links even if their cached record is fresh.')
+def check_links_command(workers, rate, limit, refresh):
+    """Resolves every evidence link (status, final URL, title/og metadata) and reports broken ones."""
+    def report(done, total):
+        if done == total or done % 100 == 0: click.echo(f"  {done}/{total} links checked")
+    result = check_evidence_links(workers=workers, rate=rate, limit=limit, refresh=refresh, progress_callback=report)
+    for link in result["links"]:
+        click.echo(f"  {link['status'] or 'ERR'}  {link['url']}  (items {', '.join(map(str, link['items']))})")
+    click.echo(result["message"])
+
+
+# --- CLI: Import JSON files into the configured storage ---
+@app.cli.command('import-json')
+@click.argument('json_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--append', is_flag=True, help='Keep existing items and append the imported ones with new IDs.')
+@click.option('--merge', is_flag=True, help='Stream the files and upsert by politifact_url + social_link (JSON or JSONL).')
+def import_json_command(json_files, append, merge):
+    """Imports data_*.json files (e.g. data_falselabel.json) into the configured storage.
+
+    Example: OOC_STORAGE_BACKEND=sqlite flask --app app import-json data_falselabel.json
+    """
+    if merge:
+        for path in json_files:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                result = import_records(iter_json_records(f))
+            for error in result["errors"]: click.echo(f"  skipped: {error}")
+            if not result["success"]: raise click.ClickException(f"'{path}': {result['message']}")
+            click.echo(f"'{path}': {result['message']}")
+        return
+
+    imported = []
+    for path in json_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        if not isinstance(items, list):
+            raise click.ClickException(f"'{path}' does not contain a JSON list.")
+        imported.extend(normalize_item(item) for item in items if isinstance(item, dict))
+        click.echo(f"Read {len(items)} items from '{path}'.")
+
+    if append:
+        existing = get_storage().load_all()
+        first_id = next_item_id(existing)
+        for offset, item in enumerate(imported):
+            item['id'] = first_id + offset
+        ok = save_data(existing + imported, renumber_ids=False)
+    else:
+        ok = save_data(imported)
+    if not ok:
+        raise click.ClickException("Import failed: could not save data (see log).")
+    click.echo(f"Imported {len(imported)} items into the '{STORAGE_BACKEND}' storage.")
+
+
 # --- Main Execution Guard ---
 if __name__ == '__main__':
     # Ensure download directory exists
@@ -511,13 +3901,16 @@ if __name__ == '__main__':
         except OSError as e: logging.critical(f"FATAL: Cannot create download directory '{DOWNLOAD_DIR}': {e}"); sys.exit(1)
 
     # Ensure data file exists (create empty if not)
-    if not os.path.exists(DATA_FILE):
+    if STORAGE_BACKEND == 'json' and not os.path.exists(DATA_FILE):
         try:
             with open(DATA_FILE, 'w', encoding='utf-8') as f:
                 json.dump([], f)
             logging.info(f"Created empty data file: '{DATA_FILE}'")
         except IOError as e:
             logging.critical(f"FATAL: Cannot create data file '{DATA_FILE}': {e}"); sys.exit(1)
+    # SQLite backend creates its schema on first use
+    try: get_storage()
+    except Exception as e: logging.critical(f"FATAL: Cannot open '{STORAGE_BACKEND}' storage: {e}"); sys.exit(1)
 
     # Add instructions for the user about cookies
     logging.info("*"*60)
@@ -532,4 +3925,5 @@ if __name__ == '__main__':
     # pip install Flask requests beautifulsoup4 yt-dlp
     logging.info("Ensure dependencies are installed: pip install Flask requests beautifulsoup4 yt-dlp")
 
+    # Single-process development server; for several annotators use: gunicorn -c gunicorn.conf.py app:app
     app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
@@ -0,0 +1,119 @@
+# /ooc-simpleui/benchmarks/datagen.py
+"""Synthetic datasets in the data_falselabel.json schema, for benchmarks.
+
+Items are deterministic for a given (count, seed). Field shapes follow the shipped data files:
+social_text of a few dozen to ~1,100 characters (median ~150), one to four evidence links with full
+checklists, the same rating/platform mix, and sparse OOC flags.
+
+Usage: python benchmarks/datagen.py 10000 -o data_10k.json [--seed 1] [--base-url http://127.0.0.1:8000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from criteria import EVIDENCE_CRITERIA_KEYS, OOC_CRITERIA_KEYS # noqa: E402 -- the app's schema, so datasets follow it
+
+RATINGS = [('false', 70), ('full flop', 18), ('mostly false', 4), ('half true', 2), ('pants on fire', 4), ('', 2)]
+PLATFORMS = [('instagram', 28), ('x', 11), ('facebook', 9), ('threads', 7), ('tiktok', 4), ('youtube', 3), ('mvau', 33)]
+SOCIAL_LINK_PATTERNS = {
+    'instagram': 'https://www.instagram.com/reel/{slug}/',
+    'x': 'https://x.com/user{n}/status/{digits}',
+    'facebook': 'https://www.facebook.com/watch/?v={digits}',
+    'threads': 'https://www.threads.net/@user{n}/post/{slug}',
+    'tiktok': 'https://www.tiktok.com/@user{n}/video/{digits}',
+    'youtube': 'https://www.youtube.com/watch?v={slug}',
+    'mvau': 'https://mvau.lt/media/{slug}',
+}
+WORDS = ('the a claim video shows president senator governor election vote border fire flood storm protest police '
+         'crowd city state nation report says posted viral clip footage old new years ago misleading context '
+         'shared online users false photo rally speech interview news network footage taken during event after '
+         'before country officials said statement campaign tax money health vaccine school children war troops '
+         'airport bridge highway hospital court judge law bill congress media brainwashing watch subscribe').split()
+DOMAINS = ['apnews.com', 'reuters.com', 'cnn.com', 'nytimes.com', 'bbc.com', 'factcheck.org', 'snopes.com', 'usatoday.com']
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _sentence(rng, low, high):
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return ' '.join(words).capitalize()
+
+
+def _social_text(rng):
+    length = min(int(rng.lognormvariate(5.0, 0.9)), 1100) # median ~150 chars, long tail like the real data
+    if length < 20: return ''
+    title = _sentence(rng, 4, 12)
+    description = []
+    while len(title) + sum(len(part) + 1 for part in description) < length:
+        description.append(_sentence(rng, 6, 18) + '.')
+    text = f"Title: {title}\n\nDescription: {' '.join(description)}"
+    return text[:length + 40]
+
+
+def generate_item(item_id, rng, base_url=None):
+    """One item. With base_url (a benchmarks/fixtures.py server), the links point at the local fixture server."""
+    platform = _weighted(rng, PLATFORMS)
+    slug = ''.join(rng.choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-', k=11))
+    digits = str(rng.randrange(10 ** 17, 10 ** 18))
+    if base_url:
+        politifact_url = f"{base_url}/factchecks/{item_id}/"
+        social_link = f"{base_url}/videos/{item_id}.mp4"
+    else:
+        politifact_url = f"https://www.politifact.com/factchecks/2025/apr/{rng.randint(1, 28):02d}/{'-'.join(rng.choices(WORDS, k=6))}/"
+        social_link = SOCIAL_LINK_PATTERNS[platform].format(slug=slug, digits=digits, n=rng.randint(1, 5000))
+    downloaded = rng.random() < 0.8
+    item = {
+        "id": item_id,
+        "politifact_url": politifact_url,
+        "politifact_headline": _sentence(rng, 8, 16),
+        "politifact_subheadline": _sentence(rng, 10, 24) + '.',
+        "rating": _weighted(rng, RATINGS),
+        "social_link": social_link,
+        "social_platform": platform,
+        "social_duration": rng.randint(5, 600),
+        "social_text": _social_text(rng),
+        "external_links_info": [
+            {
+                "url": f"https://www.{rng.choice(DOMAINS)}/{'-'.join(rng.choices(WORDS, k=5))}-{rng.randint(1, 99999)}",
+                "description": _sentence(rng, 6, 20),
+                "checklist": {key: rng.random() < 0.4 for key in EVIDENCE_CRITERIA_KEYS},
+            }
+            for _ in range(rng.choice((1, 2, 2, 2, 3, 3, 4)))
+        ],
+        "download_success": downloaded,
+        "download_message": f"Download successful (video_{item_id}.mp4)." if downloaded else "Download failed. Error: HTTP Error 404",
+        "drive_path": f"/data/ooc-simpleui/downloads/video_{item_id}.mp4" if downloaded else "",
+    }
+    for key in OOC_CRITERIA_KEYS:
+        item[f"ooc_{key}"] = rng.random() < 0.15
+    return item
+
+
+def generate_items(count, seed=1, base_url=None):
+    rng = random.Random(seed)
+    return [generate_item(item_id, rng, base_url) for item_id in range(count)]
+
+
+def write_dataset(path, count, seed=1, base_url=None):
+    """Writes a dataset file like data_falselabel.json (indented JSON list). Returns the items."""
+    items = generate_items(count, seed, base_url)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, indent=4, ensure_ascii=False)
+    return items
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('count', type=int)
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--base-url', help="Point politifact_url/social_link at a local fixture server")
+    args = parser.parse_args()
+    write_dataset(args.output, args.count, args.seed, args.base_url)
+    print(f"Wrote {args.count} items to '{args.output}'.")
@@ -0,0 +1,161 @@
+# /ooc-simpleui/benchmarks/fixtures.py
+"""Offline stand-ins for the network dependencies, for benchmarks.
+
+- A local HTTP server serving Politifact-like fact-check pages (/factchecks/<n>/, with og:title /
+  og:description, ETag and Last-Modified like the real site) and video files (/videos/<n>.mp4, with
+  HEAD and Range support, so the real yt-dlp generic extractor can download them too).
+- FakeYtDlpEngine: drop-in for app.yt_dlp_engine (extract_info/download) that fetches the fixture
+  videos over HTTP and reports progress, so metadata -> download flows run without yt-dlp's extractors.
+
+Run the server on its own (it prints its base URL on the first line):
+    python benchmarks/fixtures.py [--port 0] [--latency-ms 20] [--video-bytes 2000000]
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} | PolitiFact</title>
+<meta property="og:title" content="{title}">
+<meta property="og:description" content="{description}">
+<meta property="og:type" content="article">
+{filler}
+</head>
+<body>
+<h1 class="m-statement__quote">{title}</h1>
+<article class="m-textblock">{body}</article>
+</body>
+</html>
+"""
+WORDS = 'fact check claim video posted viral footage context misleading said statement shows shared years old'.split()
+
+
+def fact_check_page(number):
+    """A deterministic page of roughly the size of a real fact-check (~60 KB, most of it after </head>)."""
+    rng = random.Random(number)
+    title = ' '.join(rng.choices(WORDS, k=10)).capitalize()
+    description = ' '.join(rng.choices(WORDS, k=25)).capitalize() + '.'
+    filler = '\n'.join(f'<link rel="preload" href="/static/asset-{i}.js" as="script">' for i in range(40))
+    body = '\n'.join(f"<p>{' '.join(rng.choices(WORDS, k=80))}</p>" for _ in range(100))
+    return PAGE_TEMPLATE.format(title=title, description=description, filler=filler, body=body).encode('utf-8')
+
+
+def video_bytes(number, size):
+    """Deterministic bytes that start like an MP4 file (ftyp box), so content sniffing treats them as video."""
+    header = b'\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom'
+    block = hashlib.sha256(str(number).encode()).digest() * 64
+    body = (block * (size // len(block) + 1))[:max(size - len(header), 0)]
+    return header + body
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    video_size = 2_000_000
+    started_at = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime())
+
+    def log_message(self, format, *args): # Keep benchmark output clean
+        pass
+
+    def _send(self, status, body, content_type, extra_headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in extra_headers: self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD': self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        if self.latency: time.sleep(self.latency)
+        page = re.fullmatch(r'/factchecks/(\d+)/?', self.path)
+        video = re.fullmatch(r'/videos/(\d+)\.mp4', self.path)
+        if page:
+            etag = f'"page-{page.group(1)}"'
+            if self.headers.get('If-None-Match') == etag:
+                self._send(304, b'', 'text/html', [('ETag', etag)])
+                return
+            self._send(200, fact_check_page(int(page.group(1))), 'text/html; charset=utf-8',
+                       [('ETag', etag), ('Last-Modified', self.started_at)])
+        elif video:
+            data = video_bytes(int(video.group(1)), self.video_size)
+            byte_range = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+            if byte_range:
+                start = int(byte_range.group(1))
+                end = min(int(byte_range.group(2)) if byte_range.group(2) else len(data) - 1, len(data) - 1)
+                self._send(206, data[start:end + 1], 'video/mp4',
+                           [('Content-Range', f'bytes {start}-{end}/{len(data)}'), ('Accept-Ranges', 'bytes')])
+            else:
+                self._send(200, data, 'video/mp4', [('Accept-Ranges', 'bytes')])
+        else:
+            self._send(404, b'Not found', 'text/plain')
+
+
+def make_server(port=0, latency_ms=0, video_size=2_000_000):
+    handler = type('Handler', (FixtureHandler,), {'latency': latency_ms / 1000.0, 'video_size': video_size})
+    return ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+
+class FakeYtDlpEngine:
+    """Same interface as app.YtDlpEngine, for fixture video URLs: extract_info() costs one HEAD request
+    and returns an info_dict; download() streams the file to the output template with progress callbacks."""
+
+    def __init__(self, download_error=Exception, chunk_size=256 * 1024):
+        self.download_error = download_error # app.YtDlpDownloadError, so the app handles failures as usual
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+
+    def extract_info(self, url):
+        match = re.search(r'/videos/(\d+)\.mp4$', url)
+        if not match: raise self.download_error(f"Unsupported URL: {url}")
+        response = self.session.head(url, timeout=15)
+        if response.status_code != 200: raise self.download_error(f"HTTP Error {response.status_code}")
+        number = int(match.group(1))
+        return {
+            'id': f'fixture{number}', 'extractor_key': 'Fixture', 'ext': 'mp4', 'url': url,
+            'duration': 5 + number % 300, 'title': f'Fixture video {number}',
+            'description': ' '.join(WORDS[number % len(WORDS):] + WORDS[:number % len(WORDS)]),
+            'filesize': int(response.headers.get('Content-Length', 0)),
+        }
+
+    def download(self, url, output_template, progress_callback=None):
+        info = self.extract_info(url)
+        path = output_template.replace('%(ext)s', info['ext'])
+        tmp_path = path + '.part'
+        downloaded = 0
+        with self.session.get(url, stream=True, timeout=30) as response:
+            if response.status_code != 200: raise self.download_error(f"HTTP Error {response.status_code}")
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(self.chunk_size):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if progress_callback:
+                        total = info['filesize'] or None
+                        progress_callback({"downloaded_bytes": downloaded, "total_bytes": total, "eta": None,
+                                           "percent": round(100.0 * downloaded / total, 1) if total else None})
+        os.replace(tmp_path, path)
+        return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve Politifact-like pages and fixture videos locally.')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Added to every response (simulated network)')
+    parser.add_argument('--video-bytes', type=int, default=2_000_000)
+    args = parser.parse_args()
+    server = make_server(args.port, args.latency_ms, args.video_bytes)
+    print(f"http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try: server.serve_forever()
+    except KeyboardInterrupt: sys.exit(0)
@@ -0,0 +1,273 @@
+# /ooc-simpleui/benchmarks/run.py
+"""Benchmark harness: times the app's hot paths on synthetic datasets, fully offline.
+
+For every (backend, size) pair a fresh worker process gets its own temporary directory (data file,
+SQLite database, caches, media store), a synthetic dataset (benchmarks/datagen.py) and the app imported
+with that backend. It then times:
+
+  load_data_cold / load_data_warm   whole-dataset load, with and without the dataset cache
+  save_data                          whole-dataset save
+  index_render                       GET / (first window rendered server-side)
+  save_roundtrip                     POST /save with the whole dataset (JSON body prepared beforehand)
+  import_roundtrip                   POST /import (merge) of the dataset file
+  politifact_details[_cached]        POST /get_politifact_details against the fixture server, cold / cached
+  video_flow[_stored]                POST /get_video_metadata -> POST /api/jobs/download -> poll until done,
+                                     for new videos / for videos already in the media store
+
+Politifact pages and videos come from benchmarks/fixtures.py (a local HTTP server); downloads use its
+FakeYtDlpEngine, or the real yt-dlp generic extractor against the same server with --engine real.
+Routes are called through Flask's test client, so HTTP server overhead is not part of the numbers.
+App logging below WARNING is disabled during runs.
+
+Results are written as JSON (benchmarks/results/<timestamp>-<commit>.json by default); pass an earlier
+file to --compare to see the change per benchmark (and --fail-on-regression to exit 1 on slowdowns).
+
+    python benchmarks/run.py                                  # 1k, 10k and 100k items, both backends
+    python benchmarks/run.py --sizes 1000 --backends json --compare benchmarks/results/<baseline>.json
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+ALL_BENCHMARKS = ['load_data_cold', 'load_data_warm', 'save_data', 'index_render', 'save_roundtrip', 'import_roundtrip',
+                  'politifact_details', 'politifact_details_cached', 'video_flow', 'video_flow_stored']
+JOB_POLL_SECONDS = 0.005
+
+
+# --- Worker (one backend/size, in its own process and directory) ---
+def time_runs(func, repeat, budget_seconds, setup=None):
+    """Calls func() up to `repeat` times (at least once, fewer if budget_seconds is used up). Returns durations."""
+    durations = []
+    for _ in range(repeat):
+        if setup: setup()
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+        if sum(durations) >= budget_seconds: break
+    return durations
+
+
+def run_worker(options):
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, BENCHMARKS_DIR)
+    import datagen
+    import fixtures
+
+    workdir = tempfile.mkdtemp(prefix='ooc-bench-')
+    os.chdir(workdir)
+    os.environ['OOC_STORAGE_BACKEND'] = options.backend
+    os.environ.setdefault('OOC_SECRET_KEY', 'benchmark')
+    try:
+        items = datagen.write_dataset('dataset.json', options.size, seed=options.seed)
+        if options.backend == 'json': shutil.copy('dataset.json', 'data.json')
+        import app
+        logging.disable(logging.INFO)
+        if options.backend == 'sqlite': app.get_storage().save_all(items)
+        del items
+        if options.engine == 'fake': app.yt_dlp_engine = fixtures.FakeYtDlpEngine(download_error=app.YtDlpDownloadError)
+        client = app.app.test_client()
+        storage = app.get_storage()
+        results = {}
+
+        def record(name, durations, **extra):
+            results[name] = {"runs": durations, **extra}
+
+        def selected(name):
+            return name in options.benchmarks
+
+        def expect(response, status):
+            if response.status_code != status:
+                raise RuntimeError(f"{response.request.method} {response.request.path} returned {response.status_code}: {response.data[:300]!r}")
+            return response
+
+        if selected('load_data_cold'):
+            record('load_data_cold', time_runs(app.load_data, options.repeat, options.budget, setup=storage.cache.invalidate))
+        if selected('load_data_warm'):
+            app.load_data()
+            record('load_data_warm', time_runs(app.load_data, options.repeat, options.budget))
+        if selected('save_data'):
+            pending = []
+            record('save_data', time_runs(lambda: app.save_data(pending.pop(), renumber_ids=False), options.repeat, options.budget,
+                                          setup=lambda: pending.append([dict(item) for item in app.load_data()])),
+                   payload_bytes=os.path.getsize('data.json') if options.backend == 'json' else None)
+        if selected('index_render'):
+            record('index_render', time_runs(lambda: expect(client.get('/'), 200), options.repeat, options.budget))
+        if selected('save_roundtrip'):
+            body = json.dumps(app.load_data()).encode('utf-8')
+            record('save_roundtrip', time_runs(lambda: expect(client.post('/save', data=body, content_type='application/json'), 200),
+                                               options.repeat, options.budget), request_bytes=len(body))
+        if selected('import_roundtrip'):
+            with open('dataset.json', 'rb') as f: upload = f.read()
+            def import_once():
+                form = {'jsonfile': (io.BytesIO(upload), 'dataset.json'), 'mode': 'merge'}
+                expect(client.post('/import', data=form, content_type='multipart/form-data'), 302)
+            record('import_roundtrip', time_runs(import_once, options.repeat, options.budget), request_bytes=len(upload))
+
+        # Network flows: every run uses fresh fixture URLs, so "cold" really fetches and downloads
+        page_urls = [f"{options.base_url}/factchecks/{options.size + n}/" for n in range(options.flows)]
+        if selected('politifact_details'):
+            urls = iter(page_urls)
+            record('politifact_details', time_runs(
+                lambda: expect(client.post('/get_politifact_details', json={'url': next(urls)}), 200), options.flows, float('inf')))
+        if selected('politifact_details_cached'):
+            for url in page_urls: client.post('/get_politifact_details', json={'url': url})
+            urls = iter(page_urls)
+            record('politifact_details_cached', time_runs(
+                lambda: expect(client.post('/get_politifact_details', json={'url': next(urls)}), 200), options.flows, float('inf')))
+
+        video_urls = [f"{options.base_url}/videos/{options.size + n}.mp4" for n in range(options.flows)]
+        def video_flow(url, item_id):
+            metadata = expect(client.post('/get_video_metadata', json={'url': url}), 200).get_json()
+            if not metadata.get('success'): raise RuntimeError(f"Metadata failed for {url}: {metadata}")
+            job = expect(client.post('/api/jobs/download', json={'url': url, 'id': item_id}), 202).get_json()
+            while job['status'] not in ('succeeded', 'failed'):
+                time.sleep(JOB_POLL_SECONDS)
+                job = expect(client.get(f"/api/jobs/{job['id']}"), 200).get_json()
+            if job['status'] != 'succeeded' or not job['result']['success']: raise RuntimeError(f"Download failed for {url}: {job}")
+        for name, urls in (('video_flow', video_urls), ('video_flow_stored', video_urls)):
+            if not selected(name): continue
+            if name == 'video_flow_stored' and not selected('video_flow'):
+                for item_id, url in enumerate(urls): video_flow(url, item_id)
+            flows = iter([(url, item_id) for item_id, url in enumerate(urls)])
+            record(name, time_runs(lambda: video_flow(*next(flows)), options.flows, float('inf')),
+                   video_bytes=options.video_bytes)
+        return results
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# --- Orchestration ---
+def summarize(durations):
+    return {"median": statistics.median(durations), "min": min(durations), "max": max(durations),
+            "mean": statistics.fmean(durations), "count": len(durations)}
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def start_fixture_server(options):
+    process = subprocess.Popen([sys.executable, os.path.join(BENCHMARKS_DIR, 'fixtures.py'), '--latency-ms', str(options.latency_ms),
+                                '--video-bytes', str(options.video_bytes)], stdout=subprocess.PIPE, text=True)
+    return process, process.stdout.readline().strip()
+
+
+def run_config(options, backend, size, base_url):
+    """Runs one worker process; returns its {benchmark: {...}} results."""
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--backend', backend, '--size', str(size),
+               '--base-url', base_url, '--repeat', str(options.repeat), '--budget', str(options.budget),
+               '--flows', str(options.flows), '--engine', options.engine, '--seed', str(options.seed),
+               '--video-bytes', str(options.video_bytes), '--benchmarks', ','.join(options.benchmarks)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Worker for {backend}/{size} failed:\n{completed.stderr[-3000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(baseline, current, threshold):
+    """Prints the change of every benchmark's median against the baseline. Returns the regressions."""
+    baseline_rows = {(row['backend'], row['size'], row['benchmark']): row for row in baseline['results']}
+    regressions = []
+    print(f"\nCompared with {baseline['meta']['commit']} ({baseline['meta']['timestamp']}):")
+    for row in current['results']:
+        base = baseline_rows.get((row['backend'], row['size'], row['benchmark']))
+        if base is None: continue
+        old, new = base['median'], row['median']
+        change = (new - old) / old if old else 0.0
+        # Sub-millisecond differences are noise, whatever the ratio
+        regressed = change > threshold and new - old > 0.001
+        if regressed: regressions.append(row)
+        print(f"  {row['benchmark']:<28}{row['backend']:<8}{row['size']:>8}  {old * 1000:10.2f} ms -> {new * 1000:10.2f} ms"
+              f"  {change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite for ooc-simpleui.')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Comma-separated dataset sizes')
+    parser.add_argument('--backends', default='json,sqlite')
+    parser.add_argument('--benchmarks', default=','.join(ALL_BENCHMARKS), help='Comma-separated subset of: ' + ', '.join(ALL_BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per dataset benchmark')
+    parser.add_argument('--budget', type=float, default=60.0, help='Stop repeating a benchmark after this many seconds (one run minimum)')
+    parser.add_argument('--flows', type=int, default=20, help='Politifact fetches / video flows per configuration')
+    parser.add_argument('--engine', choices=('fake', 'real'), default='fake', help='FakeYtDlpEngine, or real yt-dlp against the fixture server')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated network latency of the fixture server')
+    parser.add_argument('--video-bytes', type=int, default=2_000_000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative slowdown of a median counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    # Internal: run one configuration and print its results
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--backend', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+    options.benchmarks = [name for name in options.benchmarks.split(',') if name]
+    unknown = sorted(set(options.benchmarks) - set(ALL_BENCHMARKS))
+    if unknown: parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    if options.worker:
+        print(json.dumps(run_worker(options)))
+        return 0
+
+    server, base_url = start_fixture_server(options)
+    results = []
+    try:
+        for size in (int(size) for size in options.sizes.split(',')):
+            for backend in options.backends.split(','):
+                started = time.perf_counter()
+                print(f"{backend} backend, {size} items...", flush=True)
+                for name, entry in run_config(options, backend, size, base_url).items():
+                    row = {"benchmark": name, "backend": backend, "size": size, **summarize(entry.pop('runs')), **entry}
+                    results.append(row)
+                    print(f"  {name:<28}median {row['median'] * 1000:10.2f} ms   min {row['min'] * 1000:10.2f} ms   ({row['count']} runs)")
+                print(f"  ({time.perf_counter() - started:.1f} s)")
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "meta": {
+            "commit": git_revision(), "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "options": {key: getattr(options, key) for key in ('sizes', 'backends', 'benchmarks', 'repeat', 'budget', 'flows',
+                                                               'engine', 'latency_ms', 'video_bytes', 'seed')},
+        },
+        "results": results,
+    }
+    output = options.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f: json.dump(report, f, indent=2)
+    print(f"\nResults written to '{output}'.")
+
+    if options.compare:
+        with open(options.compare, 'r', encoding='utf-8') as f: baseline = json.load(f)
+        regressions = compare(baseline, report, options.threshold)
+        if regressions and options.fail_on_regression:
+            print(f"{len(regressions)} regression(s) above {options.threshold:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
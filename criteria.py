@@ -0,0 +1,19 @@
+# /ooc-simpleui/criteria.py
+"""Annotation criteria keys: the item schema's checklist fields, shared by app.py and benchmarks/datagen.py."""
+
+# +++ Evidence Checklist Criteria Keys (for default setting) +++
+EVIDENCE_CRITERIA_KEYS = [
+    'author_expertise', 'source_reputation', 'neutrality_fairness',
+    'fact_vs_opinion', 'purpose', 'definitive_proof', 'direct_connection',
+    'source_transparency', 'evidence_integrity', 'fact_verifiability',
+    'clarity_relevance'
+]
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# +++ OOC Checklist Criteria Keys (stored as 'ooc_<key>' on each item) +++
+OOC_CRITERIA_KEYS = [
+    'temporal_misattribution', 'geographical_misattribution', 'person_misidentification',
+    'contextual_misrepresentation', 'exaggeration_scale', 'exaggeration_urgency',
+    'fabricated_consequences', 'misleading_intent', 'misleading_emotional_framing',
+    'causal_misattribution'
+]
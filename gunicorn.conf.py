@@ -0,0 +1,18 @@
+# /ooc-simpleui/gunicorn.conf.py
+# Multi-process deployment: gunicorn -c gunicorn.conf.py app:app
+# Worker processes share the dataset through the storage backend (flock-serialized JSON file, or SQLite in
+# WAL mode), item writes are checked against per-item versions, and background job status is mirrored to
+# cache/jobs/, so any worker can answer for any job. Job concurrency limits (DOWNLOAD_WORKERS, ...) apply per worker.
+import multiprocessing
+import os
+
+bind = os.environ.get('OOC_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('OOC_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# Threads per worker: SSE job streams and media downloads hold a thread each while open
+worker_class = 'gthread'
+threads = int(os.environ.get('OOC_THREADS', 8))
+timeout = 120 # Imports and exports stream, so no single request should block a worker this long
+graceful_timeout = 30
+# Each worker imports the app itself: thread pools, SQLite connections and caches are never shared across fork()
+preload_app = False
+accesslog = '-'
@@ -4,8 +4,19 @@ document.addEventListener('DOMContentLoaded', () => {
     const dataContainer = document.getElementById('data-container');
     const addEntryBtn = document.getElementById('add-entry-btn');
     const saveAllBtn = document.getElementById('save-all-btn');
+    const loadMoreSentinel = document.getElementById('load-more-sentinel');
     const MAX_DURATION_DISPLAY = 600; // 10 minutes in seconds for frontend check reinforcement
 
+    // --- Lazy Loading State ---
+    // Only the first window is rendered by the server; the rest is fetched from /api/items on scroll.
+    let nextCursor = loadMoreSentinel.dataset.nextCursor; // '' when everything is loaded
+    let nextEntryIndex = dataContainer.querySelectorAll('.entry-group').length; // Page-wide index for field names
+    let loadingMore = null; // In-flight window request (Promise), if any
+
+    // --- Dirty Tracking State ---
+    // Each entry keeps a snapshot of its last saved values; "Save Changes" PATCHes only the fields that differ.
+    const entrySnapshots = new WeakMap();
+
     // --- Data Definitions ---
 
     // +++ OOC Checklist Criteria Definition +++
@@ -42,18 +53,34 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // --- Helper Functions ---
 
-    function calculateNextId() {
-       const entries = dataContainer.querySelectorAll('.entry-group');
-       if (entries.length === 0) return 0;
-       let maxId = -1;
-       entries.forEach(entry => {
-           const idInput = entry.querySelector('.card-header input[name$="[id]"]');
-           if (idInput) {
-               const id = parseInt(idInput.value, 10);
-               if (!isNaN(id) && id > maxId) maxId = id;
-           }
-       });
-       return maxId + 1;
+    function getEntryId(entryElement) {
+        const idInput = entryElement.querySelector('.card-header input[name$="[id]"]');
+        return parseInt(idInput?.value ?? '', 10);
+    }
+
+    // If-Match header with the item version the entry's edits are based on (rejected with 409 if stale)
+    function versionHeaders(entryElement) {
+        return entryElement.dataset.version ? { 'If-Match': `"${entryElement.dataset.version}"` } : {};
+    }
+
+    function markEntryDirty(entryElement) {
+        if (entryElement) entryElement.dataset.dirty = 'true';
+    }
+
+    function snapshotEntry(entryElement) {
+        entrySnapshots.set(entryElement, collectEntryData(entryElement));
+        delete entryElement.dataset.dirty;
+    }
+
+    // Returns only the fields whose values differ from the entry's last saved snapshot
+    function diffEntry(entryElement) {
+        const current = collectEntryData(entryElement);
+        const snapshot = entrySnapshots.get(entryElement) || {};
+        const diff = {};
+        Object.keys(current).forEach(key => {
+            if (key !== 'id' && JSON.stringify(current[key]) !== JSON.stringify(snapshot[key])) diff[key] = current[key];
+        });
+        return diff;
     }
 
 
@@ -109,7 +136,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
 
     function createEntryHtml(id) {
-        const entryIndex = dataContainer.children.length;
+        const entryIndex = nextEntryIndex++;
         // Note: politifact_headline and politifact_subheadline inputs are NOT readonly initially here
         return `
             <div class="card mb-4 entry-group" data-entry-index="${entryIndex}">
@@ -180,6 +207,7 @@ document.addEventListener('DOMContentLoaded', () => {
                                  <label class="form-label"><i class="bi bi-folder2-open"></i> Drive Path:</label>
                                  <input type="text" name="data[${entryIndex}][drive_path]" value="" class="form-control" readonly>
                             </div>
+                            <div class="mb-3 media-preview d-none"></div>
                         </div>
                     </div> <!-- End row g-3 -->
 
@@ -239,6 +267,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     function attachListenersToEntry(entryElement) {
+        snapshotEntry(entryElement); // Baseline for dirty tracking
         // Existing listeners
         const socialLinkInput = entryElement.querySelector('.social-link-input');
         if (socialLinkInput && socialLinkInput.value) {
@@ -353,6 +382,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 const data = await response.json();
                 headlineInput.value = data.headline || '';
                 subheadlineInput.value = data.subheadline || '';
+                markEntryDirty(entryGroup);
                 headlineInput.readOnly = true;
                 subheadlineInput.readOnly = true;
             }
@@ -388,6 +418,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
         const url = socialUrlInput.value.trim();
         const id = idInput.value;
+        markEntryDirty(entryGroup); // Download fields are filled programmatically below
 
         messageTextarea.value = "";
         pathInput.value = "";
@@ -447,21 +478,31 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        button.innerHTML = '<span class="spinner-border spinner-border-sm" aria-hidden="true"></span> Downloading...';
+        button.innerHTML = '<span class="spinner-border spinner-border-sm" aria-hidden="true"></span> Queued...';
 
         try {
-            const downloadResponse = await fetch('/download_video', {
+            // The download runs as a background job on the server; progress arrives over SSE
+            const jobResponse = await fetch('/api/jobs/download', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ url: url, id: id }),
             });
-            const downloadResult = await downloadResponse.json();
+            const job = await jobResponse.json();
+            if (!jobResponse.ok) {
+                throw new Error(job.error || `Server error: ${jobResponse.status} ${jobResponse.statusText}`);
+            }
+            messageTextarea.value = `${messageTextarea.value}\nDownload queued (job ${job.id}).`;
+
+            const finishedJob = await followJob(job.id, (update) => {
+                if (update.status === 'running') {
+                    const percent = update.progress !== null && update.progress !== undefined ? ` ${update.progress.toFixed(0)}%` : '';
+                    button.innerHTML = `<span class="spinner-border spinner-border-sm" aria-hidden="true"></span> Downloading...${percent}`;
+                }
+            });
+            const downloadResult = finishedJob.result || {};
 
-             if (!downloadResponse.ok || !downloadResult.success) {
-                  let errorMsg = "Unknown download error";
-                  if (downloadResult.error) errorMsg = downloadResult.error;
-                  else if (downloadResult.message) errorMsg = downloadResult.message;
-                  else if (!downloadResponse.ok) errorMsg = `Server error: ${downloadResponse.status} ${downloadResponse.statusText}`;
+             if (finishedJob.status !== 'succeeded' || !downloadResult.success) {
+                  const errorMsg = downloadResult.message || finishedJob.message || "Unknown download error";
                   messageTextarea.value = `Download Error: ${errorMsg}`;
                   successInput.value = "false";
                   pathInput.value = "";
@@ -469,8 +510,12 @@ document.addEventListener('DOMContentLoaded', () => {
                 messageTextarea.value = downloadResult.message || "Download successful.";
                 pathInput.value = downloadResult.drive_path || "";
                 successInput.value = "true";
+                showMediaPreview(entryGroup, downloadResult.media_key);
             }
             updateMessageFieldStyle(messageTextarea, successInput);
+            // The job already stored the download fields on the server (as a new version of the item)
+            markFieldsSaved(entryGroup, ['download_success', 'download_message', 'drive_path']);
+            if (downloadResult.version) entryGroup.dataset.version = downloadResult.version;
 
         } catch (error) {
             console.error('Download error:', error);
@@ -485,108 +530,293 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
 
-    function collectDataFromForm() {
-        const entries = [];
-        const entryElements = dataContainer.querySelectorAll('.entry-group');
-
-        entryElements.forEach((entryElement, entryIndex) => { // Use index for ID assignment later
-             const idInput = entryElement.querySelector('.card-header input[name$="[id]"]');
-             const socialDurationValue = entryElement.querySelector(`input[name$="[social_duration]"]`)?.value;
-
-             // Base entry data
-             const entryData = {
-                id: parseInt(idInput?.value ?? '-1', 10), // Placeholder, overwritten later
-                politifact_url: entryElement.querySelector(`.politifact-url-input`)?.value ?? '',
-                politifact_headline: entryElement.querySelector(`.politifact-headline-input`)?.value ?? '',
-                politifact_subheadline: entryElement.querySelector(`.politifact-subheadline-input`)?.value ?? '',
-                rating: entryElement.querySelector(`input[name$="[rating]"]:checked`)?.value ?? '',
-                social_link: entryElement.querySelector(`.social-link-input`)?.value ?? '',
-                social_platform: entryElement.querySelector(`input[name$="[social_platform]"]`)?.value ?? '',
-                social_duration: parseFloat(socialDurationValue ?? '0'),
-                social_text: entryElement.querySelector(`textarea[name$="[social_text]"]`)?.value ?? '',
-                external_links_info: [], // Will be populated below
-                download_success: entryElement.querySelector(`input[name$="[download_success]"]`)?.value === 'true',
-                download_message: entryElement.querySelector(`.download-message-field`)?.value ?? '',
-                drive_path: entryElement.querySelector(`input[name$="[drive_path]"]`)?.value ?? '',
-             };
-
-             // Collect OOC Checklist Data
-             oocCriteria.forEach(criterion => {
-                 const checkbox = entryElement.querySelector(`input[name="data[${entryIndex}][ooc_${criterion.key}]"]`);
-                 entryData[`ooc_${criterion.key}`] = checkbox ? checkbox.checked : false;
-             });
-
-             if (isNaN(entryData.id)) entryData.id = -1;
-             if (isNaN(entryData.social_duration)) entryData.social_duration = 0.0;
-
-            // Collect external links and their checklists
-            const linkPairs = entryElement.querySelectorAll('.external-links-container .external-link-pair');
-            linkPairs.forEach((linkPairElement, linkIndex) => { // Use linkIndex here
-                 const urlInput = linkPairElement.querySelector(`input[name$="[url]"]`);
-                 const descInput = linkPairElement.querySelector(`input[name$="[description]"]`);
-
-                 if (urlInput && descInput && urlInput.value.trim()) {
-                     const linkData = {
-                         url: urlInput.value.trim(),
-                         description: descInput.value.trim() || '',
-                         checklist: {} // Prepare checklist object for this link
-                     };
-
-                     // Collect evidence checklist data for this specific link
-                     evidenceCriteria.forEach(criterion => {
-                          const checklistCheckbox = linkPairElement.querySelector(`input[name$="[checklist][${criterion.key}]"]`);
-                          linkData.checklist[criterion.key] = checklistCheckbox ? checklistCheckbox.checked : false;
-                     });
-
-                     entryData.external_links_info.push(linkData);
-                 }
-            });
-            entries.push(entryData);
+    // Shows the inline player (poster + preview proxy) for an entry's stored video
+    function showMediaPreview(entryElement, mediaKey) {
+        const container = entryElement.querySelector('.media-preview');
+        if (!container || !mediaKey) return;
+        const base = `/media/${encodeURIComponent(mediaKey)}`;
+        container.innerHTML = `<video class="w-100 rounded" controls preload="none" poster="${base}/poster" src="${base}/preview"></video>`;
+        container.classList.remove('d-none');
+    }
+
+
+    // Marks fields the server already persisted (e.g. by a download job) as saved in the entry's snapshot
+    function markFieldsSaved(entryElement, fieldNames) {
+        const snapshot = entrySnapshots.get(entryElement);
+        if (!snapshot) return;
+        const current = collectEntryData(entryElement);
+        fieldNames.forEach(name => { snapshot[name] = current[name]; });
+    }
+
+    // Follows a background job until it finishes: Server-Sent Events, falling back to polling.
+    // onUpdate(job) is called for every status/progress change. Resolves to the finished job.
+    function followJob(jobId, onUpdate) {
+        const isDone = (job) => job.status === 'succeeded' || job.status === 'failed';
+        const poll = async (resolve, reject) => {
+            try {
+                const response = await fetch(`/api/jobs/${jobId}`);
+                const job = await response.json();
+                if (!response.ok) throw new Error(job.error || `Server error: ${response.status}`);
+                onUpdate(job);
+                if (isDone(job)) resolve(job);
+                else setTimeout(() => poll(resolve, reject), 2000);
+            } catch (error) {
+                reject(error);
+            }
+        };
+        return new Promise((resolve, reject) => {
+            if (!('EventSource' in window)) { poll(resolve, reject); return; }
+            const source = new EventSource(`/api/jobs/${jobId}/events`);
+            source.onmessage = (event) => {
+                const job = JSON.parse(event.data);
+                onUpdate(job);
+                if (isDone(job)) {
+                    source.close();
+                    resolve(job);
+                }
+            };
+            source.onerror = () => {
+                source.close();
+                poll(resolve, reject); // Stream dropped: continue by polling
+            };
         });
+    }
+
+    function collectEntryData(entryElement) {
+         const idInput = entryElement.querySelector('.card-header input[name$="[id]"]');
+         const socialDurationValue = entryElement.querySelector(`input[name$="[social_duration]"]`)?.value;
+
+         // Base entry data
+         const entryData = {
+            id: parseInt(idInput?.value ?? '-1', 10),
+            politifact_url: entryElement.querySelector(`.politifact-url-input`)?.value ?? '',
+            politifact_headline: entryElement.querySelector(`.politifact-headline-input`)?.value ?? '',
+            politifact_subheadline: entryElement.querySelector(`.politifact-subheadline-input`)?.value ?? '',
+            rating: entryElement.querySelector(`input[name$="[rating]"]:checked`)?.value ?? '',
+            social_link: entryElement.querySelector(`.social-link-input`)?.value ?? '',
+            social_platform: entryElement.querySelector(`input[name$="[social_platform]"]`)?.value ?? '',
+            social_duration: parseFloat(socialDurationValue ?? '0'),
+            social_text: entryElement.querySelector(`textarea[name$="[social_text]"]`)?.value ?? '',
+            external_links_info: [], // Will be populated below
+            download_success: entryElement.querySelector(`input[name$="[download_success]"]`)?.value === 'true',
+            download_message: entryElement.querySelector(`.download-message-field`)?.value ?? '',
+            drive_path: entryElement.querySelector(`input[name$="[drive_path]"]`)?.value ?? '',
+         };
+
+         // Collect OOC Checklist Data
+         oocCriteria.forEach(criterion => {
+             const checkbox = entryElement.querySelector(`input[name$="[ooc_${criterion.key}]"]`);
+             entryData[`ooc_${criterion.key}`] = checkbox ? checkbox.checked : false;
+         });
+
+         if (isNaN(entryData.id)) entryData.id = -1;
+         if (isNaN(entryData.social_duration)) entryData.social_duration = 0.0;
+
+        // Collect external links and their checklists
+        const linkPairs = entryElement.querySelectorAll('.external-links-container .external-link-pair');
+        linkPairs.forEach((linkPairElement) => {
+             const urlInput = linkPairElement.querySelector(`input[name$="[url]"]`);
+             const descInput = linkPairElement.querySelector(`input[name$="[description]"]`);
+
+             if (urlInput && descInput && urlInput.value.trim()) {
+                 const linkData = {
+                     url: urlInput.value.trim(),
+                     description: descInput.value.trim() || '',
+                     checklist: {} // Prepare checklist object for this link
+                 };
+
+                 // Collect evidence checklist data for this specific link
+                 evidenceCriteria.forEach(criterion => {
+                      const checklistCheckbox = linkPairElement.querySelector(`input[name$="[checklist][${criterion.key}]"]`);
+                      linkData.checklist[criterion.key] = checklistCheckbox ? checklistCheckbox.checked : false;
+                 });
+
+                 entryData.external_links_info.push(linkData);
+             }
+        });
+        return entryData;
+    }
+
+    // PATCHes the changed fields of one dirty entry. Resolves to true on success (or nothing to send).
+    async function saveEntry(entryElement) {
+        const diff = diffEntry(entryElement);
+        if (Object.keys(diff).length === 0) {
+            delete entryElement.dataset.dirty;
+            return true;
+        }
+        const response = await fetch(`/api/items/${getEntryId(entryElement)}`, {
+            method: 'PATCH', headers: { 'Content-Type': 'application/json', ...versionHeaders(entryElement) }, body: JSON.stringify(diff),
+        });
+        if (!response.ok) {
+            const errorData = await response.json().catch(() => ({ error: response.statusText }));
+            if (response.status === 409) {
+                // Someone else saved this entry first: keep the local edits, but don't overwrite theirs
+                throw new Error(`${errorData.error} Reload the page to see their changes, then re-apply yours.`);
+            }
+            throw new Error(errorData.error || 'Unknown server error');
+        }
+        const savedItem = await response.json();
+        entryElement.dataset.version = savedItem.version;
+        snapshotEntry(entryElement);
+        return true;
+    }
+
+    // --- Lazy Loading of Entry Windows ---
+    async function loadMoreEntries() {
+        if (!nextCursor) return;
+        if (loadingMore) return loadingMore; // Reuse the in-flight request
+        loadingMore = (async () => {
+            try {
+                const params = new URLSearchParams({ format: 'html', cursor: nextCursor, start_index: nextEntryIndex });
+                const response = await fetch(`/api/items?${params}`);
+                if (!response.ok) {
+                    const errorData = await response.json().catch(() => ({}));
+                    console.error(`Error loading entries: ${response.status} ${response.statusText}`, errorData);
+                    return;
+                }
+                const result = await response.json();
+                const template = document.createElement('template');
+                template.innerHTML = result.html;
+                const newEntries = [...template.content.querySelectorAll('.entry-group')];
+                // Loaded windows go before the sentinel; entries added with "Add New Entry" stay after it
+                loadMoreSentinel.before(template.content);
+                nextEntryIndex += result.count;
+                newEntries.forEach(entry => {
+                    attachListenersToEntry(entry);
+                    initializeTooltips(entry);
+                });
+                nextCursor = result.next_cursor === null ? '' : String(result.next_cursor);
+                if (!nextCursor) loadMoreSentinel.classList.add('d-none');
+            } catch (error) {
+                console.error('Network error loading entries:', error);
+            } finally {
+                loadingMore = null;
+            }
+        })();
+        return loadingMore;
+    }
+
+    if ('IntersectionObserver' in window) {
+        const observer = new IntersectionObserver((observedEntries) => {
+            if (observedEntries.some(entry => entry.isIntersecting)) loadMoreEntries();
+        }, { rootMargin: '800px 0px' });
+        observer.observe(loadMoreSentinel);
+    }
+
+    // --- Search ---
+    const searchForm = document.getElementById('search-form');
+    const searchResults = document.getElementById('search-results');
+    const searchResultsList = document.getElementById('search-results-list');
+    const searchSummary = document.getElementById('search-summary');
+
+    function findEntryById(id) {
+        return [...dataContainer.querySelectorAll('.entry-group')].find(entry => getEntryId(entry) === id);
+    }
 
-        // Re-assign sequential IDs before returning
-        entries.forEach((entry, index) => { entry.id = index; });
-        return entries;
+    // Loads windows until the entry is rendered (ids are in window order), then scrolls to it
+    async function revealEntry(id) {
+        let entry = findEntryById(id);
+        while (!entry && nextCursor) {
+            await loadMoreEntries();
+            entry = findEntryById(id);
+        }
+        if (!entry) return;
+        entry.scrollIntoView({ behavior: 'smooth', block: 'start' });
+        entry.classList.add('border-primary');
+        setTimeout(() => entry.classList.remove('border-primary'), 2000);
     }
 
+    searchForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+        const params = new URLSearchParams({ q: document.getElementById('search-query').value.trim() });
+        const rating = document.getElementById('search-rating').value.trim().toLowerCase();
+        const platform = document.getElementById('search-platform').value;
+        if (rating) params.set('rating', rating);
+        if (platform) params.set('platform', platform);
+        if (!params.get('q') && !rating && !platform) {
+            searchResults.classList.add('d-none');
+            return;
+        }
+        try {
+            const response = await fetch(`/api/search?${params}`);
+            const result = await response.json().catch(() => ({ error: response.statusText }));
+            if (!response.ok) {
+                alert(`Search error: ${result.error || 'Unknown server error'}`);
+                return;
+            }
+            searchSummary.textContent = `${result.total} matching entr${result.total === 1 ? 'y' : 'ies'}` +
+                (result.total > result.results.length ? ` (showing top ${result.results.length})` : '');
+            searchResultsList.replaceChildren(...result.results.map(hit => {
+                const link = document.createElement('button');
+                link.type = 'button';
+                link.className = 'list-group-item list-group-item-action';
+                const title = document.createElement('div');
+                title.className = 'fw-semibold';
+                title.textContent = `#${hit.id} ${hit.politifact_headline || '(no headline)'}`;
+                const details = document.createElement('small');
+                details.className = 'text-muted';
+                details.textContent = [hit.rating, hit.social_platform, hit.snippet].filter(Boolean).join(' \u00b7 ');
+                link.append(title, details);
+                link.addEventListener('click', () => revealEntry(hit.id));
+                return link;
+            }));
+            searchResults.classList.remove('d-none');
+        } catch (error) {
+            alert(`Network error searching: ${error.message}`);
+        }
+    });
+
     // --- Event Listeners Setup ---
 
-    addEntryBtn.addEventListener('click', () => {
-        const currentId = calculateNextId();
-        const newEntryHtml = createEntryHtml(currentId);
-        dataContainer.insertAdjacentHTML('beforeend', newEntryHtml);
-        const newEntryElement = dataContainer.lastElementChild;
-        const newIndex = Array.from(dataContainer.children).indexOf(newEntryElement);
-        newEntryElement.dataset.entryIndex = newIndex;
-        // Initialize tooltips for the newly added entry (specifically for its potential links later)
-        initializeTooltips(newEntryElement);
+    addEntryBtn.addEventListener('click', async () => {
+        // The server assigns the ID, so downloads (named after it) never collide with other entries
+        addEntryBtn.disabled = true;
+        try {
+            const response = await fetch('/api/items', {
+                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({}),
+            });
+            const result = await response.json().catch(() => ({ error: response.statusText }));
+            if (!response.ok) {
+                alert(`Error creating entry: ${result.error || 'Unknown server error'}`);
+                return;
+            }
+            const newEntryHtml = createEntryHtml(result.id);
+            dataContainer.insertAdjacentHTML('beforeend', newEntryHtml);
+            const newEntryElement = dataContainer.lastElementChild;
+            newEntryElement.dataset.version = result.version;
+            snapshotEntry(newEntryElement);
+            // Initialize tooltips for the newly added entry (specifically for its potential links later)
+            initializeTooltips(newEntryElement);
+        } catch (error) {
+            alert(`Network error creating entry: ${error.message}`);
+        } finally {
+            addEntryBtn.disabled = false;
+        }
     });
 
     saveAllBtn.addEventListener('click', async (event) => {
         event.preventDefault();
-        const dataToSave = collectDataFromForm();
+        const dirtyEntries = [...dataContainer.querySelectorAll('.entry-group[data-dirty="true"]')];
+        if (dirtyEntries.length === 0) {
+            alert('No unsaved changes.');
+            return;
+        }
         saveAllBtn.disabled = true;
         saveAllBtn.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Saving...';
         try {
-            const response = await fetch('/save', {
-                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(dataToSave),
-            });
-            if (response.ok) {
-                 alert('Data saved successfully!');
-                 // Consider reloading to see saved state cleanly, esp. with complex nested data
-                 // location.reload();
+            const results = await Promise.allSettled(dirtyEntries.map(entry => saveEntry(entry)));
+            const failures = results.filter(result => result.status === 'rejected');
+            if (failures.length === 0) {
+                 alert(`Saved ${dirtyEntries.length} changed entr${dirtyEntries.length === 1 ? 'y' : 'ies'}.`);
             }
             else {
-                 const errorData = await response.json().catch(() => ({ error: response.statusText }));
-                 alert(`Error saving data: ${errorData.error || 'Unknown server error'}`);
+                 failures.forEach(failure => console.error("Save error:", failure.reason));
+                 alert(`Error saving ${failures.length} of ${dirtyEntries.length} entries: ${failures[0].reason.message}`);
             }
-        } catch (error) {
-             alert(`Network error during save: ${error.message}`);
-             console.error("Save error:", error);
         }
         finally {
              saveAllBtn.disabled = false;
-             saveAllBtn.innerHTML = '<i class="bi bi-save"></i> Save All Data';
+             saveAllBtn.innerHTML = '<i class="bi bi-save"></i> Save Changes';
         }
     });
 
@@ -608,6 +838,7 @@ document.addEventListener('DOMContentLoaded', () => {
                         if(instance) instance.dispose();
                     });
                  }
+                markEntryDirty(linkPair.closest('.entry-group'));
                 linkPair.remove();
                  // Optional: Re-index data-link-index attributes if needed
             }
@@ -624,6 +855,7 @@ document.addEventListener('DOMContentLoaded', () => {
              const linkIndex = linksContainer.querySelectorAll('.external-link-pair').length;
 
              if (!isNaN(entryIndex)) {
+                 markEntryDirty(entryGroup);
                  const newLinkHtml = createExternalLinkHtml(entryIndex, linkIndex);
                  linksContainer.insertAdjacentHTML('beforeend', newLinkHtml);
                  // Initialize tooltips for the *newly added* link only
@@ -645,28 +877,79 @@ document.addEventListener('DOMContentLoaded', () => {
         // Remove Entry Button
         const removeEntryBtn = event.target.closest('.remove-entry-btn');
          if (removeEntryBtn) {
-             if (confirm('Are you sure you want to remove this entire entry?')) {
+             if (confirm('Are you sure you want to remove this entire entry? This is saved immediately.')) {
                  const entryToRemove = removeEntryBtn.closest('.entry-group');
-                 // Dispose any tooltips within the entry before removing
-                 entryToRemove.querySelectorAll('[data-bs-toggle="tooltip"]').forEach(el => {
-                    const instance = bootstrap.Tooltip.getInstance(el);
-                    if(instance) instance.dispose();
-                 });
-                 entryToRemove.remove();
-                 // Optional: Renumber remaining entries' data-entry-index
+                 removeEntry(entryToRemove);
              }
               return; // Handled
          }
     });
 
+    async function removeEntry(entryToRemove) {
+        try {
+            const response = await fetch(`/api/items/${getEntryId(entryToRemove)}`, { method: 'DELETE', headers: versionHeaders(entryToRemove) });
+            if (!response.ok && response.status !== 404) { // 404: already gone on the server
+                const errorData = await response.json().catch(() => ({ error: response.statusText }));
+                alert(`Error removing entry: ${errorData.error || 'Unknown server error'}`);
+                return;
+            }
+        } catch (error) {
+            alert(`Network error removing entry: ${error.message}`);
+            return;
+        }
+        // Dispose any tooltips within the entry before removing
+        entryToRemove.querySelectorAll('[data-bs-toggle="tooltip"]').forEach(el => {
+           const instance = bootstrap.Tooltip.getInstance(el);
+           if(instance) instance.dispose();
+        });
+        entryToRemove.remove();
+    }
+
+    // --- Import (background job) ---
+    // The upload goes to /api/import, which imports it as a task job; progress arrives like download progress.
+    const importForm = document.getElementById('import-form');
+    const importStatus = document.getElementById('import-status');
+
+    function showImportStatus(level, text) {
+        importStatus.className = `alert alert-${level} mt-3 mb-0`;
+        importStatus.textContent = text;
+    }
+
+    importForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+        const button = importForm.querySelector('button[type="submit"]');
+        button.disabled = true;
+        showImportStatus('info', 'Uploading...');
+        try {
+            const response = await fetch('/api/import', { method: 'POST', body: new FormData(importForm) });
+            const job = await response.json();
+            if (!response.ok) throw new Error(job.error || `Server error: ${response.status} ${response.statusText}`);
+            showImportStatus('info', `Import queued (job ${job.id}).`);
+
+            const finishedJob = await followJob(job.id, (update) => showImportStatus('info', update.message));
+            const result = finishedJob.result || {};
+            const lines = [finishedJob.status === 'succeeded' ? finishedJob.message : `Import error: ${finishedJob.message}`];
+            (result.errors || []).slice(0, 5).forEach(error => lines.push(`Skipped: ${error}`));
+            if (result.created || result.updated || result.removed) lines.push('Reload the page to see the imported entries.');
+            showImportStatus(finishedJob.status !== 'succeeded' ? 'danger' : (result.skipped ? 'warning' : 'success'), lines.join('\n'));
+        } catch (error) {
+            console.error('Import error:', error);
+            showImportStatus('danger', `Import error: ${error.message}`);
+        } finally {
+            button.disabled = false;
+        }
+    });
+
     // Event Delegation for Input/Change Events
     dataContainer.addEventListener('input', (event) => {
+        markEntryDirty(event.target.closest('.entry-group'));
         if (event.target.matches('.social-link-input')) {
              updateSocialPlatform(event.target);
         }
      });
 
      dataContainer.addEventListener('change', (event) => {
+         markEntryDirty(event.target.closest('.entry-group'));
          if (event.target.matches('.politifact-url-input')) {
              fetchPolitifactDetails(event.target);
          }
@@ -681,9 +964,8 @@ document.addEventListener('DOMContentLoaded', () => {
         console.log(`Tooltips initialized for ${tooltipTriggerList.length} elements within`, parentElement);
      }
 
-     // Initial setup for existing entries and tooltips
-     document.querySelectorAll('.entry-group').forEach((entry, index) => {
-          entry.dataset.entryIndex = index; // Ensure initial indices are set
+     // Initial setup for existing entries and tooltips (data-entry-index is set by the server)
+     document.querySelectorAll('.entry-group').forEach((entry) => {
           attachListenersToEntry(entry); // Attach other listeners
      });
      initializeTooltips(); // Initialize tooltips for the whole page on load
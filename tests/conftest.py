@@ -0,0 +1,68 @@
+# /ooc-simpleui/tests/conftest.py
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault('OOC_SECRET_KEY', 'test') # Keeps the first session from writing cache/secret_key into the repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as ooc # noqa: E402
+
+ooc.metrics_publisher._started = True # No background metrics thread writing into the test directories
+
+
+def make_item(item_id, **fields):
+    """A minimal item as the page would post it (normalize_item() fills in the rest)."""
+    return ooc.normalize_item({
+        'id': item_id, 'politifact_url': f'https://www.politifact.com/factchecks/{item_id}/', 'rating': 'false',
+        'social_link': f'https://x.com/user/status/{item_id}', 'social_platform': 'x',
+        'external_links_info': [{'url': f'https://apnews.com/{item_id}', 'description': f'Evidence {item_id}', 'checklist': {}}],
+        **fields,
+    })
+
+
+def wait_for_job(job_id, timeout=10):
+    """Blocks until a job of this process has finished. Returns its final snapshot."""
+    manager, job = ooc.find_job(job_id)
+    deadline = time.time() + timeout
+    while job["status"] not in ooc.JOB_TERMINAL_STATES:
+        assert time.time() < deadline, f"Job {job_id} did not finish: {job}"
+        job = manager.wait_for_change(job_id, job["revision"], timeout=deadline - time.time())
+    return job
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def storage(request, tmp_path, monkeypatch):
+    """A fresh, empty storage backend of each kind, installed as the app's storage, in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    backend = ooc.JsonStorage(str(tmp_path / 'data.json')) if request.param == 'json' else ooc.SqliteStorage(str(tmp_path / 'data.sqlite3'))
+    monkeypatch.setattr(ooc, '_storage', backend)
+    monkeypatch.setattr(ooc, 'STORAGE_BACKEND', request.param)
+    # The derived structures are module-level; versions of an earlier test's backend mean nothing here
+    monkeypatch.setattr(ooc.analytics_snapshot, 'version', None)
+    monkeypatch.setattr(ooc.search_index, 'version', None)
+    return backend
+
+
+@pytest.fixture
+def seeded(storage):
+    """Storage holding five items (IDs 0-4, all at version 1)."""
+    storage.save_all([make_item(i) for i in range(5)])
+    return storage
+
+
+@pytest.fixture
+def client(storage):
+    return ooc.app.test_client()
+
+
+@pytest.fixture
+def media_store(tmp_path, monkeypatch):
+    """An empty media store in a temporary directory, installed as the app's store (no posters/previews made)."""
+    root = tmp_path / 'media'
+    store = ooc.MediaStore(str(root), str(root / 'manifest.json'))
+    monkeypatch.setattr(ooc, 'media_store', store)
+    monkeypatch.setattr(ooc, 'schedule_media_derivatives', lambda key: None)
+    return store
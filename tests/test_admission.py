@@ -0,0 +1,100 @@
+# /ooc-simpleui/tests/test_admission.py
+"""The yt-dlp admission policy: platform, duration and filesize limits, and capped format selection."""
+import time
+
+import pytest
+
+from conftest import ooc
+
+MB = 1024 * 1024
+
+
+def test_check_url_platforms():
+    policy = ooc.AdmissionPolicy(allowed_platforms={'youtube', 'x'})
+    policy.check_url('https://youtu.be/abc')
+    policy.check_url('https://twitter.com/user/status/1')
+    with pytest.raises(ooc.VideoRejected, match=r"Platform 'tiktok' is not allowed \(allowed: x, youtube\)"):
+        policy.check_url('https://www.tiktok.com/@user/video/1')
+    with pytest.raises(ooc.VideoRejected, match="Platform 'unknown'"):
+        policy.check_url('not a url')
+    ooc.AdmissionPolicy().check_url('https://www.tiktok.com/@user/video/1') # None admits every platform
+
+
+def test_check_info_duration():
+    policy = ooc.AdmissionPolicy(max_duration=600)
+    assert policy.check_info({'duration': 600}) is None
+    assert policy.check_info({}) is None # Unknown duration: left to the download limits
+    with pytest.raises(ooc.VideoRejected, match=r"Video duration \(601.5s\) exceeds limit \(600s\)"):
+        policy.check_info({'duration': 601.5})
+
+
+def test_check_info_clips_long_videos_only_with_ffmpeg(monkeypatch):
+    policy = ooc.AdmissionPolicy(max_duration=600, clip_long_videos=True)
+    monkeypatch.setattr(ooc, 'FFMPEG_BINARY', None)
+    with pytest.raises(ooc.VideoRejected, match='exceeds limit'):
+        policy.check_info({'duration': 3600})
+    monkeypatch.setattr(ooc, 'FFMPEG_BINARY', '/usr/bin/ffmpeg')
+    assert policy.check_info({'duration': 3600}) == 600
+    assert policy.check_info({'duration': 60}) is None
+
+
+def test_check_info_filesize():
+    policy = ooc.AdmissionPolicy(max_filesize=500 * MB)
+    assert policy.check_info({'filesize': 500 * MB}) is None
+    with pytest.raises(ooc.VideoRejected, match=r"Video size \(600.0 MB\) exceeds limit \(500 MB\)"):
+        policy.check_info({'filesize': 600 * MB})
+    with pytest.raises(ooc.VideoRejected, match='Video size'):
+        policy.check_info({'filesize_approx': 501 * MB})
+    # A clipped download fetches only a section, so the full size says nothing about it
+    assert policy.filesize_problem({'filesize': 600 * MB, 'section_end': 600}) is None
+    assert ooc.AdmissionPolicy().check_info({'filesize': 10 ** 12, 'duration': 10 ** 6}) is None
+
+
+def test_format_selector_caps():
+    policy = ooc.AdmissionPolicy(max_filesize=500 * MB, max_height=1080)
+    size = f'[filesize<?{500 * MB}]'
+    assert policy.format_selector('bestvideo[ext=mp4]+bestaudio[ext=m4a]/best') == (
+        f'bestvideo[ext=mp4][height<=?1080]{size}+bestaudio[ext=m4a]{size}/best[height<=?1080]{size}')
+    assert policy.describe_caps() == '<= 1080p, <= 500 MB'
+    assert ooc.AdmissionPolicy(max_height=720).format_selector('bv+ba/b') == 'bv[height<=?720]+ba/b[height<=?720]'
+    assert ooc.AdmissionPolicy().format_selector('bestvideo+bestaudio/best') == 'bestvideo+bestaudio/best'
+    assert ooc.AdmissionPolicy().describe_caps() == 'no caps'
+
+
+def test_engine_rejects_before_fetching(monkeypatch):
+    policy = ooc.AdmissionPolicy(max_duration=600, allowed_platforms={'youtube'})
+    engine = ooc.YtDlpEngine({}, policy)
+    monkeypatch.setattr(engine, '_ydl', lambda: pytest.fail('yt-dlp was used for a rejected video'))
+    with pytest.raises(ooc.VideoRejected, match="Platform 'x'"):
+        engine.extract_info('https://x.com/user/status/1')
+    url = 'https://www.youtube.com/watch?v=long'
+    engine._info_cache[url] = (time.time(), {'duration': 3600}) # As left by the metadata request
+    with pytest.raises(ooc.VideoRejected, match='exceeds limit'):
+        engine.download(url, '%(id)s.%(ext)s')
+
+
+class FakeEngine:
+    def __init__(self, policy, info):
+        self.policy, self.info = policy, info
+
+    def extract_info(self, url):
+        self.policy.check_url(url)
+        return self.info
+
+
+def test_metadata_reports_rejections(monkeypatch):
+    policy = ooc.AdmissionPolicy(max_duration=600, allowed_platforms={'youtube'})
+    monkeypatch.setattr(ooc, 'admission_policy', policy)
+    monkeypatch.setattr(ooc, 'yt_dlp_engine', FakeEngine(policy, {'duration': 900, 'title': 'Long talk'}))
+    monkeypatch.setattr(ooc, 'FFMPEG_BINARY', None)
+
+    result = ooc.get_video_metadata_yt_dlp('https://x.com/user/status/1')
+    assert (result['success'], result['rejected']) == (False, True) and "Platform 'x'" in result['message']
+
+    result = ooc.get_video_metadata_yt_dlp('https://www.youtube.com/watch?v=long')
+    assert (result['success'], result['rejected'], result['duration'], result['social_text']) == (False, True, 900.0, 'Title: Long talk')
+
+    policy.clip_long_videos = True
+    monkeypatch.setattr(ooc, 'FFMPEG_BINARY', '/usr/bin/ffmpeg')
+    result = ooc.get_video_metadata_yt_dlp('https://www.youtube.com/watch?v=long')
+    assert result['success'] and result['clip_seconds'] == 600 and 'first 600s' in result['message']
@@ -0,0 +1,78 @@
+# /ooc-simpleui/tests/test_engine.py
+"""The in-process yt-dlp engine, with yt-dlp's extractor and downloader stubbed out (no network)."""
+import pytest
+
+from conftest import ooc
+
+pytest.importorskip('yt_dlp')
+
+URL = 'https://www.youtube.com/watch?v=abc123'
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """An engine whose YoutubeDL extracts a fixed info_dict and 'downloads' by writing a small file."""
+    calls = {'extract': [], 'download': []}
+
+    def extract_info(self, url, download=True):
+        calls['extract'].append(url)
+        video_id = url.rsplit('=', 1)[-1]
+        return {'id': video_id, 'extractor_key': 'Youtube', 'ext': 'mp4', 'title': f'Video {video_id}',
+                'description': 'A description.', 'duration': 42.0, 'webpage_url': url}
+
+    def process_ie_result(self, info, download=True):
+        path = self.prepare_filename(info) # Resolved with the instance's current output template
+        calls['download'].append(path)
+        with open(path, 'wb') as f: f.write(b'\0' * 1000)
+        return {**info, 'requested_downloads': [{'filepath': path}]}
+
+    monkeypatch.setattr(ooc.SharedCookiesYoutubeDL, 'extract_info', extract_info)
+    monkeypatch.setattr(ooc.SharedCookiesYoutubeDL, 'process_ie_result', process_ie_result)
+    engine = ooc.YtDlpEngine(ooc.YT_DLP_OPTIONS, ooc.AdmissionPolicy(max_duration=600))
+    jar = ooc.yt_dlp_cookies.YoutubeDLCookieJar()
+    monkeypatch.setattr(engine, '_cookies', lambda: (1, jar)) # No browser cookie database here
+    monkeypatch.setattr(ooc, 'yt_dlp_engine', engine)
+    monkeypatch.setattr(ooc, 'admission_policy', engine.policy)
+    engine.calls = calls
+    return engine
+
+
+def test_metadata_then_download_extracts_once(engine, media_store):
+    metadata = ooc.get_video_metadata_yt_dlp(URL)
+    assert metadata['success'] and metadata['duration'] == 42.0 and metadata['social_text'].startswith('Title: Video abc123')
+    result = ooc.download_video_yt_dlp(URL, 7)
+    assert result['success'] and result['media_key'] == 'youtube-abc123'
+    assert engine.calls['extract'] == [URL] # The download reused the metadata request's extraction
+    assert engine.calls['download'] == [media_store.output_template('youtube-abc123').replace('%(ext)s', 'mp4')]
+    assert media_store.lookup('youtube-abc123')['size'] == 1000
+
+    # Stored now: the same link needs neither an extraction nor a download
+    assert ooc.download_video_yt_dlp(URL, 8)['media_key'] == 'youtube-abc123'
+    assert len(engine.calls['extract']) == 1 and len(engine.calls['download']) == 1
+
+
+
+def test_same_video_under_another_link_is_not_downloaded_again(engine, media_store):
+    first = ooc.download_video_yt_dlp(URL, 1)
+    other_link = 'https://m.youtube.com/watch?v=abc123'
+    second = ooc.download_video_yt_dlp(other_link, 2)
+    assert second['success'] and second['drive_path'] == first['drive_path'] and second['message'].startswith('Already downloaded')
+    assert engine.calls['extract'] == [URL, other_link] and len(engine.calls['download']) == 1
+    # The extraction found the key; the link now maps to it directly
+    assert media_store.key_for_url(other_link) == 'youtube-abc123'
+    assert ooc.download_video_yt_dlp(other_link, 3)['media_key'] == 'youtube-abc123'
+    assert len(engine.calls['extract']) == 2
+
+def test_download_leaves_no_settings_on_the_warm_instance(engine, tmp_path, monkeypatch):
+    engine.policy.max_duration, engine.policy.clip_long_videos = 30, True
+    monkeypatch.setattr(ooc, 'FFMPEG_BINARY', '/usr/bin/ffmpeg') # Clipping needs ffmpeg
+    first = engine.download(URL, str(tmp_path / 'first-%(id)s.%(ext)s'))
+    ydl = engine._ydl()
+    assert first == str(tmp_path / 'first-abc123.mp4')
+    assert ydl.params['outtmpl']['default'] == engine.DEFAULT_OUTTMPL and 'download_ranges' not in ydl.params
+
+    engine.policy.max_duration = None
+    second = engine.download('https://www.youtube.com/watch?v=def456', str(tmp_path / 'second-%(id)s.%(ext)s'))
+    assert second == str(tmp_path / 'second-def456.mp4')
+    assert engine._ydl() is ydl # One warm instance per thread, reused
+    assert ydl.cookiejar is engine._cookies()[1]
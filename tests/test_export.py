@@ -0,0 +1,71 @@
+# /ooc-simpleui/tests/test_export.py
+"""Streamed exports (/api/export.<fmt>): JSONL, flattened CSV and Parquet."""
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import make_item, ooc
+
+
+@pytest.fixture
+def dataset(storage, monkeypatch):
+    """Five items, two of them downloaded with checked evidence, exported two items per page."""
+    monkeypatch.setattr(ooc, 'EXPORT_PAGE_SIZE', 2)
+    items = [make_item(i) for i in range(5)]
+    for item in items[1], items[3]:
+        item.update(download_success=True, ooc_misleading_intent=True, rating='true')
+        item['external_links_info'].append({'url': f"https://reuters.com/{item['id']}", 'description': 'Second',
+                                            'checklist': {'definitive_proof': True}})
+        item['external_links_info'][0]['checklist']['definitive_proof'] = True
+    storage.save_all(items)
+    return ooc.load_data()
+
+
+def test_export_jsonl(dataset, client):
+    response = client.get('/api/export.jsonl')
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="ooc_export.jsonl"'
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == dataset
+
+    compact = [json.loads(line) for line in client.get('/api/export.jsonl?compact=1&rating=true').get_data(as_text=True).splitlines()]
+    assert compact == [ooc.compact_item(item) for item in dataset if item['rating'] == 'true']
+
+
+def test_export_csv(dataset, client):
+    response = client.get('/api/export.csv')
+    assert response.status_code == 200 and response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert list(rows[0]) == ooc.EXPORT_CSV_COLUMNS
+    assert [row['id'] for row in rows] == ['0', '1', '2', '3', '4'] # One header, however many pages
+    assert (rows[1]['download_success'], rows[1]['ooc_misleading_intent'], rows[1]['evidence_links']) == ('True', 'True', '2')
+    assert rows[1]['evidence_link_urls'] == 'https://apnews.com/1 https://reuters.com/1'
+    assert (rows[1]['evidence_definitive_proof'], rows[1]['evidence_purpose'], rows[2]['evidence_definitive_proof']) == ('2', '0', '0')
+
+    filtered = client.get('/api/export.csv?download_success=true').get_data(as_text=True)
+    assert [row['id'] for row in csv.DictReader(io.StringIO(filtered))] == ['1', '3']
+    empty = client.get('/api/export.csv?rating=nonexistent').get_data(as_text=True)
+    assert empty.splitlines() == [','.join(ooc.EXPORT_CSV_COLUMNS)]
+
+
+def test_export_parquet(dataset, client):
+    pq = pytest.importorskip('pyarrow.parquet')
+    response = client.get('/api/export.parquet?platform=x')
+    assert response.status_code == 200 and response.mimetype == 'application/vnd.apache.parquet'
+    parquet = pq.ParquetFile(io.BytesIO(response.get_data()))
+    assert parquet.metadata.num_row_groups == 3 # One per export page
+    table = parquet.read()
+    assert table.schema == ooc.export_parquet_schema()
+    assert table.column('id').to_pylist() == [0, 1, 2, 3, 4]
+    assert table.column('evidence_definitive_proof').to_pylist() == [0, 2, 0, 2, 0]
+    links = table.column('external_links_info').to_pylist()
+    assert [link['url'] for link in links[3]] == ['https://apnews.com/3', 'https://reuters.com/3']
+    assert links[3][1]['checklist'] == {key: key == 'definitive_proof' for key in ooc.EVIDENCE_CRITERIA_KEYS}
+
+
+def test_export_errors(dataset, client, monkeypatch):
+    assert client.get('/api/export.xml').status_code == 404
+    assert client.get('/api/export.csv?download_success=maybe').status_code == 400
+    monkeypatch.setattr(ooc, 'pq', None)
+    assert client.get('/api/export.parquet').status_code == 501
@@ -0,0 +1,148 @@
+# /ooc-simpleui/tests/test_import.py
+"""Streaming import: iter_json_records() parsing and import_records() upserts."""
+import io
+import json
+import os
+import re
+import tempfile
+
+import pytest
+
+from conftest import make_item, ooc, wait_for_job
+
+
+def records_of(items):
+    return ooc.iter_json_records(io.StringIO(json.dumps(items)))
+
+
+def test_import_with_duplicated_key(storage):
+    # Items 0 and 2 share a key (e.g. from an earlier append); item 1 is not in the file
+    storage.save_all([make_item(0), make_item(1), make_item(0, id=2, rating='half true')])
+    upload = [{**make_item(0), 'rating': 'pants on fire'}]
+
+    result = ooc.import_records(records_of(upload), mode='merge')
+    assert result["success"] and result["updated"] == 2
+    assert [item['rating'] for item in ooc.load_data()] == ['pants on fire', 'false', 'pants on fire']
+
+    result = ooc.import_records(records_of([{**make_item(0), 'rating': 'mostly false'}]), mode='replace')
+    assert result["success"] and result["updated"] == 1 and result["removed"] == 2
+    assert [(item['id'], item['rating']) for item in ooc.load_data()] == [(0, 'mostly false')]
+
+
+def parse(text, chunk_size=ooc.IMPORT_READ_CHUNK_CHARS):
+    return list(ooc.iter_json_records(io.StringIO(text), chunk_size=chunk_size))
+
+
+def test_iter_json_records_array_across_chunks():
+    items = [make_item(i, social_text='x' * 50) for i in range(4)]
+    text = '\n  ' + json.dumps(items, indent=2) + '\n'
+    # Chunks smaller than one record make every record straddle a chunk boundary
+    for chunk_size in (7, 100, ooc.IMPORT_READ_CHUNK_CHARS):
+        assert parse(text, chunk_size) == [(i, item, None) for i, item in enumerate(items)]
+    assert parse('[]') == [] and parse(' [ ] ') == []
+
+
+class CountingReader(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_iter_json_records_large_record_reads_geometrically():
+    # One record spanning ~500 chunks between two small ones: fetching one chunk per failed decode
+    # would decode the large record ~500 times
+    items = [make_item(0), make_item(1, social_text='x' * 32000), make_item(2)]
+    stream = CountingReader(json.dumps(items))
+    assert list(ooc.iter_json_records(stream, chunk_size=64)) == [(i, item, None) for i, item in enumerate(items)]
+    assert stream.reads < 20
+
+
+def test_iter_json_records_empty_stream():
+    assert parse('') == [] and parse(' \n\n ', chunk_size=2) == []
+
+
+def test_iter_json_records_jsonl_with_bad_line():
+    text = '{"rating": "true"}\n\n{"rating": \n[1, 2]\n{"rating": "false"}'
+    records = parse(text, chunk_size=5)
+    assert [(position, record) for position, record, _ in records] == [(1, {'rating': 'true'}), (3, None), (4, [1, 2]), (5, {'rating': 'false'})]
+    assert records[1][2].startswith('Line 3: invalid JSON (')
+    assert [position for position, _, error in records if error is None] == [1, 4, 5]
+
+
+@pytest.mark.parametrize('text, message', [
+    ('[{"rating": "true"}, {"rating": "false"}', 'Unexpected end of file: the JSON array is not closed.'),
+    ('[{"rating": "true"},]', 'Trailing comma after record 0.'),
+    ('[{"rating": "true"} {"rating": "false"}]', "Expected ',' or ']' after record 0."),
+    ('[{"rating": "true"}, {"rating": tru}]', 'Invalid JSON in record 1'),
+])
+def test_iter_json_records_malformed_array(text, message):
+    records = ooc.iter_json_records(io.StringIO(text), chunk_size=8)
+    with pytest.raises(ValueError, match=re.escape(message)):
+        list(records)
+
+
+def test_import_merge_creates_and_updates(seeded):
+    upload = [{**make_item(1), 'rating': 'half true', 'id': 77, 'version': 9}, # Matched by key, id and version ignored
+              {'politifact_url': 'https://www.politifact.com/factchecks/new/', 'rating': 'true'},
+              {'social_link': 'https://x.com/user/status/new', 'ooc_misleading_intent': True}]
+    result = ooc.import_records(records_of(upload), mode='merge')
+    assert result["success"] and result["errors"] == []
+    assert {key: result[key] for key in ('records', 'created', 'updated', 'skipped', 'removed')} == {
+        'records': 3, 'created': 2, 'updated': 1, 'skipped': 0, 'removed': 0}
+    stored = ooc.load_data()
+    assert [item['id'] for item in stored] == [0, 1, 2, 3, 4, 5, 6]
+    assert (stored[1]['rating'], stored[1]['version']) == ('half true', 2)
+    assert stored[1]['external_links_info'] == make_item(1)['external_links_info']
+    assert (stored[5]['rating'], stored[6]['ooc_misleading_intent']) == ('true', True)
+
+
+def test_import_replace_removes_items_not_in_file(seeded):
+    result = ooc.import_records(records_of([make_item(3, rating='true'), make_item(9)]), mode='replace')
+    assert result["success"] and (result["created"], result["updated"], result["removed"]) == (1, 1, 4)
+    assert [(item['id'], item['politifact_url'], item['rating']) for item in ooc.load_data()] == [
+        (3, 'https://www.politifact.com/factchecks/3/', 'true'), (5, 'https://www.politifact.com/factchecks/9/', 'false')]
+
+
+def test_import_skips_invalid_records(seeded):
+    text = '\n'.join([json.dumps({**make_item(0), 'rating': 'true'}), '{not json', '"just a string"',
+                      json.dumps({'politifact_url': 'https://p/1', 'rating': 5}), json.dumps({'rating': 'true'}),
+                      json.dumps({'politifact_url': 'https://p/2', 'mystery': 1})])
+    result = ooc.import_records(ooc.iter_json_records(io.StringIO(text)), mode='replace')
+    assert result["success"] and (result["records"], result["updated"], result["skipped"]) == (6, 1, 5)
+    assert result["errors"][0].startswith('Line 2: invalid JSON (')
+    assert result["errors"][1:] == ["Record 3: not a JSON object.", "Record 4: Field 'rating' must be a string.",
+                                    "Record 5: needs a politifact_url or social_link.", "Record 6: Unknown or read-only field 'mystery'."]
+    # Skipped records don't abort a replace, which then keeps only the imported item
+    assert [(item['id'], item['rating']) for item in ooc.load_data()] == [(0, 'true')]
+
+
+def test_import_route_runs_as_job(seeded, client):
+    upload = '\n'.join(json.dumps(record) for record in [{**make_item(2), 'rating': 'true'}, {'rating': 'x'}])
+    response = client.post('/import', data={'mode': 'merge', 'jsonfile': (io.BytesIO(('\ufeff' + upload).encode('utf-8')), 'items.jsonl')})
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        [(category, message)] = session.pop('_flashes')
+    job_id = re.search(r'\(job (\w+)\)', message).group(1)
+    assert category == 'info' and "Import of 'items.jsonl' started" in message
+    job = wait_for_job(job_id)
+    assert (job['kind'], job['status'], job['message']) == ('import', 'succeeded', 'Imported 2 records: 0 created, 1 updated, 1 skipped.')
+    assert job['result']['errors'] == ['Record 2: needs a politifact_url or social_link.']
+    assert ooc.get_item(2)['rating'] == 'true'
+
+
+def test_api_import(seeded, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path)) # Where the upload is spooled
+    truncated = json.dumps([make_item(2), make_item(9)])[:-1]
+    response = client.post('/api/import', data={'mode': 'replace', 'jsonfile': (io.BytesIO(truncated.encode('utf-8')), 'items.json')})
+    assert response.status_code == 202
+    job = wait_for_job(response.get_json()['id'])
+    assert job['status'] == 'failed' and job['message'].endswith('Unexpected end of file: the JSON array is not closed.')
+    assert len(ooc.load_data()) == 5 # A failed replace removes nothing
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('import-')] # Spooled upload removed
+
+    assert client.post('/api/import', data={'jsonfile': (io.BytesIO(b'[]'), 'items.csv')}).status_code == 400
+    assert client.post('/api/import', data={'mode': 'append', 'jsonfile': (io.BytesIO(b'[]'), 'items.json')}).status_code == 400
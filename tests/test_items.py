@@ -0,0 +1,66 @@
+# /ooc-simpleui/tests/test_items.py
+"""Item-level create/read/update/delete routes, including If-Match version checks."""
+from conftest import ooc
+
+
+def test_create_item_gets_next_id(seeded, client):
+    response = client.post('/api/items', json={'politifact_url': 'https://www.politifact.com/factchecks/new/', 'rating': 'true'})
+    assert response.status_code == 201
+    item = response.get_json()
+    assert (item['id'], item['rating'], item['version'], item['external_links_info']) == (5, 'true', 1, [])
+    assert ooc.get_item(5)['politifact_url'] == 'https://www.politifact.com/factchecks/new/'
+
+
+def test_create_item_rejects_invalid_fields(seeded, client):
+    assert client.post('/api/items', json={'rating': 3}).status_code == 400
+    assert client.post('/api/items', json={'id': 9}).status_code == 400
+    assert client.post('/api/items', data='rating=true').status_code == 415
+    assert len(ooc.load_data()) == 5
+
+
+def test_get_item(seeded, client):
+    response = client.get('/api/items/2')
+    assert response.status_code == 200
+    assert response.get_json() == ooc.get_item(2)
+    assert client.get('/api/items/2', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/api/items/42').status_code == 404
+
+
+def test_patch_with_current_version(seeded, client):
+    response = client.patch('/api/items/1', json={'rating': 'half true', 'ooc_misleading_intent': True}, headers={'If-Match': '"1"'})
+    assert response.status_code == 200
+    item = response.get_json()
+    assert (item['rating'], item['ooc_misleading_intent'], item['version']) == ('half true', True, 2)
+    # A body 'version' works like If-Match; without either the write is unconditional
+    assert client.patch('/api/items/1', json={'rating': 'true', 'version': 2}).get_json()['version'] == 3
+    assert client.patch('/api/items/1', json={'rating': 'false'}).get_json()['version'] == 4
+    assert client.patch('/api/items/42', json={'rating': 'true'}).status_code == 404
+
+
+def test_patch_with_stale_version_conflicts(seeded, client):
+    assert client.patch('/api/items/1', json={'rating': 'half true'}, headers={'If-Match': '"1"'}).status_code == 200
+    response = client.patch('/api/items/1', json={'rating': 'pants on fire'}, headers={'If-Match': '"1"'})
+    assert response.status_code == 409
+    current = response.get_json()['item']
+    assert (current['id'], current['rating'], current['version']) == (1, 'half true', 2)
+    assert ooc.get_item(1)['rating'] == 'half true'
+    assert client.patch('/api/items/1', json={'rating': 'true', 'version': 1}).status_code == 409
+
+
+def test_patch_rejects_malformed_if_match(seeded, client):
+    assert client.patch('/api/items/1', json={'rating': 'true'}, headers={'If-Match': '"1", "2"'}).status_code == 400
+    assert client.patch('/api/items/1', json={'rating': 'true'}, headers={'If-Match': '"v1"'}).status_code == 400
+    assert client.patch('/api/items/1', json={'rating': 'true', 'version': '1'}).status_code == 400
+    assert ooc.get_item(1)['version'] == 1
+
+
+def test_delete_checks_version(seeded, client):
+    assert client.patch('/api/items/4', json={'rating': 'true'}).status_code == 200
+    response = client.delete('/api/items/4', headers={'If-Match': '"1"'})
+    assert response.status_code == 409
+    assert response.get_json()['item']['version'] == 2
+    assert ooc.get_item(4) is not None
+    assert client.delete('/api/items/4', headers={'If-Match': '"2"'}).status_code == 200
+    assert ooc.get_item(4) is None
+    assert [item['id'] for item in ooc.load_data()] == [0, 1, 2, 3] # The others keep their ids
+    assert client.delete('/api/items/4').status_code == 404
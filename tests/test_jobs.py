@@ -0,0 +1,118 @@
+# /ooc-simpleui/tests/test_jobs.py
+"""Background jobs: per-group (platform) limits, results, status and the Server-Sent Events stream."""
+import json
+import threading
+import time
+
+import pytest
+
+from conftest import ooc, wait_for_job
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def release():
+    """Jobs of a test block on this event until it is set (always set at teardown)."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def blocking_job(release):
+    def run(job_id, value):
+        assert release.wait(timeout=10)
+        return {"success": True, "message": f"Done {value}."}
+    return run
+
+
+def statuses(manager, jobs):
+    return [manager.get(job['id'])['status'] for job in jobs]
+
+
+def wait_for_job_of(manager, job, timeout=10):
+    snapshot = manager.get(job['id'])
+    deadline = time.time() + timeout
+    while snapshot['status'] not in ooc.JOB_TERMINAL_STATES:
+        assert time.time() < deadline
+        snapshot = manager.wait_for_change(job['id'], snapshot['revision'], timeout=deadline - time.time())
+    return snapshot
+
+
+def test_group_limits(release):
+    manager = ooc.JobManager(4, group_limits={'youtube': 2}, default_group_limit=1)
+    run = blocking_job(release)
+    jobs = [manager.submit('download', run, i, group=group) for i, group in
+            enumerate(['youtube', 'youtube', 'youtube', 'tiktok', 'tiktok'])]
+    # Two youtube jobs (its limit) and one tiktok job (the default limit); the waiting youtube job does
+    # not hold up the tiktok job queued behind it
+    wait_until(lambda: statuses(manager, jobs).count('running') == 3)
+    assert statuses(manager, jobs) == ['running', 'running', 'queued', 'running', 'queued']
+    release.set()
+    assert [wait_for_job_of(manager, job)['message'] for job in jobs] == [f"Done {i}." for i in range(5)]
+
+
+def test_max_workers_caps_all_groups(release):
+    manager = ooc.JobManager(2, default_group_limit=2)
+    jobs = [manager.submit('task', blocking_job(release), i, group=group) for i, group in enumerate(['a', 'b', 'c'])]
+    wait_until(lambda: statuses(manager, jobs).count('running') == 2)
+    assert statuses(manager, jobs) == ['running', 'running', 'queued']
+    release.set()
+    assert all(wait_for_job_of(manager, job)['status'] == 'succeeded' for job in jobs)
+
+
+def test_job_outcomes():
+    manager = ooc.JobManager(2)
+    def crash(job_id):
+        raise RuntimeError('boom')
+    failed = wait_for_job_of(manager, manager.submit('task', lambda job_id: {"success": False, "message": "Nope."}))
+    crashed = wait_for_job_of(manager, manager.submit('task', crash))
+    plain = wait_for_job_of(manager, manager.submit('task', lambda job_id: 42))
+    assert (failed['status'], failed['message'], failed['result']) == ('failed', 'Nope.', {"success": False, "message": "Nope."})
+    assert (crashed['status'], crashed['message']) == ('failed', 'Unexpected error: boom')
+    assert (plain['status'], plain['message'], plain['result']) == ('succeeded', 'Done.', 42)
+
+
+def test_job_event_stream(storage, client, release):
+    def run(job_id):
+        ooc.task_jobs.update(job_id, progress=50.0, message='Halfway...')
+        assert release.wait(timeout=10)
+        return {"success": True, "message": "Finished."}
+    job = ooc.task_jobs.submit('task', run)
+    wait_until(lambda: ooc.task_jobs.get(job['id'])['message'] == 'Halfway...')
+
+    response = client.get(f"/api/jobs/{job['id']}/events", buffered=False)
+    assert response.mimetype == 'text/event-stream' and response.headers['Cache-Control'] == 'no-cache'
+    chunks = iter(response.response)
+    first = json.loads(next(chunks).decode().removeprefix('data: '))
+    assert (first['status'], first['progress'], first['message']) == ('running', 50.0, 'Halfway...')
+    release.set()
+    rest = [json.loads(chunk.decode().removeprefix('data: ')) for chunk in chunks] # The stream ends with the job
+    assert rest[-1]['status'] == 'succeeded' and rest[-1]['result'] == {"success": True, "message": "Finished."}
+    assert [update['revision'] for update in [first] + rest] == sorted({update['revision'] for update in [first] + rest})
+
+    assert client.get(f"/api/jobs/{job['id']}").get_json()['status'] == 'succeeded'
+    assert client.get('/api/jobs/unknown/events').status_code == 404
+    assert client.get('/api/jobs/unknown').status_code == 404
+
+
+def test_download_job_stores_outcome_on_item(seeded, client, monkeypatch):
+    def download(url, item_id, progress_callback=None):
+        progress_callback({"percent": 50.0})
+        return {"success": True, "message": "Download successful.", "drive_path": "/videos/x.mp4", "media_key": "x-1"}
+    monkeypatch.setattr(ooc, 'download_video_yt_dlp', download)
+    response = client.post('/api/jobs/download', json={'url': 'https://x.com/user/status/1', 'id': '1'})
+    assert response.status_code == 202 and response.get_json()['group'] == 'x'
+    job = wait_for_job(response.get_json()['id'])
+    assert job['status'] == 'succeeded' and job['result']['version'] == 2
+    item = ooc.get_item(1)
+    assert (item['download_success'], item['media_key'], item['version']) == (True, 'x-1', 2)
+    assert [job['id'] for job in client.get('/api/jobs?kind=download').get_json()['jobs']].count(job['id']) == 1
+
+    assert client.post('/api/jobs/download', json={'url': 'https://x.com/user/status/1'}).status_code == 400
+    assert client.post('/api/jobs/download', json={'url': 'https://x.com/user/status/1', 'id': 'one'}).status_code == 400
@@ -0,0 +1,92 @@
+# /ooc-simpleui/tests/test_links.py
+"""The evidence link checker: per-host rate limiting, the link cache keyed by normalized URL, bulk checks."""
+import time
+import types
+
+import pytest
+
+from conftest import make_item, ooc
+
+
+@pytest.fixture
+def fetches(storage, monkeypatch):
+    """Stubs the network: links under /gone answer 404, the host dead.example is unreachable.
+    Returns the list of fetched URLs. The link cache lives in the storage fixture's temporary directory."""
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        if 'dead.example' in url: raise ooc.requests.exceptions.ConnectionError('Connection refused')
+        status = 404 if '/gone' in url else 200
+        return {"url": url, "final_url": url, "status": status, "ok": status < 400, "domain": ooc.link_domain(url),
+                "content_type": "text/html", "redirects": 0, "title": f"Page {url}", "og_title": None,
+                "og_description": None, "site_name": None, "elapsed_ms": 1, "checked_at": time.time(), "error": None}
+    monkeypatch.setattr(ooc, 'fetch_link_metadata', fetch)
+    monkeypatch.setattr(ooc, 'link_rate_limiter', ooc.HostRateLimiter(0)) # Unlimited, unless a test passes its own
+    return fetched
+
+
+class RecordingLimiter:
+    def __init__(self): self.urls = []
+    def wait(self, url): self.urls.append(url)
+
+
+def test_rate_limiter_spaces_requests_per_host(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(ooc, 'time', types.SimpleNamespace(monotonic=lambda: 100.0, sleep=sleeps.append))
+    limiter = ooc.HostRateLimiter(2.0)
+    for url in ('https://apnews.com/a', 'https://apnews.com/b', 'https://reuters.com/a', 'https://apnews.com/c', 'http://reuters.com/b'):
+        limiter.wait(url)
+    # Each host gets its own schedule of one slot per 0.5s; other hosts do not wait for it
+    assert sleeps == [0.5, 1.0, 0.5]
+    ooc.HostRateLimiter(0).wait('https://apnews.com/a')
+    assert len(sleeps) == 3
+
+
+def test_interleave_by_host():
+    urls = ['https://apnews.com/1', 'https://apnews.com/2', 'https://www.apnews.com/3', 'https://reuters.com/1', 'https://bbc.com/1']
+    assert ooc.interleave_by_host(urls) == ['https://apnews.com/1', 'https://reuters.com/1', 'https://bbc.com/1',
+                                            'https://apnews.com/2', 'https://www.apnews.com/3']
+
+
+def test_link_records_are_cached_by_normalized_url(fetches, monkeypatch):
+    limiter = RecordingLimiter()
+    first = ooc.check_evidence_link('https://www.apnews.com/article?utm_source=x#top', limiter)
+    assert first['ok'] and not first['cached'] and first['domain'] == 'apnews.com'
+    # Tracking parameters, 'www.' and the fragment do not make another request; the limiter is only asked for fetches
+    again = ooc.check_evidence_link('https://apnews.com/article', limiter)
+    assert again['cached'] and again['title'] == first['title']
+    assert fetches == ['https://www.apnews.com/article?utm_source=x#top'] and limiter.urls == fetches
+    assert not ooc.check_evidence_link('https://apnews.com/article?page=2', limiter)['cached'] # Other query, other page
+    assert not ooc.check_evidence_link('https://apnews.com/article', limiter, refresh=True)['cached']
+    assert len(fetches) == 3 and limiter.urls == fetches
+
+    # Broken links are retried after LINK_CHECK_RETRY_SECONDS, working ones kept for LINK_CHECK_CACHE_TTL_SECONDS
+    assert ooc.check_evidence_link('https://apnews.com/gone')['status'] == 404
+    monkeypatch.setattr(ooc, 'LINK_CHECK_RETRY_SECONDS', 0)
+    assert not ooc.check_evidence_link('https://apnews.com/gone')['cached']
+    assert ooc.check_evidence_link('https://apnews.com/article')['cached']
+
+    unreachable = ooc.check_evidence_link('https://dead.example/x')
+    assert unreachable['status'] is None and unreachable['error'].startswith('ConnectionError')
+    invalid = ooc.check_evidence_link('ftp://apnews.com/file')
+    assert not invalid['ok'] and invalid['error'].startswith('Invalid URL') and fetches[-1] == 'https://dead.example/x'
+
+
+def test_bulk_check_fetches_each_link_once(fetches, storage):
+    def links(*urls): return [{'url': url, 'description': '', 'checklist': {}} for url in urls]
+    storage.save_all([
+        make_item(0, external_links_info=links('https://www.apnews.com/a?utm_source=x', 'https://apnews.com/gone')),
+        make_item(1, external_links_info=links('https://apnews.com/a', 'https://dead.example/x', 'https://reuters.com/a')),
+        make_item(2, external_links_info=links('https://apnews.com/gone')),
+    ])
+    result = ooc.check_evidence_links(workers=4, rate=0)
+    assert (result['urls'], result['ok'], result['broken'], result['unreachable'], result['cached']) == (4, 2, 1, 1, 0)
+    assert sorted(fetches) == ['https://apnews.com/gone', 'https://dead.example/x', 'https://reuters.com/a',
+                               'https://www.apnews.com/a?utm_source=x']
+    failures = {failure['url']: failure for failure in result['links']}
+    assert failures['https://apnews.com/gone']['items'] == [0, 2] and failures['https://dead.example/x']['items'] == [1]
+
+    again = ooc.check_evidence_links(workers=4, rate=0)
+    assert (again['cached'], again['ok'], again['broken'], again['unreachable']) == (4, 2, 1, 1) and len(fetches) == 4
+    assert ooc.check_evidence_links(workers=4, rate=0, refresh=True)['cached'] == 0 and len(fetches) == 8
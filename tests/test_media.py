@@ -0,0 +1,93 @@
+# /ooc-simpleui/tests/test_media.py
+"""The content-addressed media store: manifest, link index and dedup."""
+import json
+import os
+
+from conftest import ooc
+
+
+def write_file(path, size=1000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'\0' * size)
+    return str(path)
+
+
+def test_media_key_for():
+    assert ooc.media_key_for({'id': 'AbC-1', 'extractor_key': 'Youtube'}) == 'youtube-AbC-1'
+    assert ooc.media_key_for({'id': 'a/b', 'extractor_key': 'Twitter'}) == 'twitter-a_b'
+    # Generic IDs are file names, so those (and links without an info_dict) are keyed by the normalized link
+    generic = ooc.media_key_for({'id': 'video', 'extractor_key': 'Generic'}, 'https://www.example.com/v.mp4?utm_source=x')
+    assert generic.startswith('url-') and generic == ooc.media_key_for(url='https://example.com/v.mp4#t=3')
+
+
+def test_add_links_the_file_into_its_shard(media_store, tmp_path):
+    source = write_file(tmp_path / 'split' / 'video.mp4')
+    entry = media_store.add('youtube-abc', source, 'https://www.youtube.com/watch?v=abc&si=share')
+    path = media_store.absolute_path(entry)
+    assert path == os.path.abspath(os.path.join(media_store.shard_dir('youtube-abc'), 'youtube-abc.mp4'))
+    assert os.path.samefile(path, source) # Hard-linked, not copied
+    assert entry['size'] == 1000 and entry['sha256'] == ooc.file_sha256(source)
+    assert media_store.lookup('youtube-abc') == entry
+
+    # Every link variant of the video resolves to the key, without an extraction
+    assert media_store.key_for_url('https://youtube.com/watch?v=abc') == 'youtube-abc'
+    media_store.alias('https://youtu.be/abc', 'youtube-abc')
+    assert media_store.key_for_url('https://youtu.be/abc?feature=share') == 'youtube-abc'
+    assert media_store.key_for_url('https://youtube.com/watch?v=other') is None
+
+
+def test_manifest_is_shared_and_relative(media_store, tmp_path):
+    media_store.add('youtube-abc', write_file(tmp_path / 'video.mp4'), 'https://youtube.com/watch?v=abc')
+    with open(media_store.manifest_path, encoding='utf-8') as f: manifest = json.load(f)
+    assert manifest['urls'] == {'https://youtube.com/watch?v=abc': 'youtube-abc'}
+    assert not os.path.isabs(manifest['media']['youtube-abc']['path'])
+
+    # Another worker's store sees the entry, and this one sees that worker's alias
+    other = ooc.MediaStore(media_store.root, media_store.manifest_path)
+    assert other.lookup('youtube-abc')['sha256'] == manifest['media']['youtube-abc']['sha256']
+    other.alias('https://m.youtube.com/watch?v=abc', 'youtube-abc')
+    assert media_store.key_for_url('https://m.youtube.com/watch?v=abc') == 'youtube-abc'
+
+
+def test_lookup_drops_missing_or_changed_files(media_store, tmp_path):
+    for key in ('youtube-gone', 'youtube-cut'):
+        media_store.add(key, write_file(tmp_path / f'{key}.mp4'))
+    os.remove(media_store.absolute_path(media_store.lookup('youtube-gone')))
+    os.remove(tmp_path / 'youtube-gone.mp4')
+    with open(media_store.absolute_path(media_store.lookup('youtube-cut')), 'r+b') as f: f.truncate(10) # A broken copy
+    assert media_store.lookup('youtube-gone') is None and media_store.lookup('youtube-cut') is None
+    assert media_store.keys() == [] # Dropped from the manifest, so the next download fetches them again
+
+
+def test_remove_partial_only_touches_the_key(media_store):
+    shard = media_store.shard_dir('youtube-abc')
+    os.makedirs(shard)
+    for name in ('youtube-abc.mp4.part', 'youtube-abc.f137.mp4', 'youtube-abcd.mp4'):
+        open(os.path.join(shard, name), 'wb').close()
+    media_store.remove_partial('youtube-abc')
+    assert os.listdir(shard) == ['youtube-abcd.mp4']
+
+
+def test_media_route_serves_ranges(media_store, client, tmp_path):
+    source = tmp_path / 'video.mp4'
+    source.write_bytes(bytes(range(256)) * 4)
+    media_store.add('youtube-abc', str(source))
+
+    full = client.get('/media/youtube-abc')
+    assert full.status_code == 200 and full.data == source.read_bytes()
+    assert full.mimetype == 'video/mp4' and 'max-age' in full.headers['Cache-Control']
+
+    part = client.get('/media/youtube-abc', headers={'Range': 'bytes=100-199'}) # Seeking
+    assert part.status_code == 206 and part.data == source.read_bytes()[100:200]
+    assert part.headers['Content-Range'] == 'bytes 100-199/1024' and part.headers['Content-Length'] == '100'
+    assert part.headers['Accept-Ranges'] == 'bytes'
+    tail = client.get('/media/youtube-abc', headers={'Range': 'bytes=-24'})
+    assert tail.status_code == 206 and tail.headers['Content-Range'] == 'bytes 1000-1023/1024'
+
+    beyond = client.get('/media/youtube-abc', headers={'Range': 'bytes=2000-'})
+    assert beyond.status_code == 416 and beyond.headers['Content-Range'] == 'bytes */1024'
+
+    # A cached copy is revalidated without the body
+    assert client.get('/media/youtube-abc', headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+    assert client.get('/media/youtube-unknown').status_code == 404
+    assert client.get('/media/..%2Fmanifest.json').status_code == 404
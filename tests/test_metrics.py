@@ -0,0 +1,62 @@
+# /ooc-simpleui/tests/test_metrics.py
+"""/metrics: this process's metrics summed with the snapshots other worker processes published."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ooc
+
+
+@pytest.fixture
+def metrics_dir(storage, monkeypatch):
+    """Empty metrics of this process; snapshots of the 'other workers' go into the returned directory."""
+    for metric in ooc.metrics_registry: monkeypatch.setattr(metric, '_values', {})
+    os.makedirs(ooc.metrics_publisher.directory)
+    return ooc.metrics_publisher.directory
+
+
+def publish(directory, pid, snapshot):
+    with open(os.path.join(directory, f'{pid}.json'), 'w', encoding='utf-8') as f: json.dump(snapshot, f)
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_metrics_sum_worker_snapshots(metrics_dir, client):
+    ooc.YTDLP_DOWNLOADED_BYTES.inc(100, platform='youtube')
+    ooc.FFMPEG_SECONDS.observe(0.02, kind='poster', outcome='ok')
+    histogram = [0] * (len(ooc.LATENCY_BUCKETS) + 1) + [0.0]
+    histogram[ooc.LATENCY_BUCKETS.index(0.5)], histogram[-2], histogram[-1] = 1, 1, 400.4 # 0.4s and 400s
+    other_worker = {ooc.YTDLP_DOWNLOADED_BYTES.name: [[['youtube'], 50.0], [['x'], 7.0]],
+                    ooc.FFMPEG_SECONDS.name: [[['poster', 'ok'], histogram]]}
+    publish(metrics_dir, os.getppid(), other_worker)
+    publish(metrics_dir, exited_pid(), {ooc.YTDLP_DOWNLOADED_BYTES.name: [[['youtube'], 1000.0]]})
+    publish(metrics_dir, os.getpid(), {ooc.YTDLP_DOWNLOADED_BYTES.name: [[['youtube'], 1000.0]]}) # Stale own file
+
+    response = client.get('/metrics')
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+    lines = response.get_data(as_text=True).splitlines()
+    assert 'ooc_ytdlp_downloaded_bytes_total{platform="youtube"} 150' in lines
+    assert 'ooc_ytdlp_downloaded_bytes_total{platform="x"} 7' in lines
+    assert '# TYPE ooc_ffmpeg_duration_seconds histogram' in lines
+    bucket = 'ooc_ffmpeg_duration_seconds_bucket{kind="poster",outcome="ok",le="%s"}'
+    assert bucket % '0.01' + ' 0' in lines and bucket % '0.025' + ' 1' in lines # Cumulative counts
+    assert bucket % '0.5' + ' 2' in lines and bucket % '300' + ' 2' in lines and bucket % '+Inf' + ' 3' in lines
+    assert 'ooc_ffmpeg_duration_seconds_count{kind="poster",outcome="ok"} 3' in lines
+    assert 'ooc_ffmpeg_duration_seconds_sum{kind="poster",outcome="ok"} 400.420000' in lines
+    # Exited workers' snapshots are dropped; this process's own file is ignored in favour of its live values
+    assert sorted(os.listdir(metrics_dir)) == sorted([f'{os.getppid()}.json', f'{os.getpid()}.json'])
+
+
+def test_request_metrics_use_endpoint_labels(metrics_dir, client):
+    client.get('/api/items/123')
+    client.get('/no/such/page')
+    lines = client.get('/metrics').get_data(as_text=True).splitlines()
+    assert 'ooc_http_request_duration_seconds_count{endpoint="get_item_route",method="GET",status="404"} 1' in lines
+    assert 'ooc_http_request_duration_seconds_count{endpoint="unmatched",method="GET",status="404"} 1' in lines
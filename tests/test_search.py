@@ -0,0 +1,81 @@
+# /ooc-simpleui/tests/test_search.py
+"""/api/search: BM25 ranking over the weighted fields, facet filters and counts, incremental index updates."""
+import pytest
+
+from conftest import make_item, ooc
+
+
+@pytest.fixture
+def indexed(storage):
+    storage.save_all([
+        make_item(0, politifact_headline='Flood video shows a storm in Texas', social_text='Storm footage.'),
+        make_item(1, politifact_headline='Old footage', social_text='The flood last week', social_platform='youtube',
+                  rating='pants-fire', ooc_temporal_misattribution=True, download_success=True),
+        make_item(2, politifact_headline='Election claims', social_text='Nothing about water',
+                  ooc_temporal_misattribution=True, ooc_misleading_intent=True),
+        make_item(3, politifact_headline='Flood flood flood', rating='pants-fire', ooc_temporal_misattribution=True),
+    ])
+    return storage
+
+
+def search(client, query='', **params):
+    response = client.get('/api/search', query_string={'q': query, **params})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def ids(payload):
+    return [result['id'] for result in payload['results']]
+
+
+def test_bm25_ranking(indexed, client):
+    payload = search(client, 'flood')
+    # Term frequency and the headline weight beat a single mention in the social text
+    assert ids(payload) == [3, 0, 1] and payload['total'] == 3
+    scores = [result['score'] for result in payload['results']]
+    assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+    assert payload['results'][2]['snippet'] == 'The flood last week'
+    # Every term must match; stopwords are ignored
+    assert ids(search(client, 'the Texas flood')) == [0]
+    assert search(client, 'hurricane')['total'] == 0
+    # Evidence links are indexed too (make_item gives each item a link described 'Evidence <id>')
+    assert ids(search(client, 'evidence 2')) == [2]
+
+
+def test_facet_filters_and_counts(indexed, client):
+    payload = search(client, 'flood', rating='pants-fire')
+    assert ids(payload) == [3, 1]
+    assert payload['facets']['rating'] == {'pants-fire': 2} and payload['facets']['platform'] == {'x': 1, 'youtube': 1}
+    assert payload['facets']['download_success'] == {'true': 1, 'false': 1}
+
+    assert ids(search(client, 'flood', platform='youtube', download_success='true')) == [1]
+    assert ids(search(client, ooc=['temporal_misattribution', 'misleading_intent'])) == [2] # Every given flag must be set
+    everything = search(client, ooc='temporal_misattribution')
+    assert ids(everything) == [1, 2, 3] and everything['facets']['ooc']['temporal_misattribution'] == 3
+    assert everything['facets']['ooc']['misleading_intent'] == 1
+
+    page = search(client, 'flood', limit=2)
+    assert ids(page) == [3, 0] and page['next_offset'] == 2
+    assert ids(search(client, 'flood', limit=2, offset=2)) == [1] and search(client, 'flood', offset=2)['next_offset'] is None
+
+    assert client.get('/api/search?ooc=unknown').status_code == 400
+    assert client.get('/api/search?limit=many').status_code == 400
+
+
+def test_index_follows_writes(indexed, client, monkeypatch):
+    assert search(client, 'flood')['total'] == 3
+    rebuilds = []
+    rebuild = ooc.search_index._rebuild
+    monkeypatch.setattr(ooc.search_index, '_rebuild', lambda: (rebuilds.append(1), rebuild())[1])
+
+    assert ooc.update_item(3, {'politifact_headline': 'Wildfire photo', 'rating': 'false'})['success']
+    assert ooc.delete_item(0)['success']
+    assert ooc.create_item({'politifact_headline': 'Wildfire spreads', 'social_platform': 'tiktok'})['success']
+    assert ids(search(client, 'flood')) == [1]
+    wildfire = search(client, 'wildfire')
+    assert sorted(ids(wildfire)) == [3, 4] and wildfire['facets']['platform'] == {'x': 1, 'tiktok': 1}
+    assert search(client, ooc='temporal_misattribution')['total'] == 3 # Item 3 keeps its flag
+    assert rebuilds == []
+
+    indexed.save_all([make_item(0, politifact_headline='Flood again')]) # Not through the listeners (another process)
+    assert ids(search(client, 'flood')) == [0] and rebuilds == [1]
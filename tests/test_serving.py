@@ -0,0 +1,49 @@
+# /ooc-simpleui/tests/test_serving.py
+"""State that several worker processes share: the session key and per-video download locks."""
+import os
+import threading
+
+from conftest import ooc
+
+
+def test_secret_key_is_loaded_on_first_session(storage, client, tmp_path, monkeypatch):
+    key_file = tmp_path / 'cache' / 'secret_key'
+    monkeypatch.delenv('OOC_SECRET_KEY', raising=False)
+    monkeypatch.setattr(ooc, 'SECRET_KEY_FILE', str(key_file))
+    monkeypatch.setattr(ooc.app, 'secret_key', None) # As after importing the app
+    assert not key_file.exists()
+
+    response = client.post('/import') # Flashes 'No file part.', so the session is written
+    assert response.status_code == 302 and key_file.exists()
+    assert ooc.app.secret_key == key_file.read_text()
+    with client.session_transaction() as session:
+        assert session['_flashes'] == [('danger', 'No file part.')]
+    # Another worker process reads the same key instead of generating its own
+    assert ooc.load_secret_key() == ooc.app.secret_key
+
+
+def test_default_secret_key_file_is_next_to_the_app():
+    assert ooc.SECRET_KEY_FILE == os.path.join(ooc.app.root_path, 'cache', 'secret_key')
+
+
+def test_media_key_lock_holds_across_store_instances(tmp_path):
+    # Two stores on one directory stand in for two worker processes: flock() conflicts between them as well
+    root = tmp_path / 'media'
+    first, second = (ooc.MediaStore(str(root), str(root / 'manifest.json')) for _ in range(2))
+    events = []
+    acquired = threading.Event()
+
+    def other_worker():
+        with second.key_lock('youtube-abc'):
+            events.append('second')
+
+    with first.key_lock('youtube-abc'):
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        thread.join(timeout=0.3)
+        assert thread.is_alive() # Still waiting for the first worker's download
+        with second.key_lock('youtube-def'): acquired.set() # Other keys are not blocked
+        events.append('first')
+    thread.join(timeout=5)
+    assert events == ['first', 'second'] and acquired.is_set()
+    assert first.key_lock('youtube-abc') is first.key_lock('youtube-abc')
@@ -0,0 +1,64 @@
+# /ooc-simpleui/tests/test_stats.py
+"""/api/stats over the analytics snapshot: kept current by the write listeners, equal to a fresh rebuild."""
+import pytest
+
+from conftest import make_item, ooc
+
+NO_FILTERS = {'rating': None, 'platform': None, 'download_success': None}
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """Counts full rebuilds of the app's snapshot."""
+    snapshot, count = ooc.analytics_snapshot, []
+    rebuild = snapshot._rebuild
+    monkeypatch.setattr(snapshot, '_rebuild', lambda: (count.append(1), rebuild())[1])
+    return count
+
+
+def fresh_stats(**filters):
+    return ooc.AnalyticsSnapshot().stats({**NO_FILTERS, **filters})
+
+
+def test_stats_follow_writes_without_rebuilding(storage, client, rebuilds):
+    storage.save_all([
+        make_item(0, rating='false', social_duration=10, ooc_temporal_misattribution=True),
+        make_item(1, rating='false', social_platform='youtube', social_duration=20, download_success=True),
+        make_item(2, rating='pants-fire', social_duration=30, ooc_temporal_misattribution=True, ooc_misleading_intent=True),
+    ])
+    stats = client.get('/api/stats').get_json()
+    assert (stats['total'], stats['downloaded'], stats['duration']['sum']) == (3, 1, 60.0)
+    assert stats['ooc_counts']['temporal_misattribution'] == 2 and stats['ooc_flags_per_item'][:3] == [1, 1, 1]
+    assert stats['by_rating']['false']['count'] == 2 and stats['by_platform']['youtube']['mean_duration'] == 20.0
+    assert stats['evidence']['links'] == 3 and len(rebuilds) == 1
+
+    links = [{'url': 'https://apnews.com/a', 'description': '', 'checklist': {'source_reputation': True}},
+             {'url': 'https://apnews.com/b', 'description': '', 'checklist': {'source_reputation': True, 'purpose': True}}]
+    assert ooc.update_item(0, {'rating': 'pants-fire', 'ooc_temporal_misattribution': False, 'external_links_info': links})['success']
+    assert ooc.delete_item(1)['success']
+    assert ooc.create_item({'rating': 'mostly-false', 'social_platform': 'tiktok', 'social_duration': 5})['success']
+
+    stats = client.get('/api/stats').get_json()
+    assert len(rebuilds) == 1 # Applied through the listeners
+    assert stats == fresh_stats()
+    assert (stats['total'], stats['downloaded'], stats['duration']['sum']) == (3, 0, 45.0)
+    assert set(stats['by_rating']) == {'pants-fire', 'mostly-false'} and 'youtube' not in stats['by_platform']
+    assert stats['ooc_counts']['temporal_misattribution'] == 1
+    assert stats['evidence']['links'] == 3 and stats['evidence']['criteria_counts']['source_reputation'] == 2
+    assert client.get('/api/stats?rating=pants-fire').get_json() == fresh_stats(rating='pants-fire')
+    assert client.get('/api/stats?platform=youtube').get_json()['total'] == 0
+
+
+def test_stats_rebuild_after_a_whole_dataset_save(seeded, client, rebuilds):
+    assert client.get('/api/stats').get_json()['total'] == 5
+    seeded.save_all([make_item(i, rating='true') for i in range(2)]) # Not through the listeners (another process)
+    stats = client.get('/api/stats').get_json()
+    assert len(rebuilds) == 2 and stats['total'] == 2 and list(stats['by_rating']) == ['true']
+
+
+def test_stats_revalidate_and_reject_bad_filters(seeded, client):
+    first = client.get('/api/stats')
+    assert client.get('/api/stats', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+    ooc.update_item(2, {'rating': 'true'})
+    assert client.get('/api/stats', headers={'If-None-Match': first.headers['ETag']}).status_code == 200
+    assert client.get('/api/stats?download_success=maybe').status_code == 400
@@ -0,0 +1,109 @@
+# /ooc-simpleui/tests/test_storage.py
+"""Storage backends (JSON file, SQLite) behind the module-level helpers."""
+import json
+
+import pytest
+
+from conftest import make_item, ooc
+
+
+def test_update_items_notifies_with_updated_items(seeded, monkeypatch):
+    events = []
+    monkeypatch.setattr(ooc, 'dataset_listeners', [lambda event, payload, version: events.append((event, payload))])
+    monkeypatch.setattr(ooc, 'dataset_listener_checks', [lambda: True])
+    result = ooc.update_items({1: {'rating': 'half true'}, 3: {'rating': 'mostly false'}, 99: {'rating': 'x'}})
+    assert result == {"success": True, "updated": 2}
+    [(event, items)] = events
+    assert event == 'items'
+    assert [(item['id'], item['rating'], item['version']) for item in items] == [(1, 'half true', 2), (3, 'mostly false', 2)]
+
+
+def test_update_items_skips_collection_without_built_listeners(seeded, monkeypatch):
+    events = []
+    monkeypatch.setattr(ooc, 'dataset_listeners', [lambda event, payload, version: events.append((event, payload))])
+    monkeypatch.setattr(ooc, 'dataset_listener_checks', [lambda: False])
+    calls = []
+    original = type(seeded).update_items
+    monkeypatch.setattr(type(seeded), 'update_items', lambda self, updates, return_items=False: calls.append(return_items) or original(self, updates, return_items))
+    assert ooc.update_items({1: {'rating': 'half true'}}) == {"success": True, "updated": 1}
+    assert calls == [False] and events == []
+    assert ooc.get_item(1)['rating'] == 'half true'
+
+
+def reopen(storage):
+    """A new backend instance on the same file, so reads come from disk instead of the dataset cache."""
+    return type(storage)(storage.path)
+
+
+def test_save_all_round_trip(storage):
+    items = [
+        make_item(0, ooc_misleading_intent=True, social_duration=12.5, version=3, note='kept as is', tags=['a', 'b']),
+        make_item(1, politifact_headline='Ünïcödé “quotes”', download_success=True, external_links_info=[
+            {'url': 'https://apnews.com/1', 'description': 'First', 'checklist': {'definitive_proof': True, 'clarity_relevance': True}},
+            {'url': 'https://reuters.com/1', 'description': 'Second', 'checklist': {}},
+        ]),
+        make_item(2, external_links_info=[]),
+    ]
+    items = [ooc.normalize_item(item) for item in json.loads(json.dumps(items))]
+    storage.save_all(json.loads(json.dumps(items)))
+    assert reopen(storage).load_all() == items
+    assert reopen(storage).get_item(1) == items[1]
+    assert reopen(storage).get_item(7) is None
+
+
+def test_save_all_replaces_previous_items(seeded):
+    seeded.save_all([make_item(3, rating='true'), make_item(8)])
+    assert [(item['id'], item['rating']) for item in reopen(seeded).load_all()] == [(3, 'true'), (8, 'false')]
+
+
+def test_json_file_without_versions_loads_at_version_1(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text(json.dumps([{'id': 0, 'politifact_url': 'https://www.politifact.com/factchecks/0/', 'rating': 'false',
+                                 'social_link': 'https://x.com/user/status/0'}]), encoding='utf-8')
+    [item] = ooc.JsonStorage(str(path)).load_all()
+    assert item['version'] == 1 and item['external_links_info'] == [] and item['ooc_misleading_intent'] is False
+
+
+
+def test_listeners_rebuild_after_a_write_of_another_process(seeded, monkeypatch):
+    def headline_matches(word):
+        return [item_id for item_id, _ in ooc.search_index.search(word, FILTERS)[0]]
+    FILTERS = {'rating': None, 'platform': None, 'download_success': None}
+    ooc.analytics_snapshot.stats(FILTERS); ooc.search_index.search('', FILTERS) # Built, so they follow writes incrementally
+
+    ooc.update_item(0, {'rating': 'true', 'politifact_headline': 'alpha'})
+    assert ooc.analytics_snapshot.version == ooc.search_index.version == seeded.data_version() # Applied, no rebuild
+
+    # Another worker process writes after our write, before our listeners run: they must not take
+    # the version that includes its write as theirs
+    other_process = type(seeded)(seeded.path)
+    original_listeners = list(ooc.dataset_listeners)
+    def write_in_between(event, payload, version):
+        other_process.update_item(2, {'rating': 'true', 'politifact_headline': 'beta'})
+    monkeypatch.setattr(ooc, 'dataset_listeners', [write_in_between] + original_listeners)
+    ooc.update_item(1, {'rating': 'true', 'politifact_headline': 'gamma'})
+
+    assert ooc.analytics_snapshot.stats(FILTERS)['by_rating']['true']['count'] == 3
+    assert (headline_matches('alpha'), headline_matches('beta'), headline_matches('gamma')) == ([0], [2], [1])
+
+
+def break_storage(storage):
+    """Leaves the data as a crash mid-write (JSON) or a damaged database (SQLite) would."""
+    if isinstance(storage, ooc.JsonStorage):
+        with open(storage.path, 'r+', encoding='utf-8') as f:
+            f.truncate(len(f.read()) // 2)
+    else:
+        storage._connect().execute('DROP TABLE external_links')
+    storage.cache.invalidate()
+
+
+def test_unreadable_storage_is_an_error_not_an_empty_dataset(seeded, client):
+    break_storage(seeded)
+    with pytest.raises(ooc.StorageError):
+        ooc.load_data()
+    response = client.get('/')
+    assert response.status_code == 500 and response.get_data(as_text=True).startswith('Storage error: ')
+    response = client.get('/api/items')
+    assert response.status_code == 500 and 'error' in response.get_json()
+    assert client.get('/api/items/1').status_code == 500
+    assert client.get('/api/stats').status_code == 500
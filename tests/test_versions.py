@@ -0,0 +1,55 @@
+# /ooc-simpleui/tests/test_versions.py
+"""Optimistic concurrency: per-item versions, If-Match on item writes, version checks on /save."""
+import copy
+
+from conftest import ooc
+
+
+def page_state(client):
+    """The dataset as a client holds it after loading the page."""
+    return copy.deepcopy(client.get('/api/items?limit=200').get_json()['items'])
+
+
+def test_save_bumps_version_of_changed_items_only(seeded, client):
+    items = page_state(client)
+    items[2]['rating'] = 'half true'
+    response = client.post('/save', json=items)
+    assert response.status_code == 200
+    stored = {item['id']: item for item in ooc.load_data()}
+    assert stored[2]['rating'] == 'half true' and stored[2]['version'] == 2
+    assert all(stored[i]['version'] == 1 for i in (0, 1, 3, 4))
+
+
+def test_stale_save_is_rejected(seeded, client):
+    items = page_state(client)
+    assert client.patch('/api/items/3', json={'rating': 'mostly false'}, headers={'If-Match': '"1"'}).status_code == 200
+    items[0]['rating'] = 'pants on fire'
+    response = client.post('/save', json=items)
+    assert response.status_code == 409
+    assert response.get_json()['item']['id'] == 3
+    stored = {item['id']: item for item in ooc.load_data()}
+    assert stored[3]['rating'] == 'mostly false' and stored[3]['version'] == 2
+    assert stored[0]['rating'] == 'false' # Nothing of the rejected save was written
+
+
+def test_stale_save_after_delete_is_rejected(seeded, client):
+    # IDs are sparse after a delete; the check must use the IDs the client sent, not the renumbered ones
+    assert client.delete('/api/items/1').status_code == 200
+    items = page_state(client)
+    assert client.patch('/api/items/4', json={'rating': 'half true'}, headers={'If-Match': '"1"'}).status_code == 200
+    response = client.post('/save', json=items)
+    assert response.status_code == 409
+    assert response.get_json()['item']['id'] == 4
+    assert {item['id']: item['rating'] for item in ooc.load_data()}[4] == 'half true'
+
+
+def test_current_save_after_delete_renumbers(seeded, client):
+    assert client.delete('/api/items/1').status_code == 200
+    items = page_state(client)
+    response = client.post('/save', json=items)
+    assert response.status_code == 200
+    stored = ooc.load_data()
+    assert [item['id'] for item in stored] == [0, 1, 2, 3]
+    assert [item['social_link'].rsplit('/', 1)[1] for item in stored] == ['0', '2', '3', '4']
+    # Items that moved to another ID count as changed
+    assert [item['version'] for item in stored] == [1, 2, 2, 2]